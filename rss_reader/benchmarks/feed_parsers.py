@@ -0,0 +1,79 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+"""
+Compare the parse time and the peak memory of feedparser and the fast parser on the large synthetic RSS and Atom feeds.
+The time is the best of three runs, the memory is the peak traced by tracemalloc in a separate run
+
+Run from the rss_reader folder: python -m benchmarks.feed_parsers [entries counts]
+"""
+import sys
+import time
+import tracemalloc
+
+from benchmarks.feed_server import get_feed_content, feed_formats
+from src.rss_reader_impl import RSSReader, parser_backends
+
+
+class _Response:
+    """The downloaded feed response"""
+
+    def __init__(self, content: bytes, url: str) -> None:
+        self.content = content
+        self.url = url
+        self.headers = {'Content-Type': 'application/xml; charset=utf-8'}
+
+
+def parse_posts(reader: RSSReader, response: _Response):
+    """
+    Parse the feed and extract its posts like the reader does
+
+    :param RSSReader reader: the reader with the parser to measure
+    :param response: the feed response
+    :return: the RSS feed with its posts
+    """
+    return reader._get_posts_details(reader._parse_feed(response, response.url))
+
+
+def measure(reader: RSSReader, response: _Response) -> tuple:
+    """
+    Measure the parse time and the peak memory
+
+    :param RSSReader reader: the reader with the parser to measure
+    :param response: the feed response
+    :return: the best time in seconds, the peak memory in bytes, the posts count
+    """
+    best_time = None
+    for _ in range(3):
+        start_time = time.perf_counter()
+        data = parse_posts(reader, response)
+        run_time = time.perf_counter() - start_time
+        best_time = run_time if best_time is None else min(best_time, run_time)
+    tracemalloc.start()
+    parse_posts(reader, response)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best_time, peak_memory, len(data.posts)
+
+
+def main() -> None:
+    entries_counts = [int(argument) for argument in sys.argv[1:]] or [1000, 10000]
+    readers = {parser: RSSReader(parser=parser) for parser in parser_backends}
+    print(f"{'feed':12} {'parser':10} {'posts':>6} {'time, ms':>10} {'posts/s':>9} {'peak memory, MB':>16}")
+    for feed_format in feed_formats:
+        for entries_count in entries_counts:
+            url = 'http://127.0.0.1/' + feed_format + '/' + str(entries_count)
+            response = _Response(get_feed_content(feed_format, entries_count, 'http://127.0.0.1'), url)
+            results = {}
+            for parser, reader in readers.items():
+                results[parser] = measure(reader, response)
+                seconds, peak_memory, posts_count = results[parser]
+                print(f"{feed_format + ' ' + str(entries_count):12} {parser:10} {posts_count:6} {seconds * 1000:10.1f} "
+                      f"{posts_count / seconds:9.0f} {peak_memory / 2 ** 20:16.1f}")
+            print(f"{'':12} fast parser is {results['feedparser'][0] / results['fast'][0]:.1f} times faster and uses "
+                  f"{results['feedparser'][1] / results['fast'][1]:.1f} times less memory")
+
+
+if __name__ == '__main__':
+    main()
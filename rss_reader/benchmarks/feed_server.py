@@ -0,0 +1,168 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+"""
+The local HTTP server of synthetic RSS and Atom feeds with images for the offline benchmarks
+
+    with FeedServer() as server:
+        url = server.get_feed_url('rss', 1000)
+"""
+import datetime
+import io
+import threading
+from email.utils import format_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from xml.sax.saxutils import escape
+
+feed_formats = ('rss', 'atom')
+
+# every twentieth entry repeats the GUID of the previous one, so the de-duplication has work to do
+DUPLICATE_EVERY = 20
+# the number of the distinct images, the entries share them like the real feeds share the thumbnails
+IMAGES_COUNT = 16
+FIRST_DATE = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def get_feed_content(feed_format: str, entries_count: int, base_url: str) -> bytes:
+    """
+    Build a synthetic feed. The entries have a title, a link, a GUID, a date, a description and an image enclosure,
+    one entry per hour starting from `FIRST_DATE`, the newest first
+
+    :param str feed_format: 'rss' or 'atom'
+    :param int entries_count: the number of the entries
+    :param str base_url: the server URL of the links and the images
+    :return: the feed XML
+    """
+    entries = []
+    for i in reversed(range(entries_count)):
+        guid_number = i - 1 if i % DUPLICATE_EVERY == DUPLICATE_EVERY - 1 else i
+        date = FIRST_DATE + datetime.timedelta(hours=i)
+        title = escape("Entry " + str(i) + " of the synthetic feed & the benchmarks")
+        link = base_url + "/news/" + str(i)
+        guid = base_url + "/guid/" + str(guid_number)
+        image = base_url + "/images/" + str(i % IMAGES_COUNT) + ".jpg"
+        description = escape(("<p>The description of the entry " + str(i) + ".</p>") * 3)
+        if feed_format == 'rss':
+            entries.append(f'<item><title>{title}</title><link>{link}</link><guid>{guid}</guid>'
+                           f'<pubDate>{format_datetime(date)}</pubDate><description>{description}</description>'
+                           f'<enclosure url="{image}" length="0" type="image/jpeg"/></item>')
+        else:
+            entries.append(f'<entry><title>{title}</title><link href="{link}"/><id>{guid}</id>'
+                           f'<published>{date.isoformat()}</published><updated>{date.isoformat()}</updated>'
+                           f'<summary type="html">{description}</summary>'
+                           f'<link rel="enclosure" href="{image}" type="image/jpeg"/></entry>')
+    if feed_format == 'rss':
+        content = (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                   f'<title>Synthetic RSS feed {entries_count}</title><link>{base_url}/</link>'
+                   f'<description>The benchmark feed</description>{"".join(entries)}</channel></rss>')
+    else:
+        content = (f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+                   f'<title>Synthetic Atom feed {entries_count}</title><link href="{base_url}/"/>'
+                   f'<id>{base_url}/</id><updated>{FIRST_DATE.isoformat()}</updated>{"".join(entries)}</feed>')
+    return content.encode('utf-8')
+
+
+def get_image_content(number: int) -> bytes:
+    """
+    Build a JPEG image of the size of a news thumbnail
+
+    :param int number: the image number, the images have different colors
+    :return: the JPEG image
+    """
+    from PIL import Image
+
+    image = io.BytesIO()
+    Image.new('RGB', (320, 180), (number * 15 % 256, 96, 160)).save(image, 'JPEG', quality=85)
+    return image.getvalue()
+
+
+class FeedServer:
+    """
+    The feeds server running in a daemon thread on a free local port. The feeds are built on the first request and
+    kept in memory, so the fetch time is the time of the transfer only
+    """
+
+    def __init__(self) -> None:
+        self._contents = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._get_handler_class())
+        self._server.daemon_threads = True
+        self.base_url = 'http://127.0.0.1:' + str(self._server.server_address[1])
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> 'FeedServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop the server
+
+        :return: None
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def get_feed_url(self, feed_format: str, entries_count: int) -> str:
+        """
+        Return the URL of the synthetic feed
+
+        :param str feed_format: 'rss' or 'atom'
+        :param int entries_count: the number of the entries
+        :return: the feed URL
+        """
+        return self.base_url + '/' + feed_format + '/' + str(entries_count)
+
+    def get_content(self, path: str):
+        """
+        Return the content of the server path
+
+        :param str path: the request path, '/<format>/<entries count>' or '/images/<number>.jpg'
+        :return: (content type, content) or None if the path is not found
+        """
+        parts = path.strip('/').split('/')
+        if len(parts) != 2:
+            return None
+        with self._lock:
+            if path not in self._contents:
+                if parts[0] in feed_formats and parts[1].isdigit():
+                    content_type = 'application/rss+xml' if parts[0] == 'rss' else 'application/atom+xml'
+                    self._contents[path] = (content_type + '; charset=utf-8',
+                                            get_feed_content(parts[0], int(parts[1]), self.base_url))
+                elif parts[0] == 'images' and parts[1].endswith('.jpg') and parts[1][:-4].isdigit():
+                    self._contents[path] = ('image/jpeg', get_image_content(int(parts[1][:-4])))
+                else:
+                    return None
+            return self._contents[path]
+
+    def _get_handler_class(self):
+        """
+        Build the request handler class serving the contents of this server
+
+        :return: the request handler class
+        """
+        server = self
+
+        class FeedRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self) -> None:
+                content = server.get_content(self.path)
+                if content is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content[0])
+                self.send_header('Content-Length', str(len(content[1])))
+                self.end_headers()
+                self.wfile.write(content[1])
+
+            def log_message(self, format, *args) -> None:
+                # the requests are not logged to keep the benchmark output readable
+                pass
+
+        return FeedRequestHandler
@@ -0,0 +1,60 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+"""
+Measure the full-text search time of the news storage
+
+Run from the rss_reader folder: python -m benchmarks.full_text_search [posts count]
+"""
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from src.models import Feed, Post
+from src.news_query import NewsQuery
+from src.news_storage import NewsStorage
+
+WORDS = ("ukraine", "weather", "market", "election", "sport", "science", "health", "music", "travel", "space",
+         "economy", "climate", "energy", "football", "festival", "vaccine", "startup", "history", "ocean", "film")
+
+
+def get_test_feeds(posts_count: int, feeds_count: int = 20) -> list:
+    """
+    Build the feeds with the posts of random titles
+
+    :param int posts_count: the posts count
+    :param int feeds_count: the feeds count
+    :return: a list of RSS feeds
+    """
+    test_random = random.Random(0)
+    feeds = []
+    for feed_number in range(feeds_count):
+        posts = [Post(' '.join(test_random.choices(WORDS, k=6)) + " " + str(i),
+                      "2022%02d%02d" % (i % 12 + 1, i % 28 + 1), "https://example.com/" + str(feed_number) + "/" + str(i))
+                 for i in range(posts_count // feeds_count)]
+        feeds.append(Feed("Feed " + str(feed_number), "https://example.com/" + str(feed_number), posts))
+    return feeds
+
+
+def main() -> None:
+    posts_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    news_folder = tempfile.mkdtemp()
+    try:
+        with NewsStorage(news_folder) as storage:
+            start_time = time.perf_counter()
+            for feed in get_test_feeds(posts_count):
+                storage.add_posts(feed)
+            print(f"{posts_count} posts saved in {time.perf_counter() - start_time:.1f} s")
+            for search in ("ukraine", "ukraine climate", "vaccine football ocean", "12345"):
+                start_time = time.perf_counter()
+                found = list(storage.find_posts(NewsQuery(search=search, limit=20)))
+                print(f"{search!r:26} {len(found):3} posts in {(time.perf_counter() - start_time) * 1000:7.2f} ms")
+    finally:
+        shutil.rmtree(news_folder)
+
+
+if __name__ == '__main__':
+    main()
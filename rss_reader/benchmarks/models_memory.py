@@ -0,0 +1,79 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+"""
+Compare the memory used by the posts as plain dicts and as `Post` objects
+
+Run from the rss_reader folder: python -m benchmarks.models_memory [posts count]
+"""
+import sys
+import tracemalloc
+
+from src.models import Feed, Post
+
+
+def get_posts_fields(count: int) -> list:
+    """
+    Build the fields of the test posts. The strings are created before the measurement, so only the containers of
+    the posts are measured
+
+    :param int count: the posts count
+    :return: a list of (title, date, link, links) tuples
+    """
+    return [("Post " + str(i), "20220905", "https://example.com/" + str(i),
+             ["https://example.com/" + str(i), "https://example.com/" + str(i) + ".jpg"]) for i in range(count)]
+
+
+def measure(build_feed, posts_fields: list) -> int:
+    """
+    Measure the memory allocated by the feed
+
+    :param build_feed: a function building the feed from the posts fields
+    :param list posts_fields: the fields of the posts
+    :return: the allocated bytes
+    """
+    tracemalloc.start()
+    feed = build_feed(posts_fields)
+    allocated_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del feed
+    return allocated_size
+
+
+def build_dict_feed(posts_fields: list) -> dict:
+    """
+    Build the feed as a formatted dictionary of RSS feed topics
+
+    :param list posts_fields: the fields of the posts
+    :return: formatted dict
+    """
+    return {'Blog title': "Test feed", 'Blog link': "https://example.com",
+            'posts': [{'title': title, 'date': date, 'link': link, 'links': list(links)}
+                      for title, date, link, links in posts_fields]}
+
+
+def build_model_feed(posts_fields: list) -> Feed:
+    """
+    Build the feed as a `Feed` object
+
+    :param list posts_fields: the fields of the posts
+    :return: the RSS feed with its topics
+    """
+    return Feed("Test feed", "https://example.com",
+                [Post(title, date, link, tuple(links)) for title, date, link, links in posts_fields])
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    posts_fields = get_posts_fields(count)
+    dict_size = measure(build_dict_feed, posts_fields)
+    model_size = measure(build_model_feed, posts_fields)
+    print(f"{count} posts")
+    print(f"dict: {dict_size / 2 ** 20:8.2f} MiB, {dict_size / count:6.1f} bytes per post")
+    print(f"Post: {model_size / 2 ** 20:8.2f} MiB, {model_size / count:6.1f} bytes per post")
+    print(f"saving: {1 - model_size / dict_size:.0%}")
+
+
+if __name__ == '__main__':
+    main()
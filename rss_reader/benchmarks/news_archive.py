@@ -0,0 +1,92 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+"""
+Compare the disk footprint and the load time of a year of history of a feed in the news archive formats and in the
+legacy pretty-printed JSON snapshots
+
+Run from the rss_reader folder: python -m benchmarks.news_archive [posts per day]
+"""
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from src.models import Feed, Post
+from src.news_archive import archive_formats, append_posts, read_news_file
+
+
+def get_year_feeds(posts_per_day: int) -> list:
+    """
+    Build a year of daily fetches of a feed. Every fetch has the posts of the day and of the previous day, like the
+    real feeds
+
+    :param int posts_per_day: the number of new posts per day
+    :return: a list of (date, RSS feed) pairs
+    """
+    feeds = []
+    day = datetime.date(2022, 1, 1)
+    previous_posts = []
+    for _ in range(365):
+        date = day.strftime('%Y%m%d')
+        posts = [Post("Post " + str(i) + " of the day " + date, date, "https://example.com/news/" + date + "/" + str(i),
+                      ("https://example.com/news/" + date + "/" + str(i), "https://example.com/images/" + date + "-"
+                       + str(i) + ".jpg")) for i in range(posts_per_day)]
+        feeds.append((date, Feed("Test feed", "https://example.com/news", posts + previous_posts)))
+        previous_posts = posts
+        day += datetime.timedelta(days=1)
+    return feeds
+
+
+def write_archive(folder: str, cache_format: str, feeds: list) -> list:
+    """
+    Write the daily fetches to the news folder. The legacy format rewrites the whole fetch, the archive formats
+    append only the posts which were not saved yet
+
+    :param str folder: the news folder
+    :param str cache_format: 'json' for the legacy format or one of `archive_formats` keys
+    :param list feeds: the daily fetches
+    :return: the written file names
+    """
+    file_names = []
+    saved_links = set()
+    for date, feed in feeds:
+        file_name = os.path.join(folder, "Test_feed-" + date + archive_formats.get(cache_format, '.json'))
+        if cache_format == 'json':
+            with open(file_name, 'w', encoding='utf-8') as f:
+                json.dump(feed.to_dict(), f, ensure_ascii=False, indent=4)
+        else:
+            new_posts = [post for post in feed.posts if post.link not in saved_links]
+            saved_links.update(post.link for post in new_posts)
+            append_posts(file_name, feed, new_posts)
+        file_names.append(file_name)
+    return file_names
+
+
+def main() -> None:
+    posts_per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    feeds = get_year_feeds(posts_per_day)
+    print(f"365 days, {posts_per_day} posts per day")
+    for cache_format in ['json'] + list(archive_formats):
+        folder = tempfile.mkdtemp()
+        try:
+            file_names = write_archive(folder, cache_format, feeds)
+            size = sum(os.path.getsize(file_name) for file_name in file_names)
+            start_time = time.perf_counter()
+            posts_count = sum(len(read_news_file(file_name).posts) for file_name in file_names)
+            load_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            read_news_file(file_names[180], feeds[180][0])
+            day_load_time = time.perf_counter() - start_time
+        finally:
+            shutil.rmtree(folder)
+        print(f"{cache_format:9} {size / 2 ** 20:8.2f} MiB, {posts_count} posts loaded in {load_time * 1000:8.1f} ms, "
+              f"a day in {day_load_time * 1000:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+"""
+Time the stages of the reader pipeline on the synthetic feeds of the local fixture server: the feed fetch, the feed
+parsing, the posts conversion, the de-duplication, the JSON and plain text printing, the PDF and HTML saving, the news
+caching and the cached news search. Every stage reports its throughput, the peak RSS of the process and the ratio to
+the stored baseline
+
+Run from the rss_reader folder: python -m benchmarks.pipeline [entries counts] [--format rss|atom] [--save-baseline]
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.feed_server import FeedServer, FIRST_DATE, feed_formats
+from src import html_processor, image_cache, utilities
+from src.file_processing_utilities import search_and_print_news
+from src.news_query import NewsQuery
+from src.rss_reader_impl import RSSReader, parser_backends
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def get_peak_rss() -> int:
+    """
+    Return the peak resident set size of the process. The peak only grows, so the stages report the peak after them
+
+    :return: the peak RSS in bytes or 0 if it is not available on the platform
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+def run_stage(function, repeat: int) -> float:
+    """
+    Run the stage several times
+
+    :param function: the stage function without arguments
+    :param int repeat: the number of the runs
+    :return: the best time in seconds
+    """
+    best_time = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        run_time = time.perf_counter() - start_time
+        best_time = run_time if best_time is None else min(best_time, run_time)
+    return best_time
+
+
+def run_pipeline(url: str, work_folder: str, repeat: int, pdf_limit: int, parser: str = 'feedparser') -> dict:
+    """
+    Time the pipeline stages of the feed. The results of every stage are the input of the next one
+
+    :param str url: the feed URL
+    :param str work_folder: the folder of the PDF, HTML, images and news files
+    :param int repeat: the number of the runs of every stage
+    :param int pdf_limit: the number of the posts saved to PDF, 0 means all
+    :param str parser: the feed parser, one of `parser_backends`
+    :return: a dictionary of the stage name and its results
+    """
+    reader = RSSReader(url, parser=parser)
+    results = {}
+    state = {}
+
+    def fetch():
+        state['response'] = utilities.check_feed_url(url)
+
+    def parse():
+        state['rss_feed'] = reader._parse_feed(state['response'], url)
+
+    def get_posts():
+        state['data'] = reader._get_posts_details(state['rss_feed'])
+
+    def dedup():
+        seen_keys = set()
+        for entry in state['rss_feed'].entries:
+            seen_keys.add(reader._get_post_key(entry))
+
+    def print_json():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            reader._print_json(state['data'])
+
+    def print_plain():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            reader._print_plain_text(state['data'])
+
+    def save_pdf():
+        from src import pdf_processor
+
+        pdf_processor.save_data_to_pdf(state['data'], pdf_limit)
+
+    def save_html():
+        html_processor.save_data_to_html(state['data'], 0)
+
+    def save():
+        # every run caches the feed to an empty news folder, otherwise there are no new posts
+        reader._news_folder = tempfile.mkdtemp(dir=work_folder)
+        reader._save_historical_data(state['data'])
+
+    def search():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            search_and_print_news(reader._news_folder, NewsQuery(FIRST_DATE.strftime('%Y%m%d')))
+
+    stages = (('fetch', fetch, 'rss_feed'), ('parse', parse, 'rss_feed'), ('posts', get_posts, 'posts'),
+              ('dedup', dedup, 'rss_feed'), ('print_json', print_json, 'posts'),
+              ('print_plain', print_plain, 'posts'), ('pdf', save_pdf, 'pdf'), ('html', save_html, 'posts'),
+              ('save', save, 'posts'), ('search', search, 'posts'))
+    for name, function, items_name in stages:
+        results[name] = {'seconds': run_stage(function, repeat), 'peak_rss': get_peak_rss()}
+    # the throughput of the fetch is counted in the entries of the fetched feed too
+    posts_count = len(state['data'].posts)
+    items = {'rss_feed': len(state['rss_feed'].entries), 'posts': posts_count,
+             'pdf': min(posts_count, pdf_limit) if pdf_limit else posts_count}
+    for name, function, items_name in stages:
+        results[name]['items'] = items[items_name]
+    return results
+
+
+@contextlib.contextmanager
+def use_work_folder(work_folder: str):
+    """
+    Save the PDF, HTML and image files to the work folder instead of the reader folders
+
+    :param str work_folder: the work folder
+    :return: a context manager
+    """
+    from src import pdf_processor
+
+    folders = (pdf_processor.news_pdf_folder, html_processor.news_html_folder, image_cache.news_images_folder)
+    pdf_processor.news_pdf_folder = os.path.join(work_folder, 'news_pdf')
+    html_processor.news_html_folder = os.path.join(work_folder, 'news_html')
+    image_cache.news_images_folder = os.path.join(work_folder, 'news_images')
+    try:
+        yield
+    finally:
+        pdf_processor.news_pdf_folder, html_processor.news_html_folder, image_cache.news_images_folder = folders
+
+
+def read_baseline(file_name: str) -> dict:
+    """
+    Read the stored baseline
+
+    :param str file_name: the baseline file
+    :return: a dictionary of '<format>/<entries count>' and the stage times in seconds, empty if there is no baseline
+    """
+    try:
+        with open(file_name, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def print_results(key: str, results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Print the stage results of the feed compared to the baseline
+
+    :param str key: the '<format>/<entries count>' key of the feed
+    :param dict results: the stage results
+    :param dict baseline: the stored baseline
+    :param float tolerance: the allowed slowdown relative to the baseline, 0.5 means 50%
+    :return: a list of the regressed stage names
+    """
+    regressions = []
+    print(key)
+    print(f"  {'stage':12} {'items':>7} {'time, ms':>10} {'items/s':>11} {'peak RSS, MB':>13} {'vs baseline':>12}")
+    for name, result in results.items():
+        baseline_seconds = baseline.get(key, {}).get(name)
+        comparison = ''
+        if baseline_seconds:
+            ratio = result['seconds'] / baseline_seconds
+            comparison = f"x{ratio:.2f}"
+            if ratio > 1 + tolerance:
+                comparison += ' slower'
+                regressions.append(key + ' ' + name)
+        throughput = result['items'] / result['seconds'] if result['seconds'] else 0
+        print(f"  {name:12} {result['items']:7} {result['seconds'] * 1000:10.2f} {throughput:11.0f} "
+              f"{result['peak_rss'] / 2 ** 20:13.1f} {comparison:>12}")
+    return regressions
+
+
+def get_arguments_parser() -> argparse.ArgumentParser:
+    """
+    Build the benchmark arguments parser
+
+    :return: the arguments parser
+    """
+    parser = argparse.ArgumentParser(description='Offline benchmark of the reader pipeline stages')
+    parser.add_argument('entries', nargs='*', type=int, default=[10, 1000, 10000],
+                        help='The entries counts of the synthetic feeds')
+    parser.add_argument('--format', choices=feed_formats, action='append', dest='formats',
+                        help='The feed format, both formats by default')
+    parser.add_argument('--repeat', type=int, default=3, help='The runs of every stage, the best time is reported')
+    parser.add_argument('--pdf-limit', type=int, default=200,
+                        help='The number of the posts saved to PDF, 0 means all')
+    parser.add_argument('--parser', choices=parser_backends, default='feedparser', help='The feed parser')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='The baseline file')
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='The allowed slowdown relative to the baseline before the run fails, 0.5 means 50%%')
+    return parser
+
+
+def main() -> None:
+    args = get_arguments_parser().parse_args()
+    baseline = read_baseline(args.baseline)
+    new_baseline = dict(baseline)
+    regressions = []
+    work_folder = tempfile.mkdtemp()
+    try:
+        with FeedServer() as server, use_work_folder(work_folder):
+            for feed_format in args.formats or feed_formats:
+                for entries_count in args.entries:
+                    key = feed_format + '/' + str(entries_count)
+                    results = run_pipeline(server.get_feed_url(feed_format, entries_count),
+                                           tempfile.mkdtemp(dir=work_folder), max(args.repeat, 1), args.pdf_limit,
+                                           args.parser)
+                    regressions.extend(print_results(key, results, baseline, args.tolerance))
+                    new_baseline[key] = {name: round(result['seconds'], 6) for name, result in results.items()}
+    finally:
+        shutil.rmtree(work_folder)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(new_baseline, file, indent=4, sort_keys=True)
+            file.write('\n')
+        print("Baseline saved to", args.baseline)
+    elif regressions:
+        print("Slower than the baseline:", ', '.join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
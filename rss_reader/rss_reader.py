@@ -4,48 +4,202 @@
 #  Copyright (c) 2022.
 
 import argparse
+import sys
 
-from src.rss_reader_impl import RSSReader
-
-# adding CLI arguments
-parser = argparse.ArgumentParser(prog='RSS reader', description='Pure Python command-line RSS reader.',
-                                 epilog='Enjoy the program!')
-parser.add_argument('--url',
-                    action='store',
-                    type=str,
-                    help='RSS feed URL')
-parser.add_argument('--version',
-                    action='version',
-                    version='%(prog)s v.4.0',
-                    help='Print version info and exits')
-parser.add_argument('-j',
-                    '--json',
-                    action='store_true',
-                    help='Print result as JSON in stdout')
-parser.add_argument('--verbose',
-                    action='store_true',
-                    help='Outputs verbose status messages')
-parser.add_argument('--limit',
-                    action='store',
-                    type=int,
-                    help='Limit news topics if this parameter provided')
-parser.add_argument('--date',
-                    action='store',
-                    type=str,
-                    help='The date getting news from local storage')
-parser.add_argument('--to_pdf',
-                    action='store_true',
-                    help='Save results as PDF file')
-parser.add_argument('--to_html',
-                    action='store_true',
-                    help='Save results as HTML file')
-# parsing CLI arguments
-args = parser.parse_args()
+from src.date_index import index_backends
+from src.file_processing_utilities import read_feeds_file, read_feed_intervals
+from src.news_query import NewsQuery
+from src.metrics import Metrics, MetricsRecorder, JSONStatsSink, PrometheusFileSink, null_metrics
+from src.news_archive import archive_formats
+from src.news_retention import RetentionPolicy
+from src.rss_reader_impl import RSSReader, dedup_strategies, parser_backends, default_workers
+
+
+def get_arguments_parser() -> argparse.ArgumentParser:
+    """
+    Build the CLI arguments parser. Arguments are parsed in `main`, so importing the module has no side effects
+
+    :return: the CLI arguments parser
+    """
+    # adding CLI arguments
+    parser = argparse.ArgumentParser(prog='RSS reader', description='Pure Python command-line RSS reader.',
+                                     epilog='Enjoy the program!')
+    parser.add_argument('--url',
+                        action='extend',
+                        nargs='+',
+                        type=str,
+                        help='RSS feed URL. Several URLs can be provided')
+    parser.add_argument('--feeds-file',
+                        action='store',
+                        type=str,
+                        help='The file with RSS feed URLs, one URL per line')
+    parser.add_argument('--workers',
+                        action='store',
+                        type=int,
+                        default=default_workers,
+                        help='The number of RSS feeds fetched concurrently')
+    parser.add_argument('--version',
+                        action='version',
+                        version='%(prog)s v.4.0',
+                        help='Print version info and exits')
+    parser.add_argument('-j',
+                        '--json',
+                        action='store_true',
+                        help='Print result as JSON in stdout')
+    parser.add_argument('--verbose',
+                        action='store_true',
+                        help='Outputs verbose status messages')
+    parser.add_argument('--limit',
+                        action='store',
+                        type=int,
+                        help='Limit news topics if this parameter provided. Only the limited topics are cached')
+    parser.add_argument('--date',
+                        action='store',
+                        type=str,
+                        help='The date getting news from local storage')
+    parser.add_argument('--to_pdf',
+                        action='store_true',
+                        help='Save results as PDF file')
+    parser.add_argument('--to_html',
+                        action='store_true',
+                        help='Save results as HTML file')
+    parser.add_argument('--dedup',
+                        action='store',
+                        choices=list(dedup_strategies),
+                        default='auto',
+                        help='The key of duplicated posts: GUID, then link, then title (auto) or a single field')
+    parser.add_argument('--pdf-image-dpi',
+                        action='store',
+                        type=int,
+                        default=0,
+                        help='Downscale images in PDF to this resolution to make the file smaller')
+    parser.add_argument('--pdf-image-quality',
+                        action='store',
+                        type=int,
+                        default=75,
+                        help='The JPEG quality from 1 to 95 of downscaled images in PDF')
+    parser.add_argument('--html-page-size',
+                        action='store',
+                        type=int,
+                        default=0,
+                        help='Split HTML into pages of this number of posts with an index page')
+    parser.add_argument('--render-workers',
+                        action='store',
+                        type=int,
+                        default=0,
+                        help='Save PDF and HTML in this number of separate processes, 0 saves them with the feeds')
+    parser.add_argument('--watch',
+                        action='store_true',
+                        help='Poll the feeds until interrupted and print new posts as JSON Lines')
+    parser.add_argument('--interval',
+                        action='store',
+                        type=float,
+                        default=300,
+                        help='The poll interval in seconds in watch mode. A feed in the feeds file can have its own '
+                             'interval after the URL')
+    parser.add_argument('--cache-format',
+                        action='store',
+                        choices=list(archive_formats),
+                        default='jsonl',
+                        help='The format of the news archive: JSON Lines, gzip-compressed JSON Lines or compressed '
+                             'binary blocks')
+    parser.add_argument('--index',
+                        action='store',
+                        choices=index_backends,
+                        default='sqlite',
+                        help='The date lookup index: the SQLite storage or the memory-mapped sorted index of the '
+                             'archive files for shared hosts')
+    parser.add_argument('--from',
+                        action='store',
+                        type=str,
+                        dest='date_from',
+                        help='The first date of the range getting news from local storage')
+    parser.add_argument('--to',
+                        action='store',
+                        type=str,
+                        dest='date_to',
+                        help='The last date of the range getting news from local storage')
+    parser.add_argument('--feed-title',
+                        action='store',
+                        type=str,
+                        help='Get news from local storage of the feeds which titles contain this text')
+    parser.add_argument('--contains',
+                        action='store',
+                        type=str,
+                        help='Get news from local storage which titles or links contain this text')
+    parser.add_argument('--search',
+                        action='store',
+                        type=str,
+                        help='Full-text search of news titles and links in local storage, the most relevant first')
+    parser.add_argument('--max-age',
+                        action='store',
+                        type=int,
+                        help='Remove the news, PDF and HTML files older than this number of days')
+    parser.add_argument('--max-bytes',
+                        action='store',
+                        type=int,
+                        help='Remove the oldest news, PDF and HTML files while a folder is larger than this size in '
+                             'bytes')
+    parser.add_argument('--max-files-per-feed',
+                        action='store',
+                        type=int,
+                        help='Keep only this number of the newest files of every feed in the news, PDF and HTML '
+                             'folders')
+    parser.add_argument('--compact',
+                        action='store_true',
+                        help='Merge the daily news files of every feed into monthly files')
+    parser.add_argument('--stats',
+                        action='store',
+                        nargs='?',
+                        const='-',
+                        metavar='FILE',
+                        help='Dump the stage times and the counters of every feed as JSON to the file, or to stderr '
+                             'if no file is given')
+    parser.add_argument('--metrics-file',
+                        action='store',
+                        type=str,
+                        help='Write the stage times and the counters in the Prometheus text format to the file')
+    parser.add_argument('--parser',
+                        action='store',
+                        choices=parser_backends,
+                        default='feedparser',
+                        help='The feed parser: feedparser or the fast parser of well-formed RSS 2.0 and Atom feeds, '
+                             'which falls back to feedparser for other feeds')
+    parser.add_argument('--profile',
+                        action='store',
+                        nargs='?',
+                        const='rss_reader_profile',
+                        metavar='PREFIX',
+                        help='Profile the run and save the cProfile stats PREFIX.prof and the collapsed stacks '
+                             'PREFIX.folded for flame graphs')
+    parser.add_argument('--profile-memory',
+                        action='store_true',
+                        help='Save the top allocation sites of the posts extraction, PDF, HTML and cache writing to '
+                             'PREFIX.memory.txt of the profile')
+    return parser
 
 
 # check and initial defining optional arguments
-def set_url(arguments) -> str:
-    return arguments.url
+def set_url(arguments) -> list:
+    urls = list(arguments.url or [])
+    if arguments.feeds_file is not None:
+        try:
+            urls.extend(read_feeds_file(arguments.feeds_file))
+        except (OSError, ValueError) as err:
+            print("The feeds file cannot be read", str(err))
+            sys.exit(1)
+    return urls or None
+
+
+def set_feed_intervals(arguments) -> dict:
+    if arguments.feeds_file is not None:
+        try:
+            return read_feed_intervals(arguments.feeds_file)
+        except (OSError, ValueError) as err:
+            print("The feeds file cannot be read", str(err))
+            sys.exit(1)
+    else:
+        return {}
 
 
 def check_is_JSON_needed(arguments) -> bool:
@@ -75,9 +229,107 @@ def set_html(arguments) -> bool:
     return arguments.to_html
 
 
+def set_workers(arguments) -> int:
+    if arguments.workers is not None and arguments.workers > 0:
+        return arguments.workers
+    else:
+        return 1
+
+
+def set_dedup(arguments) -> str:
+    return arguments.dedup
+
+
+def set_pdf_image_dpi(arguments) -> int:
+    if arguments.pdf_image_dpi is not None and arguments.pdf_image_dpi > 0:
+        return arguments.pdf_image_dpi
+    else:
+        return 0
+
+
+def set_pdf_image_quality(arguments) -> int:
+    return min(max(arguments.pdf_image_quality, 1), 95)
+
+
+def set_html_page_size(arguments) -> int:
+    if arguments.html_page_size is not None and arguments.html_page_size > 0:
+        return arguments.html_page_size
+    else:
+        return 0
+
+
+def set_render_workers(arguments) -> int:
+    if arguments.render_workers is not None and arguments.render_workers > 0:
+        return arguments.render_workers
+    else:
+        return 0
+
+
+def check_is_watch(arguments) -> bool:
+    return arguments.watch
+
+
+def set_interval(arguments) -> float:
+    if arguments.interval is not None and arguments.interval > 0:
+        return arguments.interval
+    else:
+        return 300
+
+
+def set_cache_format(arguments) -> str:
+    return arguments.cache_format
+
+
+def set_index(arguments) -> str:
+    return arguments.index
+
+
+def set_news_query(arguments) -> NewsQuery:
+    return NewsQuery(arguments.date_from, arguments.date_to, arguments.feed_title, arguments.contains,
+                     search=arguments.search)
+
+
+def set_retention_policy(arguments) -> RetentionPolicy:
+    limits = (arguments.max_age, arguments.max_bytes, arguments.max_files_per_feed)
+    return RetentionPolicy(*(limit if limit is not None and limit > 0 else 0 for limit in limits))
+
+
+def check_is_compact(arguments) -> bool:
+    return arguments.compact
+
+
+def set_metrics(arguments) -> Metrics:
+    sinks = []
+    if arguments.stats is not None:
+        sinks.append(JSONStatsSink(arguments.stats))
+    if arguments.metrics_file is not None:
+        sinks.append(PrometheusFileSink(arguments.metrics_file))
+    return MetricsRecorder(sinks) if sinks else null_metrics
+
+
+def set_profile(arguments) -> str:
+    if arguments.profile is None and arguments.profile_memory:
+        return 'rss_reader_profile'
+    return arguments.profile
+
+
+def check_is_profile_memory(arguments) -> bool:
+    return arguments.profile_memory
+
+
+def set_parser(arguments) -> str:
+    return arguments.parser
+
+
 def main():
+    args = get_arguments_parser().parse_args()
     rss_reader = RSSReader(set_url(args), check_is_JSON_needed(args), check_is_verbose(args), set_limit(args),
-                           set_date(args), set_pdf(args), set_html(args))
+                           set_date(args), set_pdf(args), set_html(args), set_workers(args), set_dedup(args),
+                           set_pdf_image_dpi(args), set_pdf_image_quality(args), set_html_page_size(args),
+                           check_is_watch(args), set_interval(args), set_feed_intervals(args), set_cache_format(args),
+                           set_index(args), set_news_query(args), set_retention_policy(args), check_is_compact(args),
+                           set_metrics(args), set_profile(args), check_is_profile_memory(args),
+                           set_parser(args), set_render_workers(args))
     rss_reader.show_rss()
 
 
@@ -0,0 +1,92 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .models import Feed
+from .rss_reader_impl import RSSReader
+
+
+class AsyncRSSReader:
+    """
+    The asyncio API of the reader for embedding in services. Feeds are returned as `Feed` objects, nothing is printed
+    and the `rss_reader_errors` exceptions are raised instead of exiting. The feeds are downloaded and parsed by a pool
+    of `max_concurrency` worker threads, so the concurrency is capped by the pool size, the requests are not
+    multiplexed on the event loop
+    """
+
+    def __init__(self, limit: int = 0, dedup: str = 'auto', max_concurrency: int = 64,
+                 parser: str = 'feedparser', http_cache_folder: str = None) -> None:
+        """
+        The class constructor
+
+        :param int limit: Limit news topics if this parameter provided
+        :param str dedup: The de-duplication strategy of posts, one of `dedup_strategies` keys
+        :param int max_concurrency: The max number of feeds fetched and parsed at the same time
+        :param str parser: The feed parser, one of `parser_backends`
+        :param str http_cache_folder: The folder of the HTTP conditional GET cache, None disables the cache
+        """
+        self._reader = RSSReader(limit=limit, dedup=dedup, parser=parser, http_cache_folder=http_cache_folder)
+        self._max_concurrency = max_concurrency
+        self._executor = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop the worker threads
+
+        :return: None
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def get_feed(self, url: str) -> Feed:
+        """
+        Get the RSS feed. The blocking download over the shared HTTP connection pool and the parsing run in worker
+        threads, so the event loop is never blocked
+
+        :param str url: an RSS-feed URL
+        :return: the RSS feed with its topics, raise an error in case of present
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency,
+                                                thread_name_prefix='AsyncRSSReader')
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._reader.fetch_feed, url)
+
+    async def get_feeds(self, urls: list, return_exceptions: bool = False) -> list:
+        """
+        Get several RSS feeds concurrently
+
+        :param list urls: RSS-feed URLs
+        :param bool return_exceptions: return the errors in the results instead of raising the first one
+        :return: a list of RSS feeds in the order of the URLs
+        """
+        return await asyncio.gather(*(self.get_feed(url) for url in urls), return_exceptions=return_exceptions)
+
+    async def iter_feeds(self, urls: list):
+        """
+        Get several RSS feeds concurrently and yield every feed as soon as it is ready
+
+        :param list urls: RSS-feed URLs
+        :return: an async generator of (URL, RSS feed or the raised error) pairs
+        """
+
+        async def get_feed_result(url):
+            try:
+                return url, await self.get_feed(url)
+            except Exception as err:
+                return url, err
+
+        for future in asyncio.as_completed([get_feed_result(url) for url in urls]):
+            yield await future
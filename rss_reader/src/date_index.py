@@ -0,0 +1,418 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import bisect
+import contextlib
+import itertools
+import json
+import mmap
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:
+    # the index is not locked on Windows
+    fcntl = None
+
+from . import file_processing_utilities, news_archive
+from .models import Post
+from .news_query import NewsQuery
+
+# the date lookup backends: the SQLite storage index or the memory-mapped sidecar index of the archive files
+index_backends = ('sqlite', 'mmap')
+# the record is the post date, the feed id, the archive file id and the offset of the post line in the file
+_record = struct.Struct('>8sIIQ')
+
+
+class _RecordDates:
+    """The read-only sequence of the record dates of the sorted index used for the binary search"""
+
+    def __init__(self, index_map) -> None:
+        self._index_map = index_map
+
+    def __len__(self) -> int:
+        return len(self._index_map) // _record.size
+
+    def __getitem__(self, position: int) -> bytes:
+        offset = position * _record.size
+        return self._index_map[offset:offset + 8]
+
+
+class DateIndex:
+    """
+    The sidecar index of the news archive files by the post date. The index file keeps fixed-width records sorted by
+    (date, feed id, file id, offset) and is opened with mmap, so a date lookup is a binary search and only the matching
+    posts are read from the archive. New records are appended to a small unsorted file which is merged into the sorted
+    file when it grows. The index is rebuilt from the archive if it does not exist. Several processes can share the
+    news folder, so the index is changed under an exclusive lock of the lock file
+    """
+
+    index_file_name = 'news.idx'
+    pending_file_name = 'news.idx.new'
+    catalog_file_name = 'news.idx.json'
+    lock_file_name = 'news.idx.lock'
+    # the number of the pending records merged into the sorted index at once
+    merge_threshold = 4096
+
+    def __init__(self, news_folder: str) -> None:
+        """
+        Open the index in the news folder
+
+        :param str news_folder: the news folder
+        """
+        self._news_folder = news_folder
+        self._index_path = os.path.join(news_folder, self.index_file_name)
+        self._pending_path = os.path.join(news_folder, self.pending_file_name)
+        self._catalog_path = os.path.join(news_folder, self.catalog_file_name)
+        self._lock_path = os.path.join(news_folder, self.lock_file_name)
+        with self._lock():
+            self._catalog = self._read_catalog()
+            if self._catalog is None or not file_processing_utilities.is_file_exists(self._index_path):
+                self._rebuild()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Merge the pending records if there are many of them
+
+        :return: None
+        """
+        with self._lock():
+            if self._get_pending_size() >= self.merge_threshold * _record.size:
+                self._merge_pending_records()
+
+    def rebuild(self) -> int:
+        """
+        Build the index from scratch from all archive files in the news folder
+
+        :return: the number of indexed posts
+        """
+        with self._lock():
+            return self._rebuild()
+
+    def _rebuild(self) -> int:
+        """
+        Build the index from scratch, the index must be locked
+
+        :return: the number of indexed posts
+        """
+        self._catalog = {'feeds': [], 'files': {}}
+        for file_name in (self._index_path, self._pending_path):
+            if file_processing_utilities.is_file_exists(file_name):
+                os.remove(file_name)
+        open(self._index_path, 'wb').close()
+        indexed_posts = self._update()
+        self._merge_pending_records()
+        return indexed_posts
+
+    def update(self) -> int:
+        """
+        Index the posts appended to the archive files since the last update
+
+        :return: the number of indexed posts
+        """
+        with self._lock():
+            self._reload_catalog()
+            return self._update()
+
+    def _update(self) -> int:
+        """
+        Index the posts appended to the archive files, the index must be locked
+
+        :return: the number of indexed posts
+        """
+        return self._add_records(self._index_file(file_name)
+                                 for file_name in news_archive.gen_news_files(self._news_folder))
+
+    def update_file(self, file_name: str) -> int:
+        """
+        Index the posts appended to the archive file since the last update
+
+        :param str file_name: path to the archive file
+        :return: the number of indexed posts
+        """
+        with self._lock():
+            self._reload_catalog()
+            return self._add_records([self._index_file(file_name)])
+
+    @contextlib.contextmanager
+    def _lock(self):
+        """
+        Lock the index exclusively. The lock is released when the lock file is closed
+
+        :return: a context manager holding the lock
+        """
+        with open(self._lock_path, 'ab') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def _reload_catalog(self) -> None:
+        """
+        Read the catalog again, so the files and the feeds indexed by the other processes keep their ids. The index
+        must be locked
+
+        :return: None
+        """
+        catalog = self._read_catalog()
+        if catalog is not None:
+            self._catalog = catalog
+
+    def _add_records(self, files_records) -> int:
+        """
+        Append the records to the pending records and save the catalog
+
+        :param files_records: an iterable of the records lists of the archive files
+        :return: the number of added records
+        """
+        added_records = 0
+        with open(self._pending_path, 'ab') as f:
+            for records in files_records:
+                f.write(b''.join(_record.pack(*record) for record in records))
+                added_records += len(records)
+        self._write_catalog()
+        return added_records
+
+    def _index_file(self, file_name: str) -> list:
+        """
+        Read the records of the posts appended to the archive file since the last update and update its catalog entry.
+        Only the new part of a JSON Lines file is read, the other formats are indexed by the dates of their posts
+
+        :param str file_name: path to the archive file
+        :return: a list of (date, feed id, file id, offset) records
+        """
+        relative_name = os.path.relpath(file_name, self._news_folder)
+        file_entry = self._catalog['files'].get(relative_name)
+        if file_entry is not None and file_entry['size'] == os.path.getsize(file_name):
+            return []
+        if file_entry is None:
+            file_entry = {'id': len(self._catalog['files']), 'feed_id': None, 'size': 0}
+        try:
+            if file_name.endswith('.jsonl'):
+                records = self._read_json_lines_records(file_name, file_entry)
+            else:
+                records = self._read_archive_records(file_name, file_entry)
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            # a broken archive file must not prevent indexing the rest of the news
+            return []
+        self._catalog['files'][relative_name] = file_entry
+        return records
+
+    def find_posts_by_date(self, date: str):
+        """
+        Find the posts by the date
+
+        :param str date: the date in 'yyyymmdd' format
+        :return: a generator of (feed title, post) pairs ordered by the feed
+        """
+        return self.find_posts(NewsQuery(date, date))
+
+    def find_posts(self, query: NewsQuery):
+        """
+        Find the posts matching the query. The records of the date range are binary searched and the records of the
+        other feeds are dropped before any post is read, the posts are read lazily up to the limit
+
+        :param NewsQuery query: the news query
+        :return: a generator of (feed title, post) pairs ordered by the feed and the date
+        """
+        # the files and the feeds could be indexed by the other processes
+        self._reload_catalog()
+        date_range = query.get_date_range()
+        feed_ids = {feed_id for feed_id, feed_title in enumerate(self._catalog['feeds'])
+                    if query.match_feed(feed_title)}
+        records = {record for record in itertools.chain(self._find_sorted_records(date_range),
+                                                        self._find_pending_records(date_range))
+                   if record[1] in feed_ids}
+        posts = self._read_posts(sorted(records, key=lambda record: (record[1], record[0], record[2], record[3])),
+                                 date_range)
+        return itertools.islice(((feed_title, post) for feed_title, post in posts if query.match_post(post)),
+                                query.limit or None)
+
+    def _read_posts(self, records: list, date_range: tuple):
+        """
+        Read the posts of the records from the archive files
+
+        :param list records: the (date, feed id, file id, offset) records
+        :param tuple date_range: the first and the last date in 'yyyymmdd' format
+        :return: a generator of (feed title, post) pairs
+        """
+        files = {entry['id']: os.path.join(self._news_folder, name) for name, entry in self._catalog['files'].items()}
+        opened_files = {}
+        read_files = set()
+        try:
+            for record_date, feed_id, file_id, offset in records:
+                feed_title = self._catalog['feeds'][feed_id]
+                if file_id in read_files or not file_processing_utilities.is_file_exists(files[file_id]):
+                    # the posts of the file are already read or the file was removed after it was indexed
+                    continue
+                if files[file_id].endswith('.jsonl'):
+                    yield feed_title, self._read_json_line_post(opened_files, file_id, files[file_id], offset)
+                else:
+                    read_files.add(file_id)
+                    for post in news_archive.read_news_file(files[file_id], date_range).posts:
+                        yield feed_title, post
+        finally:
+            for opened_file in opened_files.values():
+                opened_file.close()
+
+    def _find_sorted_records(self, date_range: tuple):
+        """
+        Binary search the records of the date range in the sorted index
+
+        :param tuple date_range: the first and the last date in 'yyyymmdd' format
+        :return: a generator of (date, feed id, file id, offset) records
+        """
+        with open(self._index_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as index_map:
+                record_dates = _RecordDates(index_map)
+                last_date = date_range[1].encode('ascii')
+                position = bisect.bisect_left(record_dates, date_range[0].encode('ascii'))
+                while position < len(record_dates) and record_dates[position] <= last_date:
+                    yield _record.unpack_from(index_map, position * _record.size)
+                    position += 1
+
+    def _find_pending_records(self, date_range: tuple) -> list:
+        """
+        Scan the pending records of the date range
+
+        :param tuple date_range: the first and the last date in 'yyyymmdd' format
+        :return: a list of (date, feed id, file id, offset) records
+        """
+        first_date, last_date = date_range[0].encode('ascii'), date_range[1].encode('ascii')
+        return [record for record in self._read_pending_records() if first_date <= record[0] <= last_date]
+
+    def _read_pending_records(self) -> list:
+        """
+        Read the pending records, a partially written last record is skipped
+
+        :return: a list of (date, feed id, file id, offset) records
+        """
+        if not file_processing_utilities.is_file_exists(self._pending_path):
+            return []
+        with open(self._pending_path, 'rb') as f:
+            pending = f.read()
+        return list(_record.iter_unpack(pending[:len(pending) - len(pending) % _record.size]))
+
+    def _get_pending_size(self) -> int:
+        """
+        Return the size of the pending records file
+
+        :return: the size in bytes
+        """
+        if not file_processing_utilities.is_file_exists(self._pending_path):
+            return 0
+        return os.path.getsize(self._pending_path)
+
+    def _merge_pending_records(self) -> None:
+        """
+        Merge the pending records into the sorted index. The index is replaced atomically
+
+        :return: None
+        """
+        with open(self._index_path, 'rb') as f:
+            records = set(_record.iter_unpack(f.read()))
+        records.update(self._read_pending_records())
+        temp_file_name = self._index_path + '.tmp'
+        with open(temp_file_name, 'wb') as f:
+            f.write(b''.join(_record.pack(*record) for record in sorted(records)))
+        os.replace(temp_file_name, self._index_path)
+        if file_processing_utilities.is_file_exists(self._pending_path):
+            os.remove(self._pending_path)
+
+    def _read_json_lines_records(self, file_name: str, file_entry: dict) -> list:
+        """
+        Read the records of the posts appended to the JSON Lines file. A partially written last line is left for the
+        next update
+
+        :param str file_name: path to the JSON Lines file
+        :param dict file_entry: the catalog entry of the file, its size and feed id are updated
+        :return: a list of (date, feed id, file id, offset) records
+        """
+        records = []
+        with open(file_name, 'rb') as f:
+            f.seek(file_entry['size'])
+            offset = file_entry['size']
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                if offset == 0:
+                    file_entry['feed_id'] = self._get_feed_id(json.loads(line)['Blog title'])
+                elif line.strip():
+                    records.append((json.loads(line)['date'].encode('ascii'), file_entry['feed_id'],
+                                    file_entry['id'], offset))
+                offset += len(line)
+        file_entry['size'] = offset
+        return records
+
+    def _read_archive_records(self, file_name: str, file_entry: dict) -> list:
+        """
+        Read the records of the compressed or legacy archive file, a record per post date with zero offset
+
+        :param str file_name: path to the archive file
+        :param dict file_entry: the catalog entry of the file, its size and feed id are updated
+        :return: a list of (date, feed id, file id, offset) records
+        """
+        data = news_archive.read_news_file(file_name)
+        file_entry['feed_id'] = self._get_feed_id(data.title)
+        file_entry['size'] = os.path.getsize(file_name)
+        return [(date.encode('ascii'), file_entry['feed_id'], file_entry['id'], 0)
+                for date in {post.date for post in data.posts}]
+
+    @staticmethod
+    def _read_json_line_post(opened_files: dict, file_id: int, file_name: str, offset: int) -> Post:
+        """
+        Read the post line at the offset of the JSON Lines file. The file is kept open for the next posts
+
+        :param dict opened_files: the opened files by the file id
+        :param int file_id: the file id
+        :param str file_name: path to the JSON Lines file
+        :param int offset: the offset of the post line
+        :return: the post
+        """
+        if file_id not in opened_files:
+            opened_files[file_id] = open(file_name, 'rb')
+        opened_files[file_id].seek(offset)
+        return Post.from_dict(json.loads(opened_files[file_id].readline()))
+
+    def _get_feed_id(self, title: str) -> int:
+        """
+        Return the feed id. The feed is added to the catalog if it is not there yet
+
+        :param str title: the feed title
+        :return: the feed id
+        """
+        if title not in self._catalog['feeds']:
+            self._catalog['feeds'].append(title)
+        return self._catalog['feeds'].index(title)
+
+    def _read_catalog(self):
+        """
+        Read the catalog of the indexed files and feeds
+
+        :return: the catalog or None if it does not exist or is broken
+        """
+        try:
+            with open(self._catalog_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_catalog(self) -> None:
+        """
+        Save the catalog of the indexed files and feeds. The catalog is replaced atomically
+
+        :return: None
+        """
+        temp_file_name = self._catalog_path + '.tmp'
+        with open(temp_file_name, 'w', encoding='utf-8') as f:
+            json.dump(self._catalog, f, ensure_ascii=False)
+        os.replace(temp_file_name, self._catalog_path)
@@ -0,0 +1,211 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+"""
+The fast parser of well-formed RSS 2.0 and Atom 1.0 feeds. The feed is read by `iterparse` entry by entry, only the
+fields used by the reader are extracted and every parsed entry element is freed. The results have the same
+attributes and values as the ones of feedparser for these fields, anything unusual makes `parse_feed` return None,
+so the feed is parsed by feedparser
+"""
+import datetime
+import io
+import time
+import xml.etree.ElementTree as ElementTree
+from dataclasses import dataclass, field
+from email.utils import parsedate_tz, mktime_tz
+from urllib.parse import urljoin
+
+ATOM_NAMESPACE = '{http://www.w3.org/2005/Atom}'
+XML_BASE = '{http://www.w3.org/XML/1998/namespace}base'
+
+
+class UnsupportedFeedError(Exception):
+    """The feed cannot be parsed the same way as feedparser does it"""
+
+
+@dataclass(slots=True)
+class FeedLink:
+    href: str
+    rel: str = 'alternate'
+
+
+@dataclass(slots=True)
+class FeedEntry:
+    title: str
+    link: str
+    published_parsed: time.struct_time
+    links: list = field(default_factory=list)
+    id: str = None
+
+
+@dataclass(slots=True)
+class FeedInfo:
+    title: str
+    link: str
+
+
+@dataclass(slots=True)
+class ParsedFeed:
+    feed: FeedInfo
+    entries: list
+
+
+def parse_feed(content: bytes, base_url: str = ''):
+    """
+    Parse the feed
+
+    :param bytes content: the feed XML
+    :param str base_url: the URL the relative links are resolved against
+    :return: the parsed feed with the `feed.title`, `feed.link` and `entries` attributes like the ones of feedparser,
+     or None if the feed is malformed or uses features not supported by the fast parser
+    """
+    try:
+        return _parse(content, base_url or '')
+    except (ElementTree.ParseError, UnsupportedFeedError):
+        return None
+
+
+def _parse(content: bytes, base_url: str) -> ParsedFeed:
+    """
+    Parse the feed, the entry elements are freed as soon as they are parsed
+
+    :param bytes content: the feed XML
+    :param str base_url: the URL the relative links are resolved against
+    :return: the parsed feed, raise UnsupportedFeedError if the feed is not supported
+    """
+    events = ElementTree.iterparse(io.BytesIO(content), events=('start', 'end'))
+    event, root = next(events)
+    if root.tag == 'rss':
+        feed_tag, entry_tag, get_entry = 'channel', 'item', _get_rss_entry
+    elif root.tag == ATOM_NAMESPACE + 'feed':
+        feed_tag, entry_tag, get_entry = root.tag, ATOM_NAMESPACE + 'entry', _get_atom_entry
+    else:
+        raise UnsupportedFeedError
+    if XML_BASE in root.attrib:
+        raise UnsupportedFeedError
+    elements = [root]
+    feed_title = feed_link = None
+    entries = []
+    for event, element in events:
+        if event == 'start':
+            if XML_BASE in element.attrib:
+                raise UnsupportedFeedError
+            elements.append(element)
+            continue
+        elements.pop()
+        parent = elements[-1] if elements else None
+        if parent is None or parent.tag != feed_tag:
+            continue
+        if element.tag == entry_tag:
+            entries.append(get_entry(element, base_url))
+            # the parsed entry is removed from the feed element, so the tree never keeps more than one entry
+            parent.remove(element)
+        elif element.tag == 'title' and feed_title is None:
+            feed_title = _get_text(element)
+        elif element.tag == 'link' and feed_link is None:
+            feed_link = urljoin(base_url, _get_text(element))
+        elif element.tag == ATOM_NAMESPACE + 'title' and feed_title is None:
+            feed_title = _get_atom_text(element)
+        elif element.tag == ATOM_NAMESPACE + 'link' and feed_link is None:
+            if element.get('rel', 'alternate') == 'alternate':
+                feed_link = urljoin(base_url, element.get('href', '').strip())
+    if feed_title is None or feed_link is None:
+        raise UnsupportedFeedError
+    return ParsedFeed(FeedInfo(feed_title, feed_link), entries)
+
+
+def _get_rss_entry(element: ElementTree.Element, base_url: str) -> FeedEntry:
+    """
+    Get the entry of the RSS item. The item link is resolved against the base URL, the enclosure URLs are kept as is
+
+    :param element: the item element
+    :param str base_url: the URL the relative links are resolved against
+    :return: the entry
+    """
+    title = _get_text(element.find('title'))
+    link = _get_text(element.find('link'))
+    date = element.find('pubDate')
+    if title is None or link is None or date is None or '<' in title:
+        raise UnsupportedFeedError
+    if any(child.tag.startswith(ATOM_NAMESPACE) for child in element):
+        raise UnsupportedFeedError
+    link = urljoin(base_url, link)
+    links = [FeedLink(link)]
+    links.extend(FeedLink(enclosure.get('url', '').strip(), 'enclosure')
+                 for enclosure in element.findall('enclosure') if enclosure.get('url'))
+    return FeedEntry(title, link, _get_date(_get_text(date)), links, _get_text(element.find('guid')) or None)
+
+
+def _get_atom_entry(element: ElementTree.Element, base_url: str) -> FeedEntry:
+    """
+    Get the entry of the Atom entry. All links and the id are resolved against the base URL
+
+    :param element: the entry element
+    :param str base_url: the URL the relative links are resolved against
+    :return: the entry
+    """
+    title_element = element.find(ATOM_NAMESPACE + 'title')
+    date = element.find(ATOM_NAMESPACE + 'published')
+    if title_element is None or date is None:
+        raise UnsupportedFeedError
+    links = [FeedLink(urljoin(base_url, link.get('href', '').strip()), link.get('rel', 'alternate'))
+             for link in element.findall(ATOM_NAMESPACE + 'link') if link.get('href')]
+    link = next((link.href for link in links if link.rel == 'alternate'), None)
+    if link is None:
+        raise UnsupportedFeedError
+    entry_id = _get_text(element.find(ATOM_NAMESPACE + 'id'))
+    return FeedEntry(_get_atom_text(title_element), link, _get_date(_get_text(date)), links,
+                     urljoin(base_url, entry_id) if entry_id else None)
+
+
+def _get_text(element):
+    """
+    Return the stripped text of the element
+
+    :param element: the element or None
+    :return: the text or None if there is no element
+    """
+    if element is None:
+        return None
+    if len(element):
+        # the markup inside the element is sanitized by feedparser
+        raise UnsupportedFeedError
+    return (element.text or '').strip()
+
+
+def _get_atom_text(element: ElementTree.Element) -> str:
+    """
+    Return the text of the Atom text construct. The HTML text with markup or entities is left to feedparser
+
+    :param element: the text construct element
+    :return: the text
+    """
+    text = _get_text(element)
+    text_type = element.get('type', 'text')
+    if text_type not in ('text', 'html') or (text_type == 'html' and ('<' in text or '&' in text)):
+        raise UnsupportedFeedError
+    return text
+
+
+def _get_date(date: str) -> time.struct_time:
+    """
+    Parse the RFC 822 date of RSS or the ISO 8601 date of Atom to UTC. The ISO dates without the time zone are UTC
+    dates
+
+    :param str date: the date
+    :return: the UTC date
+    """
+    if date[4:5] != '-':
+        parsed_date = parsedate_tz(date)
+        # feedparser does not parse the dates without the time zone, which ends the date after the time
+        if parsed_date is None or parsed_date[9] is None or ':' in date.rsplit(None, 1)[-1]:
+            raise UnsupportedFeedError
+        return time.gmtime(mktime_tz(parsed_date))
+    try:
+        iso_date = datetime.datetime.fromisoformat(date[:-1] + '+00:00' if date.endswith('Z') else date)
+    except ValueError:
+        raise UnsupportedFeedError
+    if iso_date.tzinfo is None:
+        iso_date = iso_date.replace(tzinfo=datetime.timezone.utc)
+    return iso_date.utctimetuple()
@@ -0,0 +1,71 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import heapq
+import itertools
+import random
+import time
+
+
+class FeedScheduler:
+    """The priority queue of RSS feeds ordered by the next poll time"""
+
+    def __init__(self, jitter: float = 0.1, max_backoff: float = 3600, clock=time.monotonic) -> None:
+        """
+        The class constructor
+
+        :param float jitter: the max random deviation of a poll interval, as a fraction of the interval
+        :param float max_backoff: the max delay in seconds before polling a failing feed again
+        :param clock: the monotonic clock function
+        """
+        self._jitter = jitter
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self._queue = []
+        self._intervals = {}
+        self._errors = {}
+        # the counter keeps the queue order stable for feeds due at the same time
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def add_feed(self, url: str, interval: float) -> None:
+        """
+        Add the feed to the queue. The feed is due immediately
+
+        :param str url: an RSS-feed URL
+        :param float interval: the poll interval in seconds
+        :return: None
+        """
+        self._intervals[url] = interval
+        self._errors[url] = 0
+        heapq.heappush(self._queue, (self._clock(), next(self._counter), url))
+
+    def pop_feed(self) -> tuple:
+        """
+        Remove the next due feed from the queue
+
+        :return: the due time and the RSS-feed URL
+        """
+        due_time, _, url = heapq.heappop(self._queue)
+        return due_time, url
+
+    def reschedule_feed(self, url: str, is_failed: bool = False) -> float:
+        """
+        Put the polled feed back to the queue. The delay of a failing feed grows exponentially with every error
+
+        :param str url: an RSS-feed URL
+        :param bool is_failed: the poll of the feed failed
+        :return: the delay in seconds before the next poll
+        """
+        if is_failed:
+            self._errors[url] += 1
+            delay = min(self._intervals[url] * 2 ** self._errors[url], self._max_backoff)
+        else:
+            self._errors[url] = 0
+            delay = self._intervals[url]
+        delay *= 1 + random.uniform(-self._jitter, self._jitter)
+        heapq.heappush(self._queue, (self._clock() + delay, next(self._counter), url))
+        return delay
@@ -3,9 +3,13 @@
 #  Licensed under the MIT License
 #  Copyright (c) 2022.
 import fnmatch
+import gzip
 import json
+import math
 import os
+import tempfile
 
+from .models import Feed, Post
 from .rss_reader_errors import NewsNotFoundError
 from .utilities import _convert_space_to_underscore, _sanitize_filename, _set_file_name
 
@@ -32,50 +36,134 @@ def gen_opener(filenames):
     :return:
     """
     for filename in filenames:
-        f = open(filename, 'r', encoding="utf-8")
+        f = open_news_file(filename, 'r')
         yield f
         f.close()
 
 
-def search_and_print_news(news_folder: str, date: str) -> None:
+def open_news_file(file_name: str, mode: str):
     """
-    Search by date and print news if found
+    Open a JSON or JSON Lines news file as a text file. The files ending with '.gz' are gzip-compressed, appending to
+    them adds a new gzip member
+
+    :param str file_name: path to the news file
+    :param str mode: 'r', 'w' or 'a'
+    :return: a file object
+    """
+    if file_name.endswith('.gz'):
+        return gzip.open(file_name, mode + 't', encoding='utf-8')
+    return open(file_name, mode, encoding='utf-8')
+
+
+def search_and_print_news(news_folder: str, query, index: str = 'sqlite') -> None:
+    """
+    Search and print news if found. The search uses the news storage index or the memory-mapped date index of the
+    archive files, so only the matching posts are read. The full-text search is always done by the news storage
 
     :param news_folder: the folder to search
-    :param date: the date to search
+    :param NewsQuery query: the news query
+    :param index: the date lookup backend, one of `index_backends`
     :return: None
     """
-    news_file_extension = '*.json'
-    news_files_names = gen_find(news_file_extension, news_folder)
-    files = gen_opener(news_files_names)
+    if index == 'mmap' and not query.search:
+        from .date_index import DateIndex
+
+        news_index = DateIndex(news_folder)
+        news_index.update()
+    else:
+        from .news_storage import NewsStorage
+
+        news_index = NewsStorage(news_folder)
+
     is_found = False
+    current_feed_title = None
     print("********************************************************************")
     print("Search results:")
-    for news_json in files:
-        data = json.load(news_json)
-        print("********************************************************************")
-        print("File name:", news_json.name)
-        for post in data['posts']:
-            if any([True for k, v in post.items() if v == date]):
-                is_found = True
+    with news_index:
+        for feed_title, post in news_index.find_posts(query):
+            is_found = True
+            if feed_title != current_feed_title:
+                current_feed_title = feed_title
                 print("********************************************************************")
-                for k, v in post.items():
-                    print(k, v)
+                print("Feed:", feed_title)
+            print("********************************************************************")
+            for k, v in post.to_dict().items():
+                print(k, v)
     if not is_found:
         raise NewsNotFoundError
 
 
-def write_json_to_file(news_folder: str, data: dict) -> None:
+def append_json_lines_to_file(file_name: str, data: Feed, posts: list) -> None:
     """
-    Save data as a JSON to file
+    Append posts to the JSON Lines file, plain or gzip-compressed. The first line of a new file is the feed header with
+    the blog title and link, every next line is a post
 
-    :param str news_folder: path to JSON
-    :param dict data: dictionary
+    :param str file_name: path to JSON Lines file
+    :param Feed data: the RSS feed with its topics
+    :param list posts: the posts to append
     :return: None
     """
-    file_name = get_file_name(news_folder, data, '.json')
-    with open(file_name, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    is_new_file = not is_file_exists(file_name)
+    with open_news_file(file_name, 'a') as f:
+        if is_new_file:
+            f.write(json.dumps(data.get_header(), ensure_ascii=False) + '\n')
+        for post in posts:
+            f.write(json.dumps(post.to_dict(), ensure_ascii=False) + '\n')
+
+
+def read_news_file(news_file) -> Feed:
+    """
+    Read the cached news from a JSON file or a JSON Lines file
+
+    :param news_file: an opened news file
+    :return: the RSS feed with its topics
+    """
+    if news_file.name.endswith('.json'):
+        return Feed.from_dict(json.load(news_file))
+    header = json.loads(news_file.readline())
+    return Feed(header['Blog title'], header['Blog link'],
+                [Post.from_dict(json.loads(line)) for line in news_file if line.strip()])
+
+
+def gen_feeds_file_lines(file_path: str):
+    """
+    Read the feeds file. Every line is an RSS-feed URL and an optional poll interval in seconds separated by spaces,
+    empty lines and lines starting with '#' are skipped
+
+    :param str file_path: path to the feeds list
+    :return: a generator of (URL, interval or None) pairs, raise ValueError if an interval is not a positive number
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            interval = float(fields[1]) if len(fields) > 1 else None
+            # a feed with a zero interval would be polled in a tight loop
+            if interval is not None and not (math.isfinite(interval) and interval > 0):
+                raise ValueError("The poll interval must be a positive number in line " + str(line_number) + ": " +
+                                 line.strip())
+            yield fields[0], interval
+
+
+def read_feeds_file(file_path: str) -> list:
+    """
+    Read RSS-feed URLs from a file
+
+    :param str file_path: path to the feeds list
+    :return: a list of RSS-feed URLs
+    """
+    return [url for url, interval in gen_feeds_file_lines(file_path)]
+
+
+def read_feed_intervals(file_path: str) -> dict:
+    """
+    Read poll intervals of RSS feeds from a file
+
+    :param str file_path: path to the feeds list
+    :return: a dictionary of the RSS-feed URL and the poll interval in seconds
+    """
+    return {url: interval for url, interval in gen_feeds_file_lines(file_path) if interval is not None}
 
 
 def create_news_folder(dir_path: str) -> None:
@@ -85,7 +173,27 @@ def create_news_folder(dir_path: str) -> None:
     :param str dir_path: the folder name
     :return: None
     """
-    os.makedirs(dir_path)
+    # several feeds can be saved concurrently, so the folder may be created by another worker meanwhile
+    os.makedirs(dir_path, exist_ok=True)
+
+
+def write_file(file_name: str, content: bytes) -> None:
+    """
+    Write the file atomically, so a concurrent reader never gets a partially written file. Every writer has its own
+    temporary file as the same file can be saved by several threads at once
+
+    :param str file_name: full file name
+    :param bytes content: the file content
+    :return: None
+    """
+    file_descriptor, temp_file_name = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(file_name))
+    try:
+        with os.fdopen(file_descriptor, 'wb') as f:
+            f.write(content)
+        os.replace(temp_file_name, file_name)
+    finally:
+        if is_file_exists(temp_file_name):
+            os.remove(temp_file_name)
 
 
 def is_file_exists(file_path: str) -> bool:
@@ -108,14 +216,14 @@ def is_dir_exists(dir_path: str) -> bool:
     return os.path.isdir(dir_path)
 
 
-def get_file_name(news_folder: str, data: dict, file_extension: str) -> str:
+def get_file_name(news_folder: str, data: Feed, file_extension: str) -> str:
     """
     Return full file name
 
     :param file_extension: file extension
     :param str news_folder: folder to save
-    :param dict data: RSS news
+    :param Feed data: RSS news
     :return: full file name
     """
-    feed_name = _convert_space_to_underscore(_sanitize_filename(data['Blog title']))
+    feed_name = _convert_space_to_underscore(_sanitize_filename(data.title))
     return os.path.join(news_folder, _set_file_name(feed_name) + file_extension)
@@ -2,42 +2,143 @@
 #  mail: snooki17@gmail.com
 #  Licensed under the MIT License
 #  Copyright (c) 2022.
+import os
+from html import escape
+
 from . import file_processing_utilities, utilities
+from .models import Feed, Post
 from .rss_reader_errors import SaveToHTMLError
 
 news_html_folder = 'news_html'
 
 
-def save_data_to_html(input_dict: dict, limit: int) -> None:
-    final_html = '''
-    <html>
-        <body>
-            <h1>
-    '''
-    final_html += input_dict['Blog title'] + '</h1>'
-    final_html += '<h2><a href="' + input_dict['Blog link'] + '">' + input_dict['Blog link'] + '</a></h2><hr>'
-    limit_counter = 0
-    for post in input_dict['posts']:
-        final_html += '<p><h3>' + post['title'] + '</h2>'
-        final_html += utilities.get_formatted_date_to_pdf(post['date']) + '<br>'
-        final_html += '<a href="' + post['link'] + '">' + post['link'] + '</a><br>'
-        for link in post['links']:
-            if link.endswith('.jpg'):
-                final_html += '<img src="' + link + '">'
-        final_html += '</p><hr>'
-        limit_counter += 1
-        if limit != 0 and limit_counter == limit:
-            break
-    final_html += '''            
-        </body>
-    </html>
-    '''
+def _write_page_header(html_file, feed: Feed) -> None:
+    """
+    Write the page beginning with the blog title and link
+
+    :param html_file: an opened HTML file
+    :param feed: the RSS feed with its topics
+    :return: None
+    """
+    html_file.write('<html>\n<head><meta charset="utf-8"><title>' + escape(feed.title) +
+                    '</title></head>\n<body>\n')
+    html_file.write('<h1>' + escape(feed.title) + '</h1>\n')
+    html_file.write('<h2><a href="' + escape(feed.link) + '">' + escape(feed.link) +
+                    '</a></h2><hr>\n')
+
+
+def _write_page_footer(html_file) -> None:
+    """
+    Write the page ending
+
+    :param html_file: an opened HTML file
+    :return: None
+    """
+    html_file.write('</body>\n</html>\n')
+
+
+def _write_post(html_file, post: Post) -> None:
+    """
+    Write a post. All feed values are escaped
+
+    :param html_file: an opened HTML file
+    :param Post post: an RSS-feed topic
+    :return: None
+    """
+    html_file.write('<p><h3>' + escape(post.title) + '</h3>')
+    html_file.write(utilities.get_formatted_date_to_pdf(post.date) + '<br>')
+    html_file.write('<a href="' + escape(post.link) + '">' + escape(post.link) + '</a><br>')
+    for link in post.links:
+        if link.endswith('.jpg'):
+            html_file.write('<img src="' + escape(link) + '">')
+    html_file.write('</p><hr>\n')
+
+
+def _write_navigation(html_file, index_name: str, previous_name: str, next_name: str) -> None:
+    """
+    Write links to the index page and to the neighbour pages
 
+    :param html_file: an opened HTML file
+    :param str index_name: the index page file name
+    :param str previous_name: the previous page file name or None
+    :param str next_name: the next page file name or None
+    :return: None
+    """
+    links = ['<a href="' + escape(index_name) + '">Index</a>']
+    if previous_name is not None:
+        links.append('<a href="' + escape(previous_name) + '">Previous</a>')
+    if next_name is not None:
+        links.append('<a href="' + escape(next_name) + '">Next</a>')
+    html_file.write('<p>' + ' | '.join(links) + '</p><hr>\n')
+
+
+def _write_html_file(file_name: str, feed: Feed, posts: list, navigation: tuple = None) -> None:
+    """
+    Write the posts to the HTML file fragment by fragment
+
+    :param str file_name: full file name
+    :param feed: the RSS feed with its topics
+    :param list posts: the posts of the page
+    :param tuple navigation: the index, previous and next page file names for a paginated feed
+    :return: None
+    """
+    with open(file_name, 'w', encoding='utf-8') as html_file:
+        _write_page_header(html_file, feed)
+        if navigation is not None:
+            _write_navigation(html_file, *navigation)
+        for post in posts:
+            _write_post(html_file, post)
+        if navigation is not None:
+            _write_navigation(html_file, *navigation)
+        _write_page_footer(html_file)
+
+
+def _write_index_file(file_name: str, feed: Feed, pages: list) -> None:
+    """
+    Write the index page with links to the pages of a paginated feed
+
+    :param str file_name: full file name
+    :param feed: the RSS feed with its topics
+    :param list pages: (page file name, posts) pairs
+    :return: None
+    """
+    with open(file_name, 'w', encoding='utf-8') as html_file:
+        _write_page_header(html_file, feed)
+        html_file.write('<ol>\n')
+        for page_name, page_posts in pages:
+            html_file.write('<li><a href="' + escape(page_name) + '">' + escape(page_posts[0].title) + ' &ndash; ' +
+                            escape(page_posts[-1].title) + '</a> (' + str(len(page_posts)) + ' posts)</li>\n')
+        html_file.write('</ol>\n')
+        _write_page_footer(html_file)
+
+
+def save_data_to_html(feed: Feed, limit: int, page_size: int = 0) -> None:
+    """
+    Save RSS feed topics to HTML file. If the page size is specified and the feed is larger, the posts are saved to
+    several pages with an index page
+
+    :param feed: the RSS feed with its topics
+    :param limit: If `--limit` is not specified or `--limit` is larger than feed size then user should get all available news
+    :param page_size: the max number of posts per HTML page, 0 means a single page
+    :return: None
+    """
+    posts = feed.posts[:limit] if limit != 0 else feed.posts
     try:
         if not file_processing_utilities.is_dir_exists(news_html_folder):
             file_processing_utilities.create_news_folder(news_html_folder)
-        file_name = file_processing_utilities.get_file_name(news_html_folder, input_dict, '.html')
-        with open(file_name, 'w', encoding='utf-8') as html_file:
-            html_file.write(final_html)
+        file_name = file_processing_utilities.get_file_name(news_html_folder, feed, '.html')
+        if page_size == 0 or len(posts) <= page_size:
+            _write_html_file(file_name, feed, posts)
+            return
+
+        index_name = os.path.basename(file_name)
+        pages = [(index_name[:-len('.html')] + '-' + str(number + 1) + '.html', posts[i:i + page_size])
+                 for number, i in enumerate(range(0, len(posts), page_size))]
+        for number, (page_name, page_posts) in enumerate(pages):
+            previous_name = pages[number - 1][0] if number > 0 else None
+            next_name = pages[number + 1][0] if number + 1 < len(pages) else None
+            _write_html_file(os.path.join(news_html_folder, page_name), feed, page_posts,
+                             (index_name, previous_name, next_name))
+        _write_index_file(file_name, feed, pages)
     except OSError:
         raise SaveToHTMLError
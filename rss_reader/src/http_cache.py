@@ -0,0 +1,98 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import hashlib
+import json
+import os
+import tempfile
+
+from . import file_processing_utilities
+from .models import Feed
+
+
+def get_cache_file_name(cache_folder: str, url: str) -> str:
+    """
+    Return the cache file name of the RSS-feed URL
+
+    :param str cache_folder: the HTTP cache folder
+    :param str url: an RSS-feed URL
+    :return: full file name
+    """
+    return os.path.join(cache_folder, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+
+def read_cache_entry(cache_folder: str, url: str, limit: int = 0) -> dict:
+    """
+    Read the cached HTTP metadata and the last parsed posts of the RSS-feed URL. The posts could be saved by a run with
+    `--limit`, so the entry is returned only if it has all posts needed for the limit
+
+    :param str cache_folder: the HTTP cache folder, None means the cache is disabled
+    :param str url: an RSS-feed URL
+    :param int limit: the number of needed posts, 0 means all posts
+    :return: the cache entry with the posts as a `Feed` or None if the URL is not cached yet
+    """
+    if cache_folder is None:
+        return None
+    try:
+        with open(get_cache_file_name(cache_folder, url), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get('url') != url:
+        return None
+    entry_limit = entry.get('limit', 0)
+    posts = entry['data']['posts']
+    if entry_limit != 0 and len(posts) == entry_limit and (limit == 0 or limit > entry_limit):
+        return None
+    if limit != 0:
+        entry['data']['posts'] = posts[:limit]
+    entry['data'] = Feed.from_dict(entry['data'])
+    return entry
+
+
+def write_cache_entry(cache_folder: str, url: str, etag: str, last_modified: str, data: Feed, limit: int = 0) -> None:
+    """
+    Save the HTTP metadata and the parsed posts of the RSS-feed URL. Nothing is saved if the server sent neither
+    ETag nor Last-Modified headers
+
+    :param str cache_folder: the HTTP cache folder, None means the cache is disabled
+    :param str url: an RSS-feed URL
+    :param str etag: the ETag response header
+    :param str last_modified: the Last-Modified response header
+    :param Feed data: the RSS feed with its topics
+    :param int limit: the limit the posts were got with, 0 means all posts
+    :return: None
+    """
+    if cache_folder is None or (etag is None and last_modified is None):
+        return
+    if not file_processing_utilities.is_dir_exists(cache_folder):
+        file_processing_utilities.create_news_folder(cache_folder)
+    file_name = get_cache_file_name(cache_folder, url)
+    entry = {'url': url, 'etag': etag, 'last_modified': last_modified, 'limit': limit, 'data': data.to_dict()}
+    # the entry is replaced atomically, so a concurrent reader never gets a partially written file. Every writer has
+    # its own temporary file as the same URL can be saved by several workers at once
+    file_descriptor, temp_file_name = tempfile.mkstemp(suffix='.tmp', dir=cache_folder)
+    try:
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_file_name, file_name)
+    finally:
+        if file_processing_utilities.is_file_exists(temp_file_name):
+            os.remove(temp_file_name)
+
+
+def get_conditional_headers(entry: dict) -> dict:
+    """
+    Return the conditional GET request headers for the cache entry
+
+    :param dict entry: the cache entry
+    :return: If-None-Match/If-Modified-Since headers
+    """
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
@@ -0,0 +1,79 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+connect_timeout = 5
+read_timeout = 30
+max_retries = 3
+# the delay before the n-th retry is backoff_factor * 2 ** (n - 1) seconds
+backoff_factor = 0.5
+# the max number of kept-alive connections per host
+pool_maxsize = 16
+retry_status_codes = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_accept_encoding() -> str:
+    """
+    Return the content codings the client can decode. Brotli is accepted only if a brotli decoder is installed
+
+    :return: the Accept-Encoding header value
+    """
+    encodings = ['gzip', 'deflate']
+    for brotli_module in ('brotli', 'brotlicffi'):
+        try:
+            __import__(brotli_module)
+        except ImportError:
+            continue
+        encodings.append('br')
+        break
+    return ', '.join(encodings)
+
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session with a keep-alive connection pool per host and bounded retries with backoff
+
+    :return: a new HTTP session
+    """
+    retry = Retry(total=max_retries, backoff_factor=backoff_factor, status_forcelist=retry_status_codes,
+                  allowed_methods=frozenset(['GET', 'HEAD']), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Accept-Encoding'] = get_accept_encoding()
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the HTTP session shared by all fetchers of the process
+
+    :return: the shared HTTP session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def get(url: str, headers: dict = None, timeout: tuple = None) -> requests.Response:
+    """
+    Send a GET request with the shared HTTP session
+
+    :param str url: the requested URL
+    :param dict headers: additional request headers
+    :param tuple timeout: the connect and read timeouts in seconds, the module defaults are used if not specified
+    :return: the HTTP response
+    """
+    return get_session().get(url, headers=headers, timeout=timeout or (connect_timeout, read_timeout))
@@ -0,0 +1,177 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from . import file_processing_utilities, http_client
+
+news_images_folder = 'news_images'
+# the images cache size in bytes, the least recently used images are evicted above it
+max_cache_size = 100 * 1024 * 1024
+download_workers = 8
+
+
+def _get_url_file_name(cache_folder: str, url: str) -> str:
+    """
+    Return the name of the file which keeps the image digest of the URL
+
+    :param str cache_folder: the images cache folder
+    :param str url: an image URL
+    :return: full file name
+    """
+    return os.path.join(cache_folder, 'urls', hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+
+def _get_image_file_name(cache_folder: str, digest: str) -> str:
+    """
+    Return the name of the file with the image content
+
+    :param str cache_folder: the images cache folder
+    :param str digest: SHA-256 of the image content
+    :return: full file name
+    """
+    return os.path.join(cache_folder, 'images', digest)
+
+
+def _read_cached_image(cache_folder: str, url: str) -> bytes:
+    """
+    Read the cached image of the URL. The image is marked as recently used
+
+    :param str cache_folder: the images cache folder
+    :param str url: an image URL
+    :return: the image content or None if the image is not cached
+    """
+    try:
+        with open(_get_url_file_name(cache_folder, url), 'r', encoding='utf-8') as f:
+            image_file_name = _get_image_file_name(cache_folder, f.read())
+        with open(image_file_name, 'rb') as f:
+            content = f.read()
+        os.utime(image_file_name)
+    except OSError:
+        return None
+    return content
+
+
+def _save_image(cache_folder: str, url: str, content: bytes) -> None:
+    """
+    Save the image by its content digest. The same image of several URLs is saved once
+
+    :param str cache_folder: the images cache folder
+    :param str url: an image URL
+    :param bytes content: the image content
+    :return: None
+    """
+    for folder in ('urls', 'images'):
+        if not file_processing_utilities.is_dir_exists(os.path.join(cache_folder, folder)):
+            file_processing_utilities.create_news_folder(os.path.join(cache_folder, folder))
+    digest = hashlib.sha256(content).hexdigest()
+    image_file_name = _get_image_file_name(cache_folder, digest)
+    if file_processing_utilities.is_file_exists(image_file_name):
+        os.utime(image_file_name)
+    else:
+        file_processing_utilities.write_file(image_file_name, content)
+    file_processing_utilities.write_file(_get_url_file_name(cache_folder, url), digest.encode('utf-8'))
+
+
+def get_image(url: str, cache_folder: str = news_images_folder) -> bytes:
+    """
+    Return the image from the cache, the image is downloaded if it is not cached yet
+
+    :param str url: an image URL
+    :param str cache_folder: the images cache folder
+    :return: the image content or None if the image cannot be downloaded
+    """
+    content = _read_cached_image(cache_folder, url)
+    if content is not None:
+        return content
+    try:
+        response = http_client.get(url)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None
+    try:
+        _save_image(cache_folder, url, response.content)
+    except OSError:
+        # the image is still usable even if the cache is not writable
+        pass
+    return response.content
+
+
+def prefetch_images(urls, cache_folder: str = news_images_folder, workers: int = download_workers) -> dict:
+    """
+    Get the images concurrently
+
+    :param urls: image URLs
+    :param str cache_folder: the images cache folder
+    :param int workers: the number of concurrent downloads
+    :return: a dictionary of the image URL and the image content, None if the image cannot be downloaded
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as executor:
+        return dict(zip(urls, executor.map(lambda url: get_image(url, cache_folder), urls)))
+
+
+def evict_images(cache_folder: str = news_images_folder, max_size: int = max_cache_size) -> int:
+    """
+    Remove the least recently used images until the cache size is not larger than the max size. The URL files of the
+    removed images are removed as well
+
+    :param str cache_folder: the images cache folder
+    :param int max_size: the max cache size in bytes
+    :return: the number of removed images
+    """
+    images = []
+    # the downloaded images and their processed copies share the cache size
+    for folder in ('images', 'processed'):
+        images_folder = os.path.join(cache_folder, folder)
+        if not file_processing_utilities.is_dir_exists(images_folder):
+            continue
+        with os.scandir(images_folder) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    images.append((stat.st_mtime, stat.st_size, entry.path))
+    cache_size = sum(size for mtime, size, path in images)
+    removed = 0
+    for mtime, size, path in sorted(images):
+        if cache_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        cache_size -= size
+        removed += 1
+    if removed:
+        _evict_url_files(cache_folder)
+    return removed
+
+
+def _evict_url_files(cache_folder: str) -> None:
+    """
+    Remove the URL files whose images are not in the cache anymore
+
+    :param str cache_folder: the images cache folder
+    :return: None
+    """
+    urls_folder = os.path.join(cache_folder, 'urls')
+    if not file_processing_utilities.is_dir_exists(urls_folder):
+        return
+    with os.scandir(urls_folder) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name.endswith('.tmp'):
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    image_file_name = _get_image_file_name(cache_folder, f.read())
+                if not file_processing_utilities.is_file_exists(image_file_name):
+                    os.remove(entry.path)
+            except OSError:
+                continue
@@ -0,0 +1,82 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import hashlib
+import io
+import os
+
+from PIL import Image, UnidentifiedImageError
+
+from . import file_processing_utilities
+
+MM_PER_INCH = 25.4
+
+
+def get_target_width(width_mm: float, dpi: int) -> int:
+    """
+    Return the image width in pixels which is enough to draw the image with the DPI
+
+    :param float width_mm: the drawn image width in millimeters
+    :param int dpi: the target resolution in dots per inch
+    :return: the image width in pixels
+    """
+    return max(1, round(width_mm / MM_PER_INCH * dpi))
+
+
+def downscale_image(content: bytes, width: int, quality: int) -> bytes:
+    """
+    Resize the image to the width and recompress it as JPEG. The image is never upscaled
+
+    :param bytes content: the image content
+    :param int width: the max image width in pixels
+    :param int quality: the JPEG quality from 1 to 95
+    :return: the processed image content or the original content if it is smaller
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        processed = io.BytesIO()
+        image.save(processed, 'JPEG', quality=quality, optimize=True)
+    if processed.tell() >= len(content):
+        return content
+    return processed.getvalue()
+
+
+def get_processed_image(content: bytes, width_mm: float, dpi: int, quality: int, cache_folder: str) -> bytes:
+    """
+    Return the image downscaled for the drawn width. The processed image is cached by the original content digest,
+    the width and the quality
+
+    :param bytes content: the image content
+    :param float width_mm: the drawn image width in millimeters
+    :param int dpi: the target resolution in dots per inch
+    :param int quality: the JPEG quality from 1 to 95
+    :param str cache_folder: the images cache folder
+    :return: the processed image content or the original content if the image cannot be processed
+    """
+    width = get_target_width(width_mm, dpi)
+    processed_folder = os.path.join(cache_folder, 'processed')
+    file_name = os.path.join(processed_folder, '-'.join([hashlib.sha256(content).hexdigest(), str(width),
+                                                         str(quality)]))
+    try:
+        with open(file_name, 'rb') as f:
+            processed = f.read()
+        os.utime(file_name)
+        return processed
+    except OSError:
+        pass
+    try:
+        processed = downscale_image(content, width, quality)
+    except (UnidentifiedImageError, OSError, ValueError):
+        return content
+    try:
+        if not file_processing_utilities.is_dir_exists(processed_folder):
+            file_processing_utilities.create_news_folder(processed_folder)
+        file_processing_utilities.write_file(file_name, processed)
+    except OSError:
+        pass
+    return processed
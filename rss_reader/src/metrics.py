@@ -0,0 +1,256 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+# the timer of the no-op metrics, a shared context manager doing nothing
+_null_timer = contextlib.nullcontext()
+
+
+class Metrics:
+    """
+    The no-op metrics used by default. The timers and the counters do nothing, so the instrumented code costs a method
+    call per stage
+    """
+
+    def time(self, stage: str, feed: str = None):
+        """
+        Return the timer of the stage
+
+        :param str stage: the stage name, e.g. 'fetch', 'parse', 'extract', 'render_pdf', 'cache_write'
+        :param str feed: the RSS-feed URL or None for the stages not related to a feed
+        :return: a context manager timing its body
+        """
+        return _null_timer
+
+    def add_time(self, stage: str, seconds: float, feed: str = None) -> None:
+        """
+        Add the time of a stage run measured elsewhere, e.g. by a render worker process
+
+        :param str stage: the stage name
+        :param float seconds: the stage run time
+        :param str feed: the RSS-feed URL
+        :return: None
+        """
+
+    def count(self, name: str, value: int = 1, feed: str = None) -> None:
+        """
+        Increase the counter
+
+        :param str name: the counter name
+        :param int value: the increment
+        :param str feed: the RSS-feed URL or None for the events not related to a feed
+        :return: None
+        """
+
+    def close(self) -> None:
+        """
+        Write the metrics to the sinks
+
+        :return: None
+        """
+
+
+null_metrics = Metrics()
+
+
+class _StageTimer:
+    """The timer of a stage, the time is added to the metrics when the timed block exits, even by an error"""
+    __slots__ = ('_metrics', '_stage', '_feed', '_start_time')
+
+    def __init__(self, metrics: 'MetricsRecorder', stage: str, feed: str) -> None:
+        self._metrics = metrics
+        self._stage = stage
+        self._feed = feed
+        self._start_time = 0.0
+
+    def __enter__(self) -> None:
+        self._start_time = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._metrics.add_time(self._stage, time.perf_counter() - self._start_time, self._feed)
+
+
+class MetricsRecorder(Metrics):
+    """
+    The metrics recording the stage times by the monotonic clock and the counters per feed. The feeds are processed
+    by several workers, so the records are guarded by a lock
+    """
+
+    def __init__(self, sinks=()) -> None:
+        """
+        The class constructor
+
+        :param sinks: the sinks the metrics are written to on close, e.g. `JSONStatsSink`, `PrometheusFileSink`
+        """
+        self._sinks = list(sinks)
+        self._lock = threading.Lock()
+        # (stage, feed) -> [count, total seconds, max seconds]
+        self._timers = {}
+        # (name, feed) -> value
+        self._counters = {}
+
+    def time(self, stage: str, feed: str = None):
+        return _StageTimer(self, stage, feed)
+
+    def add_time(self, stage: str, seconds: float, feed: str = None) -> None:
+        """
+        Add the time of a stage run
+
+        :param str stage: the stage name
+        :param float seconds: the stage run time
+        :param str feed: the RSS-feed URL
+        :return: None
+        """
+        with self._lock:
+            timer = self._timers.setdefault((stage, feed), [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    def count(self, name: str, value: int = 1, feed: str = None) -> None:
+        with self._lock:
+            self._counters[(name, feed)] = self._counters.get((name, feed), 0) + value
+
+    def get_records(self) -> tuple:
+        """
+        Return a copy of the records
+
+        :return: the timers {(stage, feed): (count, total seconds, max seconds)} and the counters
+         {(name, feed): value}
+        """
+        with self._lock:
+            return {key: tuple(timer) for key, timer in self._timers.items()}, dict(self._counters)
+
+    def get_stats(self) -> dict:
+        """
+        Return the stage times and the counters summed over the feeds, and the ones of every feed
+
+        :return: a dictionary of 'stages', 'counters' and 'feeds'
+        """
+        timers, counters = self.get_records()
+        stats = {'stages': {}, 'counters': {}, 'feeds': {}}
+        for (stage, feed), (count, seconds, max_seconds) in sorted(timers.items(), key=_get_record_order):
+            for target in (stats, stats['feeds'].setdefault(feed, {'stages': {}, 'counters': {}})):
+                stage_stats = target['stages'].setdefault(stage, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+                stage_stats['count'] += count
+                stage_stats['seconds'] += seconds
+                stage_stats['max_seconds'] = max(stage_stats['max_seconds'], max_seconds)
+        for (name, feed), value in sorted(counters.items(), key=_get_record_order):
+            for target in (stats, stats['feeds'].setdefault(feed, {'stages': {}, 'counters': {}})):
+                target['counters'][name] = target['counters'].get(name, 0) + value
+        # the records not related to a feed are in the totals only
+        stats['feeds'].pop(None, None)
+        return stats
+
+    def close(self) -> None:
+        for sink in self._sinks:
+            sink.write(self)
+
+
+def _get_record_order(record) -> tuple:
+    """
+    Return the sort key of a record, the records not related to a feed go first
+
+    :param record: a ((name, feed), value) record
+    :return: the sort key
+    """
+    (name, feed), value = record
+    return feed is not None, feed or '', name
+
+
+class JSONStatsSink:
+    """The sink dumping the stats as JSON to a file or to stderr, the feeds output stays clean in stdout"""
+
+    def __init__(self, file_name: str = None) -> None:
+        """
+        The class constructor
+
+        :param str file_name: the stats file, None or '-' means stderr
+        """
+        self._file_name = file_name
+
+    def write(self, metrics: MetricsRecorder) -> None:
+        """
+        Write the stats
+
+        :param MetricsRecorder metrics: the recorded metrics
+        :return: None
+        """
+        stats = json.dumps(metrics.get_stats(), indent=4, ensure_ascii=False)
+        if self._file_name in (None, '-'):
+            print(stats, file=sys.stderr)
+        else:
+            with open(self._file_name, 'w', encoding='utf-8') as file:
+                file.write(stats + '\n')
+
+
+class PrometheusFileSink:
+    """
+    The sink writing the metrics in the Prometheus text format, e.g. for the node exporter textfile collector. The
+    file is replaced atomically, so the collector never reads a partial file
+    """
+
+    def __init__(self, file_name: str, prefix: str = 'rss_reader') -> None:
+        """
+        The class constructor
+
+        :param str file_name: the metrics file, usually with the .prom extension
+        :param str prefix: the prefix of the metric names
+        """
+        self._file_name = file_name
+        self._prefix = prefix
+
+    def write(self, metrics: MetricsRecorder) -> None:
+        """
+        Write the metrics
+
+        :param MetricsRecorder metrics: the recorded metrics
+        :return: None
+        """
+        temp_file_name = self._file_name + '.tmp'
+        with open(temp_file_name, 'w', encoding='utf-8') as file:
+            file.write(self.format(metrics))
+        os.replace(temp_file_name, self._file_name)
+
+    def format(self, metrics: MetricsRecorder) -> str:
+        """
+        Format the metrics in the Prometheus text format. The stage times are summaries, the counters are counters
+
+        :param MetricsRecorder metrics: the recorded metrics
+        :return: the metrics text
+        """
+        timers, counters = metrics.get_records()
+        stage_metric = self._prefix + '_stage_seconds'
+        lines = ['# HELP ' + stage_metric + ' The time spent in the reader stages',
+                 '# TYPE ' + stage_metric + ' summary']
+        for (stage, feed), (count, seconds, max_seconds) in sorted(timers.items(), key=_get_record_order):
+            labels = _format_labels(stage=stage, feed=feed)
+            lines.append(stage_metric + '_sum' + labels + ' ' + repr(seconds))
+            lines.append(stage_metric + '_count' + labels + ' ' + str(count))
+        counter_names = sorted({name for name, feed in counters})
+        for name in counter_names:
+            counter_metric = self._prefix + '_' + name + '_total'
+            lines.append('# TYPE ' + counter_metric + ' counter')
+            for (counter_name, feed), value in sorted(counters.items(), key=_get_record_order):
+                if counter_name == name:
+                    lines.append(counter_metric + _format_labels(feed=feed) + ' ' + str(value))
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(**labels) -> str:
+    """
+    Format the Prometheus labels, the labels with None values are skipped
+
+    :param labels: the label names and values
+    :return: the labels text
+    """
+    formatted_labels = [name + '="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                        for name, value in labels.items() if value is not None]
+    return '{' + ','.join(formatted_labels) + '}' if formatted_labels else ''
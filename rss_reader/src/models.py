@@ -0,0 +1,70 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Post:
+    """
+    An RSS-feed topic. The links are kept as a tuple
+    """
+    title: str
+    date: str
+    link: str
+    links: tuple = ()
+
+    def to_dict(self) -> dict:
+        """
+        Convert the post to the JSON schema of the news cache
+
+        :return: a parsed RSS topic dict
+        """
+        return {'title': self.title, 'date': self.date, 'link': self.link, 'links': list(self.links)}
+
+    @classmethod
+    def from_dict(cls, post: dict) -> 'Post':
+        """
+        Create the post from the JSON schema of the news cache
+
+        :param dict post: a parsed RSS topic dict
+        :return: the post
+        """
+        return cls(post['title'], post['date'], post['link'], tuple(post['links']))
+
+
+@dataclass(slots=True)
+class Feed:
+    """
+    An RSS feed with its topics
+    """
+    title: str
+    link: str
+    posts: list
+
+    def get_header(self) -> dict:
+        """
+        Return the feed header of the JSON schema of the news cache
+
+        :return: a dictionary with the blog title and link
+        """
+        return {'Blog title': self.title, 'Blog link': self.link}
+
+    def to_dict(self) -> dict:
+        """
+        Convert the feed to the JSON schema of the news cache
+
+        :return: a formatted dictionary of RSS feed topics
+        """
+        return dict(self.get_header(), posts=[post.to_dict() for post in self.posts])
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Feed':
+        """
+        Create the feed from the JSON schema of the news cache
+
+        :param dict data: a formatted dictionary of RSS feed topics
+        :return: the feed
+        """
+        return cls(data['Blog title'], data['Blog link'], [Post.from_dict(post) for post in data['posts']])
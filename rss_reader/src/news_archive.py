@@ -0,0 +1,154 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import json
+import struct
+import zlib
+
+from . import file_processing_utilities
+from .models import Feed, Post
+
+# the news archive formats and their file extensions
+archive_formats = {
+    'jsonl': '.jsonl',
+    'jsonl.gz': '.jsonl.gz',
+    'bin': '.bin',
+}
+# the legacy '.json' snapshots are read as well
+news_files_patterns = ('*.json', '*.jsonl', '*.jsonl.gz', '*.bin')
+
+# The binary archive is the magic followed by blocks. Every block is a header with the compressed size, the posts
+# count and the first and the last post dates, and zlib-compressed JSON Lines. The first block is the feed header,
+# every next block is the posts appended at once. The blocks out of the searched date range are skipped undecoded
+binary_magic = b'RSSN\x01'
+_block_header = struct.Struct('>II8s8s')
+
+
+def gen_news_files(news_folder: str):
+    """
+    Find all news archive files of any format in the news folder
+
+    :param str news_folder: the news folder
+    :return: a generator of file names
+    """
+    for pattern in news_files_patterns:
+        yield from file_processing_utilities.gen_find(pattern, news_folder)
+
+
+def append_posts(file_name: str, data: Feed, posts: list) -> None:
+    """
+    Append posts to the news archive file. The format is chosen by the file extension
+
+    :param str file_name: path to the news archive file
+    :param Feed data: the RSS feed with its topics
+    :param list posts: the posts to append
+    :return: None
+    """
+    if file_name.endswith(archive_formats['bin']):
+        _append_binary_posts(file_name, data, posts)
+    else:
+        file_processing_utilities.append_json_lines_to_file(file_name, data, posts)
+
+
+def read_news_file(file_name: str, date_range: tuple = None) -> Feed:
+    """
+    Read the news archive file. The format is chosen by the file extension
+
+    :param str file_name: path to the news archive file
+    :param tuple date_range: if specified, only the posts from the first to the last date in 'yyyymmdd' format are
+     returned
+    :return: the RSS feed with its topics, ValueError is raised if the file is broken
+    """
+    if file_name.endswith(archive_formats['bin']):
+        return _read_binary_posts(file_name, date_range)
+    with file_processing_utilities.open_news_file(file_name, 'r') as f:
+        data = file_processing_utilities.read_news_file(f)
+    if date_range is not None:
+        data.posts = [post for post in data.posts if date_range[0] <= post.date <= date_range[1]]
+    return data
+
+
+def _write_block(binary_file, records: list, first_date: str = '', last_date: str = '') -> None:
+    """
+    Write a block of records to the binary archive
+
+    :param binary_file: a file opened in binary mode
+    :param list records: the JSON-serializable records
+    :param str first_date: the first post date of the block
+    :param str last_date: the last post date of the block
+    :return: None
+    """
+    payload = zlib.compress(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+                            .encode('utf-8'))
+    binary_file.write(_block_header.pack(len(payload), len(records), first_date.encode('ascii'),
+                                         last_date.encode('ascii')))
+    binary_file.write(payload)
+
+
+def _read_block(binary_file, date_range: tuple = None):
+    """
+    Read the next block of records from the binary archive
+
+    :param binary_file: a file opened in binary mode
+    :param tuple date_range: if specified, the block is skipped undecoded unless it could have posts of the range
+    :return: a list of records, an empty list for a skipped block or None at the end of the file
+    """
+    header = binary_file.read(_block_header.size)
+    if not header:
+        return None
+    if len(header) != _block_header.size:
+        raise ValueError("Truncated block header")
+    payload_size, records_count, first_date, last_date = _block_header.unpack(header)
+    if date_range is not None and (last_date.decode('ascii') < date_range[0] or
+                                   first_date.decode('ascii') > date_range[1]):
+        binary_file.seek(payload_size, 1)
+        return []
+    try:
+        payload = zlib.decompress(binary_file.read(payload_size))
+    except zlib.error as err:
+        raise ValueError("Broken block " + str(err))
+    return [json.loads(line) for line in payload.decode('utf-8').splitlines()]
+
+
+def _append_binary_posts(file_name: str, data: Feed, posts: list) -> None:
+    """
+    Append posts to the binary archive as one block. A new file starts with the magic and the feed header block
+
+    :param str file_name: path to the binary archive
+    :param Feed data: the RSS feed with its topics
+    :param list posts: the posts to append
+    :return: None
+    """
+    is_new_file = not file_processing_utilities.is_file_exists(file_name)
+    with open(file_name, 'ab') as f:
+        if is_new_file:
+            f.write(binary_magic)
+            _write_block(f, [data.get_header()])
+        if posts:
+            dates = [post.date for post in posts]
+            _write_block(f, [post.to_dict() for post in posts], min(dates), max(dates))
+
+
+def _read_binary_posts(file_name: str, date_range: tuple = None) -> Feed:
+    """
+    Read the binary archive
+
+    :param str file_name: path to the binary archive
+    :param tuple date_range: if specified, only the posts from the first to the last date in 'yyyymmdd' format are
+     returned
+    :return: the RSS feed with its topics
+    """
+    with open(file_name, 'rb') as f:
+        if f.read(len(binary_magic)) != binary_magic:
+            raise ValueError("Not a binary news archive")
+        header = _read_block(f)
+        if not header:
+            raise ValueError("The feed header not found")
+        posts = []
+        records = _read_block(f, date_range)
+        while records is not None:
+            posts.extend(Post.from_dict(record) for record in records
+                         if date_range is None or date_range[0] <= record['date'] <= date_range[1])
+            records = _read_block(f, date_range)
+    return Feed(header[0]['Blog title'], header[0]['Blog link'], posts)
@@ -0,0 +1,79 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+from dataclasses import dataclass
+
+from . import utilities
+from .models import Post
+from .rss_reader_errors import InvalidNewsDateError
+
+# the bounds of an open date range
+_min_date = '00000000'
+_max_date = '99999999'
+
+
+@dataclass(slots=True)
+class NewsQuery:
+    """
+    The query of the cached news. All specified conditions must match. The news index backends plan the query: the
+    date range, the feed title and the full-text search terms select the index entries before any post is read, the
+    text is matched on the read posts and the results are streamed up to the limit. The full-text search results are
+    ranked by relevance
+    """
+    date_from: str = None
+    date_to: str = None
+    feed_title: str = None
+    text: str = None
+    limit: int = 0
+    search: str = None
+
+    def is_empty(self) -> bool:
+        """
+        Check the query has no conditions
+
+        :return: bool
+        """
+        return (self.date_from is None and self.date_to is None and not self.feed_title and not self.text and
+                not self.search)
+
+    def validate(self) -> None:
+        """
+        Validation of the query dates. The dates should be in 'yyyymmdd' format and the range should not be empty
+
+        :return: raise an error in case of present
+        """
+        for date in (self.date_from, self.date_to):
+            if date is not None:
+                utilities.validate_news_date_argument(date)
+        if self.date_from is not None and self.date_to is not None and self.date_from > self.date_to:
+            raise InvalidNewsDateError
+
+    def get_date_range(self) -> tuple:
+        """
+        Return the inclusive date range of the query. The missing bounds are open
+
+        :return: the first and the last date in 'yyyymmdd' format
+        """
+        return self.date_from or _min_date, self.date_to or _max_date
+
+    def match_feed(self, feed_title: str) -> bool:
+        """
+        Check the feed title contains the searched feed title, case-insensitive
+
+        :param str feed_title: the feed title
+        :return: bool
+        """
+        return not self.feed_title or self.feed_title.casefold() in feed_title.casefold()
+
+    def match_post(self, post: Post) -> bool:
+        """
+        Check the post title or link contains the searched text, case-insensitive
+
+        :param Post post: the post
+        :return: bool
+        """
+        if not self.text:
+            return True
+        text = self.text.casefold()
+        return text in post.title.casefold() or text in post.link.casefold()
@@ -0,0 +1,168 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import calendar
+import datetime
+import fnmatch
+import os
+import re
+from dataclasses import dataclass
+
+from . import file_processing_utilities, news_archive
+from .models import Feed
+
+# the feed files are named as 'feed_name-yyyymmdd' or 'feed_name-yyyymm' for the monthly segments, the paginated HTML
+# pages have the page number after the date
+_feed_file_pattern = re.compile(r'^(?P<feed>.+)-(?P<period>\d{8}|\d{6})(?:-\d+)?\.[^-]+$')
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    """
+    The limits of the news folders. The oldest feed files are removed first, 0 means no limit
+    """
+    max_age_days: int = 0
+    max_bytes: int = 0
+    max_files_per_feed: int = 0
+
+    def is_empty(self) -> bool:
+        """
+        Check the policy has no limits
+
+        :return: bool
+        """
+        return not (self.max_age_days or self.max_bytes or self.max_files_per_feed)
+
+
+def get_feed_files(folder: str) -> list:
+    """
+    Return the feed files of the folder. Only the top level of the folder is listed
+
+    :param str folder: the news folder
+    :return: a list of (feed name, last date of the period in 'yyyymmdd' format, file name) tuples, oldest first
+    """
+    feed_files = []
+    if not file_processing_utilities.is_dir_exists(folder):
+        return feed_files
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            match = _feed_file_pattern.match(entry.name)
+            # the names starting with a dot are the temporary files
+            if match is not None and not entry.name.startswith('.') and entry.is_file():
+                feed_files.append((match['feed'], _get_period_end(match['period']), entry.path))
+    feed_files.sort(key=lambda feed_file: (feed_file[1], feed_file[2]))
+    return feed_files
+
+
+def get_expired_files(folder: str, policy: RetentionPolicy, today: datetime.date = None) -> list:
+    """
+    Select the feed files to remove by the retention policy: the files older than the max age, the oldest files of
+    the feeds with too many files and the oldest files while the folder is larger than the max size
+
+    :param str folder: the news folder
+    :param RetentionPolicy policy: the retention policy
+    :param today: the current date
+    :return: a list of file names
+    """
+    feed_files = get_feed_files(folder)
+    expired_files = set()
+    if policy.max_age_days:
+        today = today or datetime.date.today()
+        first_date = (today - datetime.timedelta(days=policy.max_age_days)).strftime('%Y%m%d')
+        expired_files.update(file_name for feed, last_date, file_name in feed_files if last_date < first_date)
+    if policy.max_files_per_feed:
+        feeds_files = {}
+        for feed, last_date, file_name in feed_files:
+            if file_name not in expired_files:
+                feeds_files.setdefault(feed, []).append(file_name)
+        for file_names in feeds_files.values():
+            expired_files.update(file_names[:-policy.max_files_per_feed])
+    if policy.max_bytes:
+        kept_files = [file_name for feed, last_date, file_name in feed_files if file_name not in expired_files]
+        total_size = sum(os.path.getsize(file_name) for file_name in kept_files)
+        for file_name in kept_files:
+            if total_size <= policy.max_bytes:
+                break
+            total_size -= os.path.getsize(file_name)
+            expired_files.add(file_name)
+    return [file_name for feed, last_date, file_name in feed_files if file_name in expired_files]
+
+
+def compact_news_folder(news_folder: str, cache_format: str, today: datetime.date = None) -> list:
+    """
+    Merge the daily archive files of every feed into a file per month. The posts are de-duplicated by the link, the
+    files of today are left as they could be appended yet
+
+    :param str news_folder: the news folder
+    :param str cache_format: the format of the monthly files, one of `archive_formats` keys
+    :param today: the current date
+    :return: a list of the merged daily file names
+    """
+    today_date = (today or datetime.date.today()).strftime('%Y%m%d')
+    months_files = {}
+    for feed, last_date, file_name in get_feed_files(news_folder):
+        is_archive_file = any(fnmatch.fnmatch(file_name, pattern) for pattern in news_archive.news_files_patterns)
+        # the monthly file of the current month ends today on the last day of the month, it is merged as usual
+        is_today_file = _feed_file_pattern.match(os.path.basename(file_name))['period'] == today_date
+        if is_archive_file and not is_today_file:
+            months_files.setdefault((feed, last_date[:6]), []).append(file_name)
+    merged_files = []
+    for (feed, month), file_names in months_files.items():
+        segment_name = os.path.join(news_folder, feed + '-' + month + news_archive.archive_formats[cache_format])
+        daily_files = [file_name for file_name in file_names if file_name != segment_name]
+        if daily_files:
+            # the monthly file is replaced, so its posts are always merged and go first
+            segment_files = [segment_name] if file_processing_utilities.is_file_exists(segment_name) else []
+            _write_segment(segment_name, segment_files + daily_files)
+            for file_name in daily_files:
+                os.remove(file_name)
+            merged_files.extend(daily_files)
+    return merged_files
+
+
+def _write_segment(segment_name: str, file_names: list) -> None:
+    """
+    Write the posts of the archive files to the monthly file. The file is replaced atomically
+
+    :param str segment_name: the monthly file name
+    :param list file_names: the archive files of the month, the monthly file could be one of them
+    :return: None
+    """
+    feed = None
+    links = set()
+    for file_name in file_names:
+        try:
+            data = news_archive.read_news_file(file_name)
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            # a broken archive file is merged without its posts
+            continue
+        if feed is None:
+            feed = Feed(data.title, data.link, [])
+        for post in data.posts:
+            if post.link not in links:
+                links.add(post.link)
+                feed.posts.append(post)
+    if feed is None:
+        return
+    folder, name = os.path.split(segment_name)
+    temp_file_name = os.path.join(folder, '.compacting-' + name)
+    if file_processing_utilities.is_file_exists(temp_file_name):
+        os.remove(temp_file_name)
+    news_archive.append_posts(temp_file_name, feed, feed.posts)
+    os.replace(temp_file_name, segment_name)
+
+
+def _get_period_end(period: str) -> str:
+    """
+    Return the last date of the period of the feed file name
+
+    :param str period: the date in 'yyyymmdd' format or the month in 'yyyymm' format
+    :return: the date in 'yyyymmdd' format
+    """
+    if len(period) == 8:
+        return period
+    year, month = int(period[:4]), int(period[4:])
+    if not 1 <= month <= 12:
+        return period + '00'
+    return period + '%02d' % calendar.monthrange(year, month)[1]
@@ -0,0 +1,223 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import itertools
+import json
+import os
+import sqlite3
+
+from . import file_processing_utilities, news_archive
+from .models import Feed, Post
+from .news_query import NewsQuery
+from .rss_reader_errors import FullTextSearchError
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS feeds (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        link TEXT NOT NULL,
+        UNIQUE (title, link)
+    );
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY,
+        feed_id INTEGER NOT NULL REFERENCES feeds (id),
+        title TEXT NOT NULL,
+        date TEXT NOT NULL,
+        link TEXT NOT NULL,
+        links TEXT NOT NULL,
+        UNIQUE (feed_id, link)
+    );
+    CREATE INDEX IF NOT EXISTS posts_date ON posts (date, feed_id);
+    CREATE INDEX IF NOT EXISTS posts_link ON posts (link);
+'''
+# the full-text index of the post titles and links is kept in sync with the posts by the triggers
+_FULL_TEXT_SCHEMA = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5 (
+        title, link, content='posts', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts (rowid, title, link) VALUES (new.id, new.title, new.link);
+    END;
+    CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts (posts_fts, rowid, title, link) VALUES ('delete', old.id, old.title, old.link);
+    END;
+'''
+# the title matches rank higher than the link matches
+_TITLE_WEIGHT = 10.0
+_LINK_WEIGHT = 1.0
+
+
+class NewsStorage:
+    """
+    The SQLite storage of the cached news. Posts are indexed by the date, the feed and the link. The titles and the
+    links are indexed for the full-text search if SQLite has the FTS5 extension
+    """
+
+    db_file_name = 'news.db'
+
+    def __init__(self, news_folder: str) -> None:
+        """
+        Open the storage in the news folder. The cached news files are imported if the storage is created
+
+        :param str news_folder: the news folder
+        """
+        self._news_folder = news_folder
+        db_path = os.path.join(news_folder, self.db_file_name)
+        is_created = not file_processing_utilities.is_file_exists(db_path)
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.executescript(_SCHEMA)
+        self._is_full_text_search = self._create_full_text_index()
+        if is_created:
+            self.import_news_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the storage
+
+        :return: None
+        """
+        self._connection.close()
+
+    def add_posts(self, data: Feed) -> list:
+        """
+        Save the posts of the feed. The posts are identified by the link, already saved posts are skipped
+
+        :param Feed data: the RSS feed with its topics
+        :return: a list of the posts which were not saved before
+        """
+        new_posts = []
+        with self._connection:
+            feed_id = self._get_feed_id(data.title, data.link)
+            for post in data.posts:
+                cursor = self._connection.execute(
+                    'INSERT OR IGNORE INTO posts (feed_id, title, date, link, links) VALUES (?, ?, ?, ?, ?)',
+                    (feed_id, post.title, post.date, post.link, json.dumps(post.links)))
+                if cursor.rowcount == 1:
+                    new_posts.append(post)
+        return new_posts
+
+    def remove_posts(self, data: Feed) -> int:
+        """
+        Remove the posts of the feed
+
+        :param Feed data: the RSS feed with the posts to remove
+        :return: the number of removed posts
+        """
+        removed_posts = 0
+        with self._connection:
+            feed = self._connection.execute('SELECT id FROM feeds WHERE title = ? AND link = ?',
+                                            (data.title, data.link)).fetchone()
+            if feed is not None:
+                for post in data.posts:
+                    removed_posts += self._connection.execute('DELETE FROM posts WHERE feed_id = ? AND link = ?',
+                                                              (feed[0], post.link)).rowcount
+        return removed_posts
+
+    def find_posts_by_date(self, date: str):
+        """
+        Find the posts by the date
+
+        :param str date: the date in 'yyyymmdd' format
+        :return: a generator of (feed title, post) pairs ordered by the feed
+        """
+        return self.find_posts(NewsQuery(date, date))
+
+    def find_posts(self, query: NewsQuery):
+        """
+        Find the posts matching the query. The date range is looked up in the date index and the feeds are selected by
+        the title before the posts are read, the limit is applied by SQLite unless the posts are matched by the text
+
+        :param NewsQuery query: the news query
+        :return: a generator of (feed title, post) pairs ordered by the feed and the date
+        """
+        if query.search:
+            if not self._is_full_text_search:
+                raise FullTextSearchError("SQLite has no FTS5 extension")
+            sql = ('SELECT feeds.title, posts.title, posts.date, posts.link, posts.links FROM posts_fts '
+                   'JOIN posts ON posts.id = posts_fts.rowid JOIN feeds ON feeds.id = posts.feed_id '
+                   'WHERE posts_fts MATCH ? AND posts.date BETWEEN ? AND ?')
+            parameters = [_get_match_expression(query.search), *query.get_date_range()]
+        else:
+            sql = ('SELECT feeds.title, posts.title, posts.date, posts.link, posts.links FROM posts '
+                   'JOIN feeds ON feeds.id = posts.feed_id WHERE posts.date BETWEEN ? AND ?')
+            parameters = list(query.get_date_range())
+        if query.feed_title:
+            feed_ids = [feed_id for feed_id, feed_title in self._connection.execute('SELECT id, title FROM feeds')
+                        if query.match_feed(feed_title)]
+            sql += ' AND posts.feed_id IN (' + ', '.join('?' * len(feed_ids)) + ')'
+            parameters.extend(feed_ids)
+        if query.search:
+            sql += ' ORDER BY bm25(posts_fts, ?, ?), posts.date DESC'
+            parameters.extend((_TITLE_WEIGHT, _LINK_WEIGHT))
+        else:
+            sql += ' ORDER BY posts.feed_id, posts.date, posts.id'
+        if query.limit and not query.text:
+            sql += ' LIMIT ?'
+            parameters.append(query.limit)
+        posts = ((feed_title, Post(title, post_date, link, tuple(json.loads(links))))
+                 for feed_title, title, post_date, link, links in self._connection.execute(sql, parameters))
+        return itertools.islice(((feed_title, post) for feed_title, post in posts if query.match_post(post)),
+                                query.limit or None)
+
+    def _create_full_text_index(self) -> bool:
+        """
+        Create the full-text index. The posts saved before the index existed are indexed at once
+
+        :return: False if SQLite has no FTS5 extension
+        """
+        is_created = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'").fetchone() is None
+        try:
+            self._connection.executescript(_FULL_TEXT_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if is_created:
+            with self._connection:
+                self._connection.execute("INSERT INTO posts_fts (posts_fts) VALUES ('rebuild')")
+        return True
+
+    def import_news_files(self) -> int:
+        """
+        Import the cached news files of all archive formats from the news folder
+
+        :return: the number of imported posts
+        """
+        imported_posts = 0
+        for news_file_name in news_archive.gen_news_files(self._news_folder):
+            try:
+                data = news_archive.read_news_file(news_file_name)
+                imported_posts += len(self.add_posts(data))
+            except (OSError, EOFError, ValueError, KeyError, TypeError):
+                # a broken cache file must not prevent importing the rest of the news
+                continue
+        return imported_posts
+
+    def _get_feed_id(self, title: str, link: str) -> int:
+        """
+        Return the feed id. The feed is saved if it is not saved yet
+
+        :param str title: the feed title
+        :param str link: the feed link
+        :return: the feed id
+        """
+        self._connection.execute('INSERT OR IGNORE INTO feeds (title, link) VALUES (?, ?)', (title, link))
+        return self._connection.execute('SELECT id FROM feeds WHERE title = ? AND link = ?',
+                                        (title, link)).fetchone()[0]
+
+
+def _get_match_expression(search: str) -> str:
+    """
+    Convert the searched terms to the FTS5 query. Every term is quoted, so the FTS5 syntax characters are searched as
+    text, and all terms must match
+
+    :param str search: the searched terms separated by spaces
+    :return: the FTS5 query
+    """
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in search.split()) or '""'
@@ -2,9 +2,14 @@
 #  mail: snooki17@gmail.com
 #  Licensed under the MIT License
 #  Copyright (c) 2022.
+import io
+import sys
+
 from fpdf import FPDF
+from fpdf.errors import FPDFException
 
-from . import file_processing_utilities, utilities
+from . import file_processing_utilities, utilities, image_cache, image_processor
+from .models import Feed
 from .rss_reader_errors import SaveToPDFError
 
 news_pdf_folder = 'news_pdf'
@@ -23,40 +28,54 @@ class PDF(FPDF):
         self.cell(0, 10, f"Page {self.page_no()}/{{nb}}", align="C")
 
 
-def save_data_to_pdf(input_dict: dict, limit: int) -> None:
+def save_data_to_pdf(feed: Feed, limit: int, image_dpi: int = 0, image_quality: int = 75) -> None:
     """
     Save RSS feed topics to PDF file
 
-    :param input_dict: a formatted dictionary of RSS feed topics
+    :param feed: the RSS feed with its topics
     :param limit: If `--limit` is not specified or `--limit` is larger than feed size then user should get all available news
+    :param image_dpi: If specified, images are downscaled to this resolution for the drawn width
+    :param image_quality: The JPEG quality of downscaled images
     :return: None
     """
     pdf = PDF(orientation="P", unit="mm", format="A4")
+    image_width = pdf.epw / 3
+
+    # the images of the selected posts are downloaded concurrently before the layout
+    posts = feed.posts[:limit] if limit != 0 else feed.posts
+    image_links = [link for post in posts for link in post.links if link.endswith('.jpg')]
+    images = image_cache.prefetch_images(image_links, image_cache.news_images_folder)
+    if image_dpi:
+        images = {link: image_processor.get_processed_image(content, image_width, image_dpi, image_quality,
+                                                            image_cache.news_images_folder)
+                  for link, content in images.items() if content is not None}
+    image_cache.evict_images(image_cache.news_images_folder, image_cache.max_cache_size)
+
     pdf.add_page()
     pdf.add_font('DejaVu', fname='./fonts/DejaVuSansCondensed.ttf')
     pdf.set_font('DejaVu', size=20)
-    pdf.write(txt=input_dict['Blog title'])
+    pdf.write(txt=feed.title)
     pdf.ln(10)
     pdf.set_font(style="U")
     link = pdf.add_link()
-    pdf.write(10, input_dict['Blog link'], link)
+    pdf.write(10, feed.link, link)
     limit_counter = 0
-    for post in input_dict['posts']:
+    for post in feed.posts:
         pdf.set_font("DejaVu", size=12)
         pdf.ln(10)
         pdf.write(10, txt="********************************************************************")
         pdf.ln(10)
-        pdf.write(10, txt=post['title'])
+        pdf.write(10, txt=post.title)
         pdf.ln(10)
-        formatted_date = utilities.get_formatted_date_to_pdf(post['date'])
+        formatted_date = utilities.get_formatted_date_to_pdf(post.date)
         pdf.write(10, txt=formatted_date)
         pdf.ln(10)
         pdf.set_font(style="U")
-        pdf.cell(txt=post['link'], link=post['link'])
-        for link in post['links']:
-            if link.endswith('.jpg'):
+        pdf.cell(txt=post.link, link=post.link)
+        for link in post.links:
+            if link.endswith('.jpg') and images.get(link) is not None:
                 pdf.ln(10)
-                pdf.image(link, w=pdf.epw / 3)
+                _add_image(pdf, link, images[link], image_width)
         limit_counter += 1
         if limit != 0 and limit_counter == limit:
             break
@@ -64,7 +83,23 @@ def save_data_to_pdf(input_dict: dict, limit: int) -> None:
     try:
         if not file_processing_utilities.is_dir_exists(news_pdf_folder):
             file_processing_utilities.create_news_folder(news_pdf_folder)
-        file_name = file_processing_utilities.get_file_name(news_pdf_folder, input_dict, '.pdf')
+        file_name = file_processing_utilities.get_file_name(news_pdf_folder, feed, '.pdf')
         pdf.output(file_name)
     except OSError:
         raise SaveToPDFError
+
+
+def _add_image(pdf: FPDF, link: str, content: bytes, width: float) -> None:
+    """
+    Draw the image. A broken image, e.g. a truncated file or an HTML page with the .jpg name, is skipped
+
+    :param pdf: the PDF document
+    :param str link: the image URL
+    :param bytes content: the image content
+    :param float width: the drawn image width in millimeters
+    :return: None
+    """
+    try:
+        pdf.image(io.BytesIO(content), w=width)
+    except (OSError, ValueError, FPDFException) as err:
+        print("The image cannot be added to PDF", link, str(err), file=sys.stderr)
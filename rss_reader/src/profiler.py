@@ -0,0 +1,219 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import contextlib
+import cProfile
+import functools
+import os
+import sys
+import threading
+import tracemalloc
+
+from .metrics import Metrics
+
+# the stages traced by the memory profiler: the posts extraction, the PDF and HTML writers and the news cache writing
+traced_stages = ('extract', 'render_pdf', 'render_html', 'cache_write')
+
+# the number of the allocation sites reported per stage
+TOP_ALLOCATION_SITES = 10
+
+
+class Profiler:
+    """
+    The profiler of a run. The main thread is profiled by cProfile, the stacks of all threads are sampled for the
+    flame graphs, and the allocations of the traced stages are compared by tracemalloc snapshots if requested.
+    The output files are named by the prefix:
+
+    - <prefix>.prof: the cProfile stats for pstats, snakeviz and the like
+    - <prefix>.folded: the collapsed stacks for flamegraph.pl, speedscope and the like
+    - <prefix>.memory.txt: the top allocation sites of the traced stages
+    """
+
+    def __init__(self, output_prefix: str, is_memory_traced: bool = False, sample_interval: float = 0.005) -> None:
+        """
+        The class constructor
+
+        :param str output_prefix: the path prefix of the output files
+        :param bool is_memory_traced: Trace the allocations of the traced stages
+        :param float sample_interval: The stack sampling interval in seconds
+        """
+        self._output_prefix = output_prefix
+        self._is_memory_traced = is_memory_traced
+        self._sample_interval = sample_interval
+        self._profile = cProfile.Profile()
+        self._stack_counts = {}
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+        self._memory_metrics = None
+
+    def trace_metrics(self, metrics: Metrics) -> Metrics:
+        """
+        Return the metrics taking the allocation snapshots around the traced stages if the memory is traced
+
+        :param Metrics metrics: the metrics of the reader
+        :return: the metrics to pass to the reader
+        """
+        if not self._is_memory_traced:
+            return metrics
+        self._memory_metrics = MemoryTracingMetrics(metrics)
+        return self._memory_metrics
+
+    def get_output_files(self) -> list:
+        """
+        Return the output file names
+
+        :return: a list of file names
+        """
+        extensions = ['.prof', '.folded'] + (['.memory.txt'] if self._is_memory_traced else [])
+        return [self._output_prefix + extension for extension in extensions]
+
+    def __enter__(self) -> 'Profiler':
+        if self._is_memory_traced:
+            tracemalloc.start()
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_stacks, name='profiler', daemon=True)
+        self._sampler.start()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._profile.disable()
+        self._stop_sampling.set()
+        self._sampler.join()
+        folder = os.path.dirname(self._output_prefix)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        self._profile.dump_stats(self._output_prefix + '.prof')
+        with open(self._output_prefix + '.folded', 'w', encoding='utf-8') as file:
+            for stack, count in sorted(self._stack_counts.items()):
+                file.write(stack + ' ' + str(count) + '\n')
+        if self._is_memory_traced:
+            tracemalloc.stop()
+            with open(self._output_prefix + '.memory.txt', 'w', encoding='utf-8') as file:
+                file.write(self._memory_metrics.format_report() if self._memory_metrics is not None else '')
+
+    def _sample_stacks(self) -> None:
+        """
+        Count the stacks of all threads but the sampler one until stopped
+
+        :return: None
+        """
+        sampler_id = threading.get_ident()
+        while not self._stop_sampling.wait(self._sample_interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(code.co_name + ' (' + _get_short_path(code.co_filename) + ':'
+                                 + str(code.co_firstlineno) + ')')
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                # the collapsed stack is the root first frames separated by semicolons followed by the count
+                key = ';'.join(reversed(stack))
+                self._stack_counts[key] = self._stack_counts.get(key, 0) + 1
+
+
+@functools.lru_cache(maxsize=None)
+def _get_short_path(file_name: str) -> str:
+    """
+    Return the file name relative to the current folder, or the last two parts of the path of the library files. The
+    names are cached as every stack sample converts all of its frames
+
+    :param str file_name: the code file name
+    :return: the short file name
+    """
+    if not os.path.isabs(file_name):
+        return file_name
+    relative_name = os.path.relpath(file_name)
+    if not relative_name.startswith('..'):
+        return relative_name
+    return os.path.join(*file_name.split(os.sep)[-2:])
+
+
+class MemoryTracingMetrics(Metrics):
+    """
+    The metrics comparing the tracemalloc snapshots before and after the traced stages, the other calls are passed to
+    the wrapped metrics. The snapshots are process-wide, so the stages of concurrent feeds see the allocations of each
+    other
+    """
+
+    def __init__(self, metrics: Metrics) -> None:
+        """
+        The class constructor
+
+        :param Metrics metrics: the wrapped metrics
+        """
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        # stage -> [runs count, {allocation site: [size difference, blocks difference]}]
+        self._stage_allocations = {}
+
+    def time(self, stage: str, feed: str = None):
+        if stage in traced_stages and tracemalloc.is_tracing():
+            return self._trace_stage(stage, feed)
+        return self._metrics.time(stage, feed)
+
+    def add_time(self, stage: str, seconds: float, feed: str = None) -> None:
+        self._metrics.add_time(stage, seconds, feed)
+
+    def count(self, name: str, value: int = 1, feed: str = None) -> None:
+        self._metrics.count(name, value, feed)
+
+    def close(self) -> None:
+        self._metrics.close()
+
+    @contextlib.contextmanager
+    def _trace_stage(self, stage: str, feed: str):
+        """
+        Time the stage by the wrapped metrics and add the allocations made by the stage
+
+        :param str stage: the stage name
+        :param str feed: the RSS-feed URL
+        :return: a context manager
+        """
+        snapshot = _take_snapshot()
+        with self._metrics.time(stage, feed):
+            yield
+        statistics = _take_snapshot().compare_to(snapshot, 'lineno')
+        with self._lock:
+            stage_allocations = self._stage_allocations.setdefault(stage, [0, {}])
+            stage_allocations[0] += 1
+            for statistic in statistics:
+                if statistic.size_diff > 0:
+                    frame = statistic.traceback[0]
+                    site = _get_short_path(frame.filename) + ':' + str(frame.lineno)
+                    allocation = stage_allocations[1].setdefault(site, [0, 0])
+                    allocation[0] += statistic.size_diff
+                    allocation[1] += statistic.count_diff
+
+    def format_report(self) -> str:
+        """
+        Format the top allocation sites of every traced stage. The allocations are the memory left allocated when the
+        stage ended, summed over the stage runs
+
+        :return: the report text
+        """
+        lines = []
+        with self._lock:
+            for stage, (runs, allocations) in self._stage_allocations.items():
+                lines.append('Stage ' + stage + ', ' + str(runs) + ' runs, the top allocation sites:')
+                top_allocations = sorted(allocations.items(), key=lambda allocation: -allocation[1][0])
+                for site, (size, blocks) in top_allocations[:TOP_ALLOCATION_SITES]:
+                    lines.append(f'  {size / 1024:10.1f} KiB {blocks:8} blocks  {site}')
+                lines.append('')
+        return '\n'.join(lines)
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    """
+    Take the tracemalloc snapshot without the allocations of tracemalloc and the import machinery
+
+    :return: the snapshot
+    """
+    return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                                      tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                                                      tracemalloc.Filter(False, '<unknown>')))
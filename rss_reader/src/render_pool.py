@@ -0,0 +1,132 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, Future
+from dataclasses import dataclass
+
+from . import file_processing_utilities, html_processor, image_cache
+from .models import Feed, Post
+from .rss_reader_errors import SaveToPDFError, SaveToHTMLError
+
+
+@dataclass(slots=True)
+class RenderJob:
+    """The settings of the PDF and HTML rendering of a feed. The folders are passed as the workers are new processes"""
+    to_pdf: bool
+    to_html: bool
+    limit: int = 0
+    pdf_image_dpi: int = 0
+    pdf_image_quality: int = 75
+    html_page_size: int = 0
+    news_pdf_folder: str = 'news_pdf'
+    news_html_folder: str = 'news_html'
+    news_images_folder: str = 'news_images'
+
+
+@dataclass(slots=True)
+class RenderResult:
+    """The result of a file rendering, the error is SaveToPDFError or SaveToHTMLError if the file is not saved"""
+    file_format: str
+    file_name: str
+    seconds: float
+    error: Exception = None
+
+
+def get_payload(data: Feed, limit: int) -> tuple:
+    """
+    Return the compact payload of the feed sent to a render worker. Only the posts within the limit are rendered, so
+    the rest of the posts are not sent
+
+    :param Feed data: the RSS feed with its topics
+    :param int limit: the number of the rendered posts, 0 means all
+    :return: a tuple of the feed title, link and the posts field tuples
+    """
+    posts = data.posts[:limit] if limit else data.posts
+    return data.title, data.link, [(post.title, post.date, post.link, post.links) for post in posts]
+
+
+def render_feed(payload: tuple, job: RenderJob) -> list:
+    """
+    Save the feed to PDF and HTML. The function is run by the render workers
+
+    :param tuple payload: the feed payload of `get_payload`
+    :param RenderJob job: the rendering settings
+    :return: a list of RenderResult
+    """
+    title, link, posts = payload
+    data = Feed(title, link, [Post(*post) for post in posts])
+    results = []
+    if job.to_pdf:
+        from . import pdf_processor
+
+        pdf_processor.news_pdf_folder = job.news_pdf_folder
+        image_cache.news_images_folder = job.news_images_folder
+        results.append(_render_file('pdf', pdf_processor.news_pdf_folder, data, pdf_processor.save_data_to_pdf,
+                                    job.limit, job.pdf_image_dpi, job.pdf_image_quality))
+    if job.to_html:
+        html_processor.news_html_folder = job.news_html_folder
+        results.append(_render_file('html', html_processor.news_html_folder, data, html_processor.save_data_to_html,
+                                    job.limit, job.html_page_size))
+    return results
+
+
+def _render_file(file_format: str, folder: str, data: Feed, save_function, *args) -> RenderResult:
+    """
+    Save the feed to a file
+
+    :param str file_format: 'pdf' or 'html'
+    :param str folder: the output folder
+    :param Feed data: the RSS feed with its topics
+    :param save_function: `save_data_to_pdf` or `save_data_to_html`
+    :param args: the rest of the save function arguments
+    :return: the render result
+    """
+    start_time = time.perf_counter()
+    file_name = file_processing_utilities.get_file_name(folder, data, '.' + file_format)
+    try:
+        save_function(data, *args)
+    except (SaveToPDFError, SaveToHTMLError) as err:
+        return RenderResult(file_format, file_name, time.perf_counter() - start_time, err)
+    return RenderResult(file_format, file_name, time.perf_counter() - start_time)
+
+
+class RenderPool:
+    """
+    The pool of the render worker processes. The PDF layout is CPU-bound and holds the GIL, so the feeds are rendered
+    in separate processes. The workers are spawned, not forked, as the parent process runs the feed threads
+    """
+
+    def __init__(self, workers: int) -> None:
+        """
+        The class constructor
+
+        :param int workers: the number of the render processes
+        """
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def __enter__(self) -> 'RenderPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def submit(self, data: Feed, job: RenderJob) -> Future:
+        """
+        Send the feed to a render worker
+
+        :param Feed data: the RSS feed with its topics
+        :param RenderJob job: the rendering settings
+        :return: the future of a list of RenderResult
+        """
+        return self._executor.submit(render_feed, get_payload(data, job.limit), job)
+
+    def close(self) -> None:
+        """
+        Wait for the submitted jobs and stop the workers
+
+        :return: None
+        """
+        self._executor.shutdown(wait=True)
@@ -37,3 +37,7 @@ class SaveToPDFError(RSSReaderErrors):
 
 class SaveToHTMLError(RSSReaderErrors):
     pass
+
+
+class FullTextSearchError(RSSReaderErrors):
+    pass
@@ -2,17 +2,40 @@
 #  mail: snooki17@gmail.com
 #  Licensed under the MIT License
 #  Copyright (c) 2022.
+import dataclasses
+import io
+import itertools
 import json
+import os
+import sqlite3
 import sys
+import textwrap
 import time
-from pprint import pprint
 
-import feedparser
-
-from . import utilities, file_processing_utilities
+from . import utilities, file_processing_utilities, http_cache, html_processor, news_archive, news_retention
 from .rss_reader_errors import *
-from .pdf_processor import save_data_to_pdf
 from .html_processor import save_data_to_html
+from .metrics import null_metrics
+from .models import Feed, Post
+from .news_query import NewsQuery
+from .news_storage import NewsStorage
+
+# feedparser, fpdf and the other heavy dependencies are imported only when their feature is used, so the CLI starts
+# fast for `--version` and `--date`
+
+# the entry fields used as the post key for de-duplication, the first present field is used
+dedup_strategies = {
+    'auto': ('id', 'link', 'title'),
+    'guid': ('id',),
+    'link': ('link',),
+    'title': ('title',),
+}
+
+# the feed parsers, the fast parser falls back to feedparser for the feeds it does not support
+parser_backends = ('feedparser', 'fast')
+
+# the number of feeds fetched concurrently by default
+default_workers = 4
 
 
 class RSSReader:
@@ -25,17 +48,63 @@ class RSSReader:
     _date = ""
     _to_pdf = False
     _to_html = False
+    _workers = default_workers
+    _dedup_fields = dedup_strategies['auto']
+    _pdf_image_dpi = 0
+    _pdf_image_quality = 75
+    _html_page_size = 0
+    _watch = False
+    _watch_interval = 300
+    _feed_intervals = {}
+    _cache_format = 'jsonl'
+    _index = 'sqlite'
+    _news_query = None
+    _retention_policy = None
+    _compact = False
+    _metrics = null_metrics
+    _profiler = None
+    _parser = 'feedparser'
+    _render_workers = 0
+    _render_pool = None
+    _storage = None
     _news_folder = 'news_json'
+    _http_cache_folder = 'news_http_cache'
 
     def __init__(self, url=None, is_JSON_needed=False, is_verbose=False, limit=0, date="", to_pdf=False,
-                 to_html=False) -> None:
+                 to_html=False, workers=default_workers, dedup='auto', pdf_image_dpi=0, pdf_image_quality=75,
+                 html_page_size=0, watch=False, watch_interval=300, feed_intervals=None,
+                 cache_format='jsonl', index='sqlite', news_query=None, retention_policy=None,
+                 compact=False, metrics=None, profile=None, profile_memory=False, parser='feedparser',
+                 render_workers=0, http_cache_folder='news_http_cache') -> None:
         """
         The class constructor
 
-        :param str url: an RSS-feed URL
+        :param url: an RSS-feed URL or a list of RSS-feed URLs
         :param bool is_JSON_needed: Print result as JSON in stdout
         :param bool is_verbose: Outputs verbose status messages
         :param int limit: Limit news topics if this parameter provided
+        :param str date: The date getting news from local storage
+        :param bool to_pdf: Save results as PDF file
+        :param bool to_html: Save results as HTML file
+        :param int workers: The number of feeds fetched concurrently
+        :param str dedup: The de-duplication strategy of posts, one of `dedup_strategies` keys
+        :param int pdf_image_dpi: Downscale PDF images to this resolution, 0 keeps the original images
+        :param int pdf_image_quality: The JPEG quality of downscaled PDF images
+        :param int html_page_size: Split HTML into pages of this number of posts, 0 saves a single page
+        :param bool watch: Poll the feeds until interrupted and print new posts as JSON Lines
+        :param float watch_interval: The default poll interval in seconds
+        :param dict feed_intervals: The poll intervals of particular feeds in seconds
+        :param str cache_format: The format of the news archive, one of `archive_formats` keys
+        :param str index: The date lookup backend, one of `index_backends`
+        :param NewsQuery news_query: The date range and the filters of the cached news search
+        :param RetentionPolicy retention_policy: The limits of the news, PDF and HTML folders
+        :param bool compact: Merge the daily news files into monthly files
+        :param Metrics metrics: The stage timers and counters, the no-op metrics by default
+        :param str profile: Profile the run and save the profile files with this path prefix
+        :param bool profile_memory: Trace the allocations of the posts extraction, PDF, HTML and cache writing
+        :param str parser: The feed parser, one of `parser_backends`
+        :param int render_workers: The number of processes saving PDF and HTML, 0 saves them in the feed workers
+        :param str http_cache_folder: The folder of the HTTP conditional GET cache, None disables the cache
         """
         self._rss_feed_url = url
         self._JSON_mode = is_JSON_needed
@@ -44,18 +113,88 @@ class RSSReader:
         self._date = date
         self._to_pdf = to_pdf
         self._to_html = to_html
+        self._workers = workers
+        self._dedup_fields = dedup_strategies[dedup]
+        self._pdf_image_dpi = pdf_image_dpi
+        self._pdf_image_quality = pdf_image_quality
+        self._html_page_size = html_page_size
+        self._watch = watch
+        self._watch_interval = watch_interval
+        self._feed_intervals = feed_intervals or {}
+        self._cache_format = cache_format
+        self._index = index
+        self._news_query = news_query
+        self._retention_policy = retention_policy
+        self._compact = compact
+        self._metrics = metrics or null_metrics
+        self._parser = parser
+        self._render_workers = render_workers
+        self._http_cache_folder = http_cache_folder
+        # the futures of the feeds sent to the render processes and their URLs
+        self._render_futures = []
+        if profile is not None:
+            from .profiler import Profiler
+
+            self._profiler = Profiler(profile, profile_memory)
+            self._metrics = self._profiler.trace_metrics(self._metrics)
 
     def show_rss(self) -> None:
         """
         Print the RSS-feed topics. The only function is available for external use.
 
+        :return: None
+        """
+        if self._profiler is None:
+            self._show_rss()
+        else:
+            with self._profiler:
+                self._show_rss()
+
+    def fetch_feed(self, url: str) -> Feed:
+        """
+        Get the RSS feed with its topics without printing and caching them. The function is available for the
+        libraries embedding the reader
+
+        :param str url: an RSS-feed URL
+        :return: the RSS feed with its topics, raise the `rss_reader_errors` exceptions if the feed cannot be got
+        """
+        return self._load_feed(url)
+
+    def _show_rss(self) -> None:
+        """
+        Search the cached news, then get, print and save the RSS feeds
+
         :return: None
         """
         self._print_log_message("Program started")
 
-        self._search_historical_data(self._date)
+        try:
+            self._maintain_news_folders()
+            self._search_historical_data(self._date)
 
-        self._process_feed(self._rss_feed_url)
+            urls = self._get_feed_urls()
+            if self._render_workers and (self._to_pdf or self._to_html) and urls:
+                from .render_pool import RenderPool
+
+                self._print_log_message("Saving PDF/HTML with " + str(self._render_workers) + " render workers")
+                self._render_pool = RenderPool(self._render_workers)
+            try:
+                if self._watch and urls:
+                    self._watch_feeds(urls)
+                elif len(urls) > 1:
+                    self._process_feeds(urls)
+                else:
+                    self._process_feed(urls[0] if urls else None)
+            finally:
+                if self._render_pool is not None:
+                    self._render_pool.close()
+                    self._render_pool = None
+        finally:
+            # the metrics are written even if the program exits with an error
+            try:
+                self._metrics.close()
+            except OSError as err:
+                print("The metrics cannot be saved", str(err))
 
         self._print_log_message("Program ended")
 
@@ -69,102 +208,417 @@ class RSSReader:
         if self._verbose_mode:
             print(message, utilities.get_formatted_current_date_for_log())
 
+    def _maintain_news_folders(self) -> None:
+        """
+        Compact the news folder and remove the oldest files of the news, PDF and HTML folders by the retention policy.
+        The posts of the removed news files are removed from the news storage, the date index is rebuilt if it exists
+
+        :return: None
+        """
+        is_changed = False
+        if self._compact and file_processing_utilities.is_dir_exists(self._news_folder):
+            self._print_log_message("Compacting news...")
+            merged_files = news_retention.compact_news_folder(self._news_folder, self._cache_format)
+            self._print_log_message(str(len(merged_files)) + " news files merged into monthly files")
+            is_changed = bool(merged_files)
+        if self._retention_policy is not None and not self._retention_policy.is_empty():
+            from .pdf_processor import news_pdf_folder
+
+            for folder in (self._news_folder, news_pdf_folder, html_processor.news_html_folder):
+                expired_files = news_retention.get_expired_files(folder, self._retention_policy)
+                if folder == self._news_folder and expired_files:
+                    self._remove_stored_posts(expired_files)
+                    is_changed = True
+                for file_name in expired_files:
+                    os.remove(file_name)
+                self._print_log_message(str(len(expired_files)) + " old files removed from " + folder)
+        if is_changed:
+            from .date_index import DateIndex
+
+            # the date index is rebuilt only if it is used
+            if file_processing_utilities.is_file_exists(os.path.join(self._news_folder, DateIndex.catalog_file_name)):
+                with DateIndex(self._news_folder) as date_index:
+                    date_index.rebuild()
+
+    def _remove_stored_posts(self, file_names: list) -> None:
+        """
+        Remove the posts of the news files from the news storage
+
+        :param list file_names: the news files
+        :return: None
+        """
+        with NewsStorage(self._news_folder) as storage:
+            for file_name in file_names:
+                try:
+                    storage.remove_posts(news_archive.read_news_file(file_name))
+                except (OSError, EOFError, ValueError, KeyError, TypeError):
+                    # the posts of a broken news file are left in the storage
+                    continue
+
     def _search_historical_data(self, date: str) -> None:
         """
-        Search and print news by a particular date from the cache
+        Search and print news by a particular date or by the news query from the cache
 
         :param str date: the CLI arg - input date
         :return: None
         """
-        if date is not None:
+        query = self._get_news_query(date)
+        if query is not None:
             try:
-                utilities.validate_news_date_argument(self._date)
+                query.validate()
             except InvalidNewsDateError as err:
                 print("The invalid date. The date should be in 'yyyymmdd' format", str(err))
                 sys.exit(1)
             if file_processing_utilities.is_dir_exists(self._news_folder):
                 self._print_log_message("Searching news...")
                 try:
-                    file_processing_utilities.search_and_print_news(self._news_folder, self._date)
+                    with self._metrics.time('search'):
+                        file_processing_utilities.search_and_print_news(self._news_folder, query, self._index)
                 except NewsNotFoundError as err:
-                    print("News not found for this date")
+                    print("News not found for this date" if date is not None else "News not found for this query")
+                except FullTextSearchError as err:
+                    print("The full-text search is not available", str(err))
             else:
                 self._print_log_message("News folder not found")
         else:
             self._print_log_message("Date for searching was not provided")
 
+    def _get_news_query(self, date: str):
+        """
+        Return the query of the cached news search. The date is a single day range, `--limit` limits the found posts
+
+        :param str date: the CLI arg - input date
+        :return: the news query or None if nothing is searched
+        """
+        query = self._news_query or NewsQuery()
+        if date is not None:
+            query = dataclasses.replace(query, date_from=date, date_to=date)
+        if query.is_empty():
+            return None
+        return dataclasses.replace(query, limit=self._limit)
+
+    def _get_feed_urls(self) -> list:
+        """
+        Return the RSS-feed URLs to process. A single URL or a list of URLs can be provided
+
+        :return: a list of RSS-feed URLs
+        """
+        if self._rss_feed_url is None:
+            return []
+        if isinstance(self._rss_feed_url, str):
+            return [self._rss_feed_url]
+        return list(self._rss_feed_url)
+
     def _process_feed(self, url: str) -> None:
+        """
+        Get, save and print a single RSS feed. The program exits if the feed cannot be got
+
+        :param str url: an RSS-feed URL
+        :return: None
+        """
         if url is not None:
-            self._print_log_message("Getting RSS-feed")
             try:
-                rss_feed = self._get_feed(url)
-            except URLNotFoundError as err:
-                print("The URL not found. Check the URL and try again", str(err))
-                sys.exit(1)
-            except InvalidURLError as err:
-                print("The invalid URL was provided. Check the URL and try again", str(err))
-                sys.exit(1)
-            except IncorrectURLError as err:
-                print("The incorrect URL was provided. Check the URL and try again", str(err))
+                data = self._load_feed(url)
+            except RSSReaderErrors as err:
+                self._print_feed_error(err)
                 sys.exit(1)
 
-            self._print_log_message("Getting posts")
-            try:
-                data = self._get_posts_details(rss_feed)
-            except RSSParsingError as err:
-                print("RSS feed parsing error occurred", str(err))
-                sys.exit(1)
+            self._show_posts(data)
+
+            with self._metrics.time('cache_write', url):
+                self._save_historical_data(data, url)
+
+            self._print_render_results()
+
+        else:
+            self._print_log_message("RSS feed was not provided")
+
+    def _process_feeds(self, urls: list) -> None:
+        """
+        Get several RSS feeds concurrently with a bounded pool of workers. Every feed is printed and cached as soon
+        as it is ready, the program exits with an error after all feeds are processed if any of them failed
+
+        :param list urls: RSS-feed URLs
+        :return: None
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
 
-            if self._to_pdf:
-                self._print_log_message("Saving to PDF...")
+        self._print_log_message("Getting " + str(len(urls)) + " RSS-feeds with " + str(self._workers) + " workers")
+        is_failed = False
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            futures = {executor.submit(self._load_feed, url): url for url in urls}
+            for future in as_completed(futures):
                 try:
-                    save_data_to_pdf(data, self._limit)
-                except SaveToPDFError as err:
-                    print("Error during saving to PDF occurred", str(err))
-                else:
-                    self._print_log_message("Saved to PDF successfully")
+                    data = future.result()
+                except RSSReaderErrors as err:
+                    self._print_feed_error(err, futures[future])
+                    is_failed = True
+                    continue
+
+                self._show_posts(data)
+
+                with self._metrics.time('cache_write', futures[future]):
+                    self._save_historical_data(data, futures[future])
+
+        self._print_render_results()
+        if is_failed:
+            sys.exit(1)
+
+    def _watch_feeds(self, urls: list, max_polls: int = None) -> None:
+        """
+        Poll the feeds on their intervals until interrupted. The news storage stays open between polls, the new posts
+        are printed as JSON Lines as soon as they appear
+
+        :param list urls: RSS-feed URLs
+        :param int max_polls: stop after this number of polls, None means poll forever
+        :return: None
+        """
+        from .feed_scheduler import FeedScheduler
 
-            if self._to_html:
-                self._print_log_message("Saving to HTML...")
+        scheduler = FeedScheduler()
+        for url in urls:
+            scheduler.add_feed(url, self._feed_intervals.get(url, self._watch_interval))
+        if not file_processing_utilities.is_dir_exists(self._news_folder):
+            file_processing_utilities.create_news_folder(self._news_folder)
+        self._storage = NewsStorage(self._news_folder)
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                due_time, url = scheduler.pop_feed()
+                time.sleep(max(0.0, due_time - time.monotonic()))
+                polls += 1
                 try:
-                    save_data_to_html(data, self._limit)
-                except SaveToHTMLError as err:
-                    print("Error during saving to HTML occurred", str(err))
+                    data = self._load_feed(url)
+                    with self._metrics.time('cache_write', url):
+                        new_posts = self._save_historical_data(data, url)
+                    self._print_new_posts(data, new_posts)
+                    self._print_render_results()
+                except RSSReaderErrors as err:
+                    self._print_feed_error(err, url)
+                except (OSError, sqlite3.Error) as err:
+                    # a full disk or a locked news database fails the poll, not the watching
+                    print("Error during saving of RSS-feed occurred", url, str(err))
                 else:
-                    self._print_log_message("Saved to HTML successfully")
+                    scheduler.reschedule_feed(url)
+                    continue
+                delay = scheduler.reschedule_feed(url, is_failed=True)
+                self._print_log_message("Next poll of " + url + " in " + str(round(delay)) + " seconds")
+        except KeyboardInterrupt:
+            self._print_log_message("Watching stopped")
+        finally:
+            self._storage.close()
+            self._storage = None
+
+    def _print_new_posts(self, data, posts: list) -> None:
+        """
+        Print posts as JSON Lines, every post is printed with the blog title and link
+
+        :param Feed data: the RSS feed with its topics
+        :param list posts: the posts to print
+        :return: None
+        """
+        for post in posts:
+            print(json.dumps(dict(data.get_header(), **post.to_dict()), ensure_ascii=False), flush=True)
+
+    def _load_feed(self, url: str) -> Feed:
+        """
+        Get the RSS feed, extract its posts and save them to PDF/HTML if needed
+
+        :param str url: an RSS-feed URL
+        :return: the RSS feed with its topics, raise an error in case of present
+        """
+        self._print_log_message("Getting RSS-feed " + url)
+        with self._metrics.time('fetch', url):
+            cache_entry = http_cache.read_cache_entry(self._http_cache_folder, url, self._limit)
+            response = utilities.check_feed_url(url, http_cache.get_conditional_headers(cache_entry))
+        self._metrics.count('bytes_fetched', len(response.content or b''), url)
+
+        if response.status_code == 304 and cache_entry is not None:
+            self._print_log_message("RSS-feed not modified. Using cached posts")
+            self._metrics.count('http_cache_hits', 1, url)
+            data = cache_entry['data']
+        else:
+            with self._metrics.time('parse', url):
+                rss_feed = self._parse_feed(response, url)
+            self._metrics.count('entries', len(rss_feed.entries), url)
 
-            if self._JSON_mode:
-                self._print_log_message("JSON mode on")
-                self._show_rss_as_json(data)
+            self._print_log_message("Getting posts")
+            with self._metrics.time('extract', url):
+                data = self._get_posts_details(rss_feed, url)
+
+            try:
+                http_cache.write_cache_entry(self._http_cache_folder, url, response.headers.get('ETag'),
+                                             response.headers.get('Last-Modified'), data, self._limit)
+            except OSError as err:
+                self._print_log_message("HTTP cache not saved " + str(err))
+        self._metrics.count('posts', len(data.posts), url)
+
+        # in watch mode the PDF/HTML files of an unchanged feed are saved by the previous poll
+        if not (self._watch and response.status_code == 304 and cache_entry is not None):
+            self._render_feed(data, url)
+        return data
+
+    def _render_feed(self, data, url: str) -> None:
+        """
+        Save the feed to PDF/HTML if needed. If there are render workers the feed is sent to them and the results are
+        printed by `_print_render_results`
+
+        :param Feed data: the RSS feed with its topics
+        :param str url: an RSS-feed URL
+        :return: None
+        """
+        if self._render_pool is not None:
+            self._print_log_message("Sending to render workers...")
+            try:
+                self._render_futures.append((self._render_pool.submit(data, self._get_render_job()), url))
+                return
+            except RuntimeError as err:
+                # the pool is broken if a worker process died, the feed is saved here then
+                self._print_log_message("Render workers are not available " + str(err))
+
+        if self._to_pdf:
+            from .pdf_processor import save_data_to_pdf
+
+            self._print_log_message("Saving to PDF...")
+            try:
+                with self._metrics.time('render_pdf', url):
+                    save_data_to_pdf(data, self._limit, self._pdf_image_dpi, self._pdf_image_quality)
+            except SaveToPDFError as err:
+                print("Error during saving to PDF occurred", str(err))
+            else:
+                self._print_log_message("Saved to PDF successfully")
+
+        if self._to_html:
+            self._print_log_message("Saving to HTML...")
+            try:
+                with self._metrics.time('render_html', url):
+                    save_data_to_html(data, self._limit, self._html_page_size)
+            except SaveToHTMLError as err:
+                print("Error during saving to HTML occurred", str(err))
             else:
-                self._print_log_message("Plain text mode on")
-                self._show_rss_as_plain_text(data)
+                self._print_log_message("Saved to HTML successfully")
+
+    def _get_render_job(self):
+        """
+        Return the rendering settings sent to the render workers with the feeds
+
+        :return: the render job
+        """
+        from .image_cache import news_images_folder
+        from .render_pool import RenderJob
+
+        job = RenderJob(self._to_pdf, self._to_html, self._limit, self._pdf_image_dpi, self._pdf_image_quality,
+                        self._html_page_size, news_html_folder=html_processor.news_html_folder,
+                        news_images_folder=news_images_folder)
+        if self._to_pdf:
+            from .pdf_processor import news_pdf_folder
+
+            job.news_pdf_folder = news_pdf_folder
+        return job
+
+    def _print_render_results(self) -> None:
+        """
+        Wait for the feeds sent to the render workers and print the results of saving to PDF/HTML
+
+        :return: None
+        """
+        render_futures, self._render_futures = self._render_futures, []
+        for future, url in render_futures:
+            try:
+                results = future.result()
+            except Exception as err:
+                # a died worker process or an unexpected error fails the files of the feed only
+                print("Error during saving to PDF/HTML occurred", url, str(err))
+                continue
+            for result in results:
+                self._metrics.add_time('render_' + result.file_format, result.seconds, url)
+                if isinstance(result.error, SaveToPDFError):
+                    print("Error during saving to PDF occurred", str(result.error))
+                elif isinstance(result.error, SaveToHTMLError):
+                    print("Error during saving to HTML occurred", str(result.error))
+                else:
+                    self._print_log_message("Saved to " + result.file_format.upper() + " successfully " +
+                                            result.file_name)
 
-            self._save_historical_data(data)
+    def _print_feed_error(self, err: RSSReaderErrors, url: str = None) -> None:
+        """
+        Print the reason why the RSS feed cannot be got
 
+        :param err: the error raised while getting the feed
+        :param str url: the failed RSS-feed URL, printed in multi-feed mode
+        :return: None
+        """
+        if isinstance(err, URLNotFoundError):
+            message = "The URL not found. Check the URL and try again"
+        elif isinstance(err, InvalidURLError):
+            message = "The invalid URL was provided. Check the URL and try again"
+        elif isinstance(err, IncorrectURLError):
+            message = "The incorrect URL was provided. Check the URL and try again"
         else:
-            self._print_log_message("RSS feed was not provided")
+            message = "RSS feed parsing error occurred"
+        if url is not None:
+            print(message, url, str(err))
+        else:
+            print(message, str(err))
+
+    def _show_posts(self, data) -> None:
+        """
+        Print the RSS feed topics as a JSON or as a plain text
+
+        :param Feed data: the RSS feed with its topics
+        :return: None
+        """
+        if self._JSON_mode:
+            self._print_log_message("JSON mode on")
+            self._show_rss_as_json(data)
+        else:
+            self._print_log_message("Plain text mode on")
+            self._show_rss_as_plain_text(data)
 
     def _get_feed(self, url):
         """
-        Get the RSS feed from the RSS-feed URL
+        Get the RSS feed from the RSS-feed URL. The feed is downloaded once and the parsed object is passed through
+        the rest of the pipeline
+
+        :param str url: an RSS-feed URL
+        :return: an RSS-feed object
+        """
+        return self._parse_feed(utilities.check_feed_url(url), url)
+
+    def _parse_feed(self, response, url):
+        """
+        Parse the downloaded RSS feed
 
+        :param response: the HTTP response with the feed body
         :param str url: an RSS-feed URL
         :return: an RSS-feed object
         """
-        utilities.check_feed_url(url)
-        return feedparser.parse(url)
+        if self._parser == 'fast':
+            from .fast_feed_parser import parse_feed
+
+            rss_feed = parse_feed(response.content, response.url or url)
+            if rss_feed is not None:
+                return rss_feed
+            # the malformed feeds and the features the fast parser does not support are left to feedparser
+            self._print_log_message("The feed is not supported by the fast parser. Parsing with feedparser")
+            self._metrics.count('fast_parser_fallbacks', 1, url)
+
+        import feedparser
 
-    def _get_posts_details(self, rss_feed) -> dict:
+        response_headers = {k.lower(): v for k, v in response.headers.items()}
+        # feedparser resolves relative links against the Content-Location header when it parses raw bytes
+        response_headers.setdefault('content-location', response.url or url)
+        return feedparser.parse(io.BytesIO(response.content), response_headers=response_headers)
+
+    def _get_posts_details(self, rss_feed, url: str = None) -> Feed:
         """
-        Get a formatted dictionary of RSS feed topics
+        Get the RSS feed with its topics
 
         :param rss_feed: an RSS-feed object
-        :return: formatted dict
+        :param str url: the RSS-feed URL the metrics are labelled with
+        :return: the RSS feed with its topics
         """
-        posts_details = {"Blog title": self._get_feed_name(rss_feed), "Blog link": self._get_feed_link(rss_feed),
-                         "posts": self._get_posts_list()}
-        return posts_details
+        return Feed(self._get_feed_name(rss_feed), self._get_feed_link(rss_feed), self._get_posts_list(rss_feed, url))
 
     def _get_feed_name(self, rss_feed) -> str:
         """
@@ -194,37 +648,58 @@ class RSSReader:
             raise RSSParsingError
         return feed_link
 
-    def _get_posts_list(self) -> list:
+    def _get_posts_list(self, rss_feed, url: str = None) -> list:
         """
-        Get the posts list from the RSS-feed
+        Get the posts list from the RSS-feed. If `--limit` is specified, the topics after the limit are not converted
 
+        :param rss_feed: an RSS-feed object
+        :param str url: the RSS-feed URL the metrics are labelled with
         :return: a list of posts
         """
-        posts_list = []
-        posts = self._get_feed(self._rss_feed_url)
         self._print_log_message("Getting the posts list")
-        for post in posts.entries:
-            if post.title in [x['title'] for x in posts_list]:
-                pass
-            else:
-                temp_post = self._get_post(post)
-                posts_list.append(temp_post)
+        return list(itertools.islice(self._iter_posts(rss_feed, url), self._limit or None))
+
+    def _iter_posts(self, rss_feed, url: str = None):
+        """
+        Convert the RSS-feed topics to posts one by one, skipping duplicated topics
 
-        return posts_list
+        :param rss_feed: an RSS-feed object
+        :param str url: the RSS-feed URL the metrics are labelled with
+        :return: a generator of posts
+        """
+        seen_keys = set()
+        for entry in rss_feed.entries:
+            key = self._get_post_key(entry)
+            if key is not None:
+                if key in seen_keys:
+                    self._metrics.count('dedup_drops', 1, url)
+                    continue
+                seen_keys.add(key)
+            yield self._get_post(entry)
 
-    def _get_post(self, entry) -> dict:
+    def _get_post_key(self, entry):
+        """
+        Get the de-duplication key of an RSS-feed topic. The first present field of the de-duplication strategy is used
+
+        :param entry: an RSS-feed topic object
+        :return: a hashable key or None if the topic has none of the strategy fields
+        """
+        for field in self._dedup_fields:
+            value = getattr(entry, field, None)
+            if value:
+                return field, value
+        return None
+
+    def _get_post(self, entry) -> Post:
         """
         Get a post from the RSS-feed
 
         :param entry: an RSS-feed topic object
-        :return: a parsed RSS topic dict
+        :return: a parsed RSS topic
         """
-        post = dict()
         try:
-            post['title'] = entry.title
-            post['date'] = time.strftime('%Y%m%d', entry.published_parsed)
-            post['link'] = entry.link
-            post['links'] = [link.href for link in entry.links]
+            post = Post(entry.title, time.strftime('%Y%m%d', entry.published_parsed), entry.link,
+                        tuple(link.href for link in entry.links))
         except AttributeError:
             raise RSSParsingError
 
@@ -234,49 +709,38 @@ class RSSReader:
         """
         Print results in JSON
 
-        :param data: a formatted dictionary of RSS feed topics
+        :param Feed data: the RSS feed with its topics
         :return: None
         """
-        if self._is_print_all():
+        if self._is_print_all(data):
             self._print_log_message("Printing all posts as a JSON")
-            print(json.dumps(data, ensure_ascii=False, indent=4))
+            self._print_json(data)
         else:
             self._print_log_message("Printing limited posts as a JSON")
             self._limited_print(data)
 
-    def _is_print_all(self) -> bool:
+    def _is_print_all(self, data) -> bool:
         """
         If `--limit` is not specified or `--limit` is larger than feed size then user should get all available news.
 
+        :param Feed data: the RSS feed with its topics
         :return: bool
         """
-
-        rss_feed = self._get_feed(self._rss_feed_url)
-        feed_length = self._get_feed_length(rss_feed)
+        feed_length = len(data.posts)
         if self._limit == 0 or self._limit > feed_length:
             return True
 
-    def _get_feed_length(self, rss_feed) -> int:
-        """
-        Return the RSS-feed topics count
-
-        :param rss_feed: an RSS-feed object
-        :return: int the RSS-feed topics count
-        """
-        self._print_log_message("Getting the feed length")
-        return len(rss_feed.entries)
-
     def _limited_print(self, data) -> None:
         """
         Limit news topics
 
-        :param data: a formatted dictionary of RSS feed topics
+        :param Feed data: the RSS feed with its topics
         :return: None
         """
         limit = 0
-        for post in data['posts']:
+        for post in data.posts:
             print("********************************************************************")
-            for k, v in post.items():
+            for k, v in post.to_dict().items():
                 print(k, v)
             limit += 1
             if limit == self._limit:
@@ -286,31 +750,76 @@ class RSSReader:
         """
         Print results in human-readable format
 
-        :param data: a formatted dictionary of RSS feed topics
+        :param Feed data: the RSS feed with its topics
         :return: None
         """
-        if self._is_print_all():
+        if self._is_print_all(data):
             self._print_log_message("Printing all posts as a plain text")
-            pprint(data)
+            self._print_plain_text(data)
         else:
             self._print_log_message("Printing limited posts as a plain text")
             self._limited_print(data)
 
-    def _save_historical_data(self, data) -> None:
+    def _print_json(self, data) -> None:
         """
-        Save the RSS news
+        Print the RSS feed topics as a JSON post by post. The output is the same as of `json.dumps` with indent 4
 
-        :param data: a formatted dictionary of RSS feed topics
+        :param Feed data: the RSS feed with its topics
         :return: None
         """
+        print('{')
+        for key, value in data.get_header().items():
+            print('    ' + json.dumps(key) + ': ' + json.dumps(value, ensure_ascii=False) + ',')
+        separator = '    "posts": ['
+        for post in data.posts:
+            print(separator)
+            print(textwrap.indent(json.dumps(post.to_dict(), ensure_ascii=False, indent=4), ' ' * 8), end='')
+            separator = ','
+        print('\n    ]' if separator == ',' else '    "posts": []')
+        print('}')
+
+    def _print_plain_text(self, data) -> None:
+        """
+        Print the RSS feed topics in human-readable format post by post
+
+        :param Feed data: the RSS feed with its topics
+        :return: None
+        """
+        from pprint import pprint
+
+        pprint(data.get_header())
+        for post in data.posts:
+            pprint(post.to_dict())
+
+    def _save_historical_data(self, data, url: str = None) -> list:
+        """
+        Save the RSS news. Only the posts which are not cached yet are appended to the news file
+
+        :param Feed data: the RSS feed with its topics
+        :param str url: the RSS-feed URL the metrics are labelled with
+        :return: the posts which were not cached before
+        """
         if not file_processing_utilities.is_dir_exists(self._news_folder):
             self._print_log_message("News folder not found. Creating...")
             file_processing_utilities.create_news_folder(self._news_folder)
             self._print_log_message("News folder created successfully")
-        file_name = file_processing_utilities.get_file_name(self._news_folder, data, '.json')
-        if not file_processing_utilities.is_file_exists(file_name):
-            self._print_log_message("File " + file_name + " not found. Caching...")
-            file_processing_utilities.write_json_to_file(self._news_folder, data)
+        if self._storage is not None:
+            new_posts = self._storage.add_posts(data)
+        else:
+            with NewsStorage(self._news_folder) as storage:
+                new_posts = storage.add_posts(data)
+        self._metrics.count('new_posts', len(new_posts), url)
+        if new_posts:
+            file_name = file_processing_utilities.get_file_name(self._news_folder, data,
+                                                                news_archive.archive_formats[self._cache_format])
+            self._print_log_message(str(len(new_posts)) + " new posts found. Caching to " + file_name + "...")
+            news_archive.append_posts(file_name, data, new_posts)
+            if self._index == 'mmap':
+                from .date_index import DateIndex
+
+                with DateIndex(self._news_folder) as date_index:
+                    date_index.update_file(file_name)
             self._print_log_message("News saved successfully")
         else:
-            self._print_log_message("File " + file_name + " found. No need to cache")
+            self._print_log_message("No new posts found. No need to cache")
+        return new_posts
@@ -5,8 +5,6 @@
 import re
 from datetime import datetime
 
-import requests
-
 from .rss_reader_errors import URLNotFoundError, IncorrectURLError, InvalidURLError, InvalidNewsDateError
 
 
@@ -30,15 +28,20 @@ def get_formatted_current_date_for_log() -> str:
     return now.strftime("%d/%m/%Y %H:%M:%S")
 
 
-def check_feed_url(url: str) -> None:
+def check_feed_url(url: str, headers: dict = None) -> 'requests.Response':
     """
-    Validation an RSS feed URL
+    Validation an RSS feed URL. The downloaded response is returned so the feed is fetched only once per run
 
     :param str url: an RSS-feed URL
-    :return: raise an error in case of present
+    :param dict headers: additional request headers, e.g. for a conditional GET
+    :return: the HTTP response with the feed body, raise an error in case of present
     """
+    import requests
+
+    from . import http_client
+
     try:
-        requests.get(url)
+        return http_client.get(url, headers=headers)
     except requests.exceptions.ConnectionError:
         raise URLNotFoundError
     except requests.exceptions.InvalidURL:
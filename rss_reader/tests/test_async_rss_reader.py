@@ -0,0 +1,83 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import requests
+
+from src.async_rss_reader import AsyncRSSReader
+from src.rss_reader_errors import URLNotFoundError
+from tests.test_rss_reader_impl import get_test_response
+
+
+def get_response(url, **kwargs):
+    """
+    Return the test feed titled by the URL, the URLs ending with 'bad' are not found
+
+    :param str url: the requested URL
+    :return: a response mock
+    """
+    if url.endswith("bad"):
+        raise requests.exceptions.ConnectionError
+    return get_test_response(url, url)
+
+
+class TestAsyncRSSReader(IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.http_cache_folder = tempfile.mkdtemp()
+        self.rss_reader = AsyncRSSReader(limit=1, http_cache_folder=os.path.join(self.http_cache_folder, 'http_cache'))
+
+    def tearDown(self) -> None:
+        self.rss_reader.close()
+        shutil.rmtree(self.http_cache_folder)
+
+    async def test_get_feed(self):
+        with patch('src.http_client.get', side_effect=get_response):
+            data = await self.rss_reader.get_feed("https://example.com/rss")
+        self.assertEqual(data.title, "https://example.com/rss")
+        self.assertEqual([post.title for post in data.posts], ["First post"])
+
+    async def test_get_feed_error_raised(self):
+        with patch('src.http_client.get', side_effect=get_response):
+            with self.assertRaises(URLNotFoundError):
+                await self.rss_reader.get_feed("https://example.com/bad")
+
+    async def test_get_feeds(self):
+        urls = ["https://example.com/rss/" + str(i) for i in range(10)]
+        with patch('src.http_client.get', side_effect=get_response):
+            feeds = await self.rss_reader.get_feeds(urls)
+        self.assertEqual([data.title for data in feeds], urls)
+
+    async def test_iter_feeds(self):
+        urls = ["https://example.com/rss", "https://example.com/bad"]
+        with patch('src.http_client.get', side_effect=get_response):
+            results = {url: result async for url, result in self.rss_reader.iter_feeds(urls)}
+        self.assertEqual(results["https://example.com/rss"].title, "https://example.com/rss")
+        self.assertIsInstance(results["https://example.com/bad"], URLNotFoundError)
+
+    async def test_http_cache_folder(self):
+        response = get_test_response(etag='"v1"')
+        current_folder = os.getcwd()
+        os.chdir(self.http_cache_folder)
+        try:
+            async with AsyncRSSReader() as rss_reader:
+                with patch('src.http_client.get', return_value=response):
+                    await rss_reader.get_feed("https://example.com/rss")
+            # the cache is disabled by default, so nothing is written to the working folder
+            self.assertEqual(os.listdir(self.http_cache_folder), [])
+            with patch('src.http_client.get', return_value=response):
+                await self.rss_reader.get_feed("https://example.com/rss")
+        finally:
+            os.chdir(current_folder)
+        self.assertEqual(len(os.listdir(os.path.join(self.http_cache_folder, 'http_cache'))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.date_index import DateIndex
+from src.file_processing_utilities import search_and_print_news
+from src.news_archive import append_posts
+from src.news_query import NewsQuery
+from src.news_storage import NewsStorage
+from tests.test_news_storage import get_test_data
+
+
+class TestDateIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.news_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.news_folder)
+
+    def append_test_posts(self, file_name: str, title: str = "Test feed", dates=("20220905", "20220906")) -> list:
+        data = get_test_data(title, dates)
+        append_posts(os.path.join(self.news_folder, file_name), data, data.posts)
+        return data.posts
+
+    def test_rebuild_from_archive(self):
+        self.append_test_posts("Test_feed-20220906.jsonl")
+        self.append_test_posts("Other_feed-20220906.bin", "Other feed")
+        self.append_test_posts("Third_feed-20220906.jsonl.gz", "Third feed")
+        with DateIndex(self.news_folder) as date_index:
+            found = list(date_index.find_posts_by_date("20220906"))
+        with NewsStorage(self.news_folder) as storage:
+            self.assertCountEqual(found, list(storage.find_posts_by_date("20220906")))
+        self.assertEqual(len(found), 3)
+
+    def test_update_file_reads_appended_posts(self):
+        first_posts = self.append_test_posts("Test_feed-20220906.jsonl")
+        with DateIndex(self.news_folder) as date_index:
+            second_posts = self.append_test_posts("Test_feed-20220906.jsonl", dates=("20220907", "20220906"))
+            self.assertEqual(date_index.update_file(os.path.join(self.news_folder, "Test_feed-20220906.jsonl")), 2)
+            found = [post for feed_title, post in date_index.find_posts_by_date("20220906")]
+        self.assertEqual(found, [first_posts[1], second_posts[1]])
+
+    def test_concurrent_indexes_keep_file_ids(self):
+        first_posts = self.append_test_posts("Test_feed-20220906.jsonl")
+        with DateIndex(self.news_folder) as first_index, DateIndex(self.news_folder) as second_index:
+            second_posts = self.append_test_posts("Other_feed-20220906.jsonl", "Other feed")
+            first_index.update_file(os.path.join(self.news_folder, "Other_feed-20220906.jsonl"))
+            third_posts = self.append_test_posts("Third_feed-20220906.jsonl", "Third feed")
+            # the second index reads the catalog saved by the first one before assigning the file id
+            self.assertEqual(second_index.update_file(os.path.join(self.news_folder, "Third_feed-20220906.jsonl")), 2)
+        with DateIndex(self.news_folder) as date_index:
+            found = [post for feed_title, post in date_index.find_posts_by_date("20220906")]
+        self.assertCountEqual(found, [first_posts[1], second_posts[1], third_posts[1]])
+
+    def test_merge_pending_records(self):
+        with DateIndex(self.news_folder) as date_index:
+            date_index.merge_threshold = 1
+            posts = self.append_test_posts("Test_feed-20220906.jsonl")
+            date_index.update()
+        self.assertFalse(os.path.exists(os.path.join(self.news_folder, DateIndex.pending_file_name)))
+        with DateIndex(self.news_folder) as date_index:
+            self.assertEqual(list(date_index.find_posts_by_date("20220905")), [("Test feed", posts[0])])
+            self.assertEqual(list(date_index.find_posts_by_date("20200101")), [])
+
+    def test_partial_line_not_indexed(self):
+        posts = self.append_test_posts("Test_feed-20220906.jsonl")
+        with open(os.path.join(self.news_folder, "Test_feed-20220906.jsonl"), 'a', encoding='utf-8') as f:
+            f.write('{"title": "Partial", "date": "20220905"')
+        with DateIndex(self.news_folder) as date_index:
+            self.assertEqual(list(date_index.find_posts_by_date("20220905")), [("Test feed", posts[0])])
+
+    def test_search_and_print_news(self):
+        self.append_test_posts("Test_feed-20220906.jsonl")
+        with patch('sys.stdout', new=StringIO()) as mock_out:
+            search_and_print_news(self.news_folder, NewsQuery("20220905", "20220905"), 'mmap')
+        self.assertIn("Feed: Test feed", mock_out.getvalue())
+        self.assertIn("title Post 20220905", mock_out.getvalue())
+        self.assertNotIn("Post 20220906", mock_out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.fast_feed_parser import parse_feed
+from src.metrics import MetricsRecorder
+from src.rss_reader_impl import RSSReader
+from tests.test_rss_reader_impl import TEST_FEED, get_test_response
+
+TEST_ATOM_FEED = b'''<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Test Atom feed</title>
+    <link rel="self" href="/atom"/>
+    <link href="/news"/>
+    <id>urn:uuid:60a76c80-d399-11d9-b93c-0003939e0af6</id>
+    <entry>
+        <title type="html">First &amp;lt;post&amp;gt;</title>
+        <link rel="enclosure" href="/images/1.jpg" type="image/jpeg"/>
+        <link href="news/1"/>
+        <id>urn:uuid:1225c695-cfb8-4ebb-aaaa-80da344efa6a</id>
+        <published>2022-09-05T23:30:00-03:00</published>
+    </entry>
+    <entry>
+        <title>Second post</title>
+        <link href="https://example.com/news/2"/>
+        <published>2022-09-05T10:00:00Z</published>
+    </entry>
+</feed>'''
+
+
+class TestFastFeedParser(TestCase):
+
+    def setUp(self) -> None:
+        self.feedparser_reader = RSSReader("https://example.com/rss")
+        self.fast_reader = RSSReader("https://example.com/rss", parser='fast')
+
+    def assert_same_as_feedparser(self, content: bytes, url: str = "https://example.com/rss") -> None:
+        """
+        Check the fast parser gets the same posts and de-duplication keys as feedparser
+
+        :param bytes content: the feed
+        :param str url: the feed URL
+        :return: None
+        """
+        response = get_test_response(url)
+        response.content = content
+        feedparser_feed = self.feedparser_reader._parse_feed(response, url)
+        fast_feed = parse_feed(content, url)
+        self.assertIsNotNone(fast_feed)
+        self.assertEqual(self.fast_reader._get_posts_details(fast_feed),
+                         self.feedparser_reader._get_posts_details(feedparser_feed))
+        self.assertEqual([self.fast_reader._get_post_key(entry) for entry in fast_feed.entries],
+                         [self.feedparser_reader._get_post_key(entry) for entry in feedparser_feed.entries])
+
+    def test_rss_feed(self):
+        self.assert_same_as_feedparser(TEST_FEED)
+
+    def test_rss_feed_with_enclosures_and_relative_links(self):
+        content = TEST_FEED.replace(b'<link>https://example.com/news/1</link>',
+                                    b'<link>news/1</link><enclosure url="/images/1.jpg" type="image/jpeg"/>')
+        self.assert_same_as_feedparser(content.replace(b'GMT', b'+0300'), "https://example.com/feeds/rss")
+
+    def test_atom_feed(self):
+        content = TEST_ATOM_FEED.replace(b'First &amp;lt;post&amp;gt;', b'First post')
+        self.assert_same_as_feedparser(content, "https://example.com/feeds/atom")
+
+    def test_unsupported_feeds(self):
+        for content in (TEST_FEED.replace(b'First post', b'First&nbsp;post'),
+                        TEST_FEED.replace(b'</channel>', b''),
+                        TEST_FEED.replace(b'<rss version="2.0">', b'<rss version="2.0" xml:base="/news/">'),
+                        TEST_FEED.replace(b' GMT', b''),
+                        TEST_ATOM_FEED,
+                        b'<html><body>Not a feed</body></html>'):
+            self.assertIsNone(parse_feed(content, "https://example.com/rss"))
+
+    def test_reader_falls_back_to_feedparser(self):
+        metrics = MetricsRecorder()
+        reader = RSSReader("https://example.com/rss", parser='fast', metrics=metrics)
+        response = get_test_response()
+        response.content = TEST_FEED.replace(b'First post', b'First&nbsp;post')
+        with patch('src.http_client.get', return_value=response):
+            data = reader._get_posts_details(reader._get_feed(reader._rss_feed_url))
+        self.assertEqual(data.posts[0].title, "First\xa0post")
+        self.assertEqual(metrics.get_stats()['counters'], {'fast_parser_fallbacks': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import unittest
+from unittest import TestCase
+
+from src.feed_scheduler import FeedScheduler
+
+
+class TestFeedScheduler(TestCase):
+
+    def setUp(self) -> None:
+        self.now = 1000.0
+        self.scheduler = FeedScheduler(jitter=0, max_backoff=100, clock=lambda: self.now)
+
+    def test_new_feeds_due_immediately_in_order(self):
+        self.scheduler.add_feed("a", 10)
+        self.scheduler.add_feed("b", 20)
+        self.assertEqual(self.scheduler.pop_feed(), (1000.0, "a"))
+        self.assertEqual(self.scheduler.pop_feed(), (1000.0, "b"))
+
+    def test_per_feed_intervals(self):
+        self.scheduler.add_feed("a", 30)
+        self.scheduler.add_feed("b", 10)
+        for _ in range(2):
+            self.scheduler.reschedule_feed(self.scheduler.pop_feed()[1])
+        self.assertEqual(self.scheduler.pop_feed(), (1010.0, "b"))
+        self.assertEqual(self.scheduler.pop_feed(), (1030.0, "a"))
+
+    def test_exponential_backoff(self):
+        self.scheduler.add_feed("a", 10)
+        self.scheduler.pop_feed()
+        delays = []
+        for _ in range(4):
+            delays.append(self.scheduler.reschedule_feed("a", is_failed=True))
+            self.scheduler.pop_feed()
+        self.assertEqual(delays, [20, 40, 80, 100])
+        self.assertEqual(self.scheduler.reschedule_feed("a"), 10)
+
+    def test_jitter(self):
+        scheduler = FeedScheduler(jitter=0.1, clock=lambda: self.now)
+        scheduler.add_feed("a", 100)
+        scheduler.pop_feed()
+        for _ in range(20):
+            self.assertTrue(90 <= scheduler.reschedule_feed("a") <= 110)
+            scheduler.pop_feed()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,9 @@ import os
 import shutil
 import unittest
 from unittest import TestCase
-from src.file_processing_utilities import is_file_exists, is_dir_exists, create_news_folder
+from src.file_processing_utilities import is_file_exists, is_dir_exists, create_news_folder, read_feeds_file, \
+    append_json_lines_to_file, read_news_file, read_feed_intervals
+from src.models import Feed, Post
 
 
 class TestFileProcessingUtilities(TestCase):
@@ -32,6 +34,38 @@ class TestFileProcessingUtilities(TestCase):
         create_news_folder(expected_dir_path)
         self.assertTrue(os.path.isdir(expected_dir_path))
 
+    def test_create_existing_news_folder(self):
+        create_news_folder(self.test_directory_name)
+        self.assertTrue(os.path.isdir(self.test_directory_name))
+
+    def test_read_feeds_file(self):
+        feeds_file = os.path.join(self.test_directory_name, "feeds.txt")
+        with open(feeds_file, 'w') as fp:
+            fp.write("https://example.com/rss\n\n# comment\n  https://example.org/feed  600\n")
+        self.assertEqual(read_feeds_file(feeds_file), ["https://example.com/rss", "https://example.org/feed"])
+        self.assertEqual(read_feed_intervals(feeds_file), {"https://example.org/feed": 600})
+
+    def test_read_feeds_file_with_invalid_interval(self):
+        feeds_file = os.path.join(self.test_directory_name, "feeds.txt")
+        for interval in ("0", "-5", "nan", "inf"):
+            with open(feeds_file, 'w') as fp:
+                fp.write("https://example.com/rss\nhttps://example.org/feed " + interval + "\n")
+            with self.assertRaisesRegex(ValueError, "line 2"):
+                read_feed_intervals(feeds_file)
+            with self.assertRaises(ValueError):
+                read_feeds_file(feeds_file)
+
+    def test_append_and_read_json_lines(self):
+        news_file_name = os.path.join(self.test_directory_name, "news.jsonl")
+        posts = [Post("Post " + str(i), "20220905", str(i)) for i in range(3)]
+        data = Feed("Test feed", "https://example.com", posts)
+        append_json_lines_to_file(news_file_name, data, posts[:2])
+        append_json_lines_to_file(news_file_name, data, posts[2:])
+        with open(news_file_name, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 4)
+        with open(news_file_name, 'r', encoding='utf-8') as f:
+            self.assertEqual(read_news_file(f), data)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,12 +2,16 @@
 #  mail: snooki17@gmail.com
 #  Licensed under the MIT License
 #  Copyright (c) 2022.
+import os
 import shutil
+import tempfile
 import unittest
 from unittest import TestCase
+from unittest.mock import patch
 
 from src import file_processing_utilities
 from src.html_processor import save_data_to_html
+from src.models import Feed, Post
 from src.rss_reader_impl import RSSReader
 
 
@@ -26,5 +30,53 @@ class TestHTMLProcessor(TestCase):
         self.assertTrue(file_processing_utilities.is_file_exists(file_name))
 
 
+class TestHTMLProcessorOffline(TestCase):
+
+    def setUp(self) -> None:
+        self.news_html_folder = tempfile.mkdtemp()
+        self.data = Feed("Test & feed", "https://example.com/?a=1&b=2",
+                         [Post("<b>Post " + str(i) + "</b>", "20220905", "https://example.com/" + str(i) + '"',
+                               ("https://example.com/" + str(i) + ".jpg",)) for i in range(5)])
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.news_html_folder)
+
+    def test_save_data_to_html_escaped(self):
+        with patch('src.html_processor.news_html_folder', self.news_html_folder):
+            save_data_to_html(self.data, 0)
+        file_name = file_processing_utilities.get_file_name(self.news_html_folder, self.data, '.html')
+        with open(file_name, 'r', encoding='utf-8') as f:
+            html = f.read()
+        self.assertIn('<h1>Test &amp; feed</h1>', html)
+        self.assertIn('<h3>&lt;b&gt;Post 4&lt;/b&gt;</h3>', html)
+        self.assertIn('<a href="https://example.com/4&quot;">', html)
+        self.assertIn('<img src="https://example.com/4.jpg">', html)
+        self.assertNotIn('Post 0</b>', html)
+
+    def test_save_data_to_html_with_limit(self):
+        with patch('src.html_processor.news_html_folder', self.news_html_folder):
+            save_data_to_html(self.data, 2)
+        file_name = file_processing_utilities.get_file_name(self.news_html_folder, self.data, '.html')
+        with open(file_name, 'r', encoding='utf-8') as f:
+            html = f.read()
+        self.assertIn('Post 1', html)
+        self.assertNotIn('Post 2', html)
+
+    def test_save_data_to_html_paginated(self):
+        with patch('src.html_processor.news_html_folder', self.news_html_folder):
+            save_data_to_html(self.data, 0, 2)
+        self.assertEqual(len(os.listdir(self.news_html_folder)), 4)
+        file_name = file_processing_utilities.get_file_name(self.news_html_folder, self.data, '.html')
+        with open(file_name, 'r', encoding='utf-8') as f:
+            index_html = f.read()
+        last_page_name = os.path.basename(file_name)[:-len('.html')] + '-3.html'
+        self.assertIn('<a href="' + last_page_name + '">', index_html)
+        with open(os.path.join(self.news_html_folder, last_page_name), 'r', encoding='utf-8') as f:
+            last_page_html = f.read()
+        self.assertIn('Post 4', last_page_html)
+        self.assertIn('>Previous</a>', last_page_html)
+        self.assertNotIn('>Next</a>', last_page_html)
+
+
 if __name__ == '__main__':
     unittest.main()
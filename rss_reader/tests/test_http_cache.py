@@ -0,0 +1,75 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from src.http_cache import read_cache_entry, write_cache_entry, get_conditional_headers, get_cache_file_name
+from src.models import Feed, Post
+
+
+class TestHTTPCache(TestCase):
+    test_url = "https://example.com/rss"
+    test_data = Feed("Test feed", "https://example.com", [])
+
+    def setUp(self) -> None:
+        self.cache_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_folder)
+
+    def test_read_missing_entry(self):
+        self.assertIsNone(read_cache_entry(self.cache_folder, self.test_url))
+
+    def test_write_and_read_entry(self):
+        write_cache_entry(self.cache_folder, self.test_url, '"abc"', "Mon, 05 Sep 2022 10:00:00 GMT", self.test_data)
+        entry = read_cache_entry(self.cache_folder, self.test_url)
+        self.assertEqual(entry['etag'], '"abc"')
+        self.assertEqual(entry['data'], self.test_data)
+
+    def test_entry_without_validators_not_saved(self):
+        write_cache_entry(self.cache_folder, self.test_url, None, None, self.test_data)
+        self.assertIsNone(read_cache_entry(self.cache_folder, self.test_url))
+
+    def test_read_entry_with_limit(self):
+        data = Feed("Test feed", "https://example.com", [Post(str(i), "20220905", str(i)) for i in range(3)])
+        write_cache_entry(self.cache_folder, self.test_url, '"abc"', None, data)
+        self.assertEqual(read_cache_entry(self.cache_folder, self.test_url, 2)['data'].posts, data.posts[:2])
+
+    def test_read_limited_entry(self):
+        data = Feed("Test feed", "https://example.com", [Post(str(i), "20220905", str(i)) for i in range(3)])
+        write_cache_entry(self.cache_folder, self.test_url, '"abc"', None, data, 3)
+        self.assertIsNone(read_cache_entry(self.cache_folder, self.test_url))
+        self.assertIsNone(read_cache_entry(self.cache_folder, self.test_url, 4))
+        self.assertEqual(len(read_cache_entry(self.cache_folder, self.test_url, 3)['data'].posts), 3)
+
+    def test_concurrent_writes_of_same_url(self):
+        feeds = [Feed("Test feed " + str(i), "https://example.com", [Post("Post", "20220905", "https://example.com/1")])
+                 for i in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda data: write_cache_entry(self.cache_folder, self.test_url, '"abc"', None, data),
+                              feeds))
+        self.assertIn(read_cache_entry(self.cache_folder, self.test_url)['data'], feeds)
+        self.assertEqual(os.listdir(self.cache_folder), [os.path.basename(get_cache_file_name(self.cache_folder,
+                                                                                              self.test_url))])
+
+    def test_cache_file_name_per_url(self):
+        self.assertNotEqual(get_cache_file_name(self.cache_folder, self.test_url),
+                            get_cache_file_name(self.cache_folder, self.test_url + "2"))
+
+    def test_conditional_headers(self):
+        entry = {'etag': '"abc"', 'last_modified': "Mon, 05 Sep 2022 10:00:00 GMT"}
+        self.assertEqual(get_conditional_headers(entry), {'If-None-Match': '"abc"',
+                                                          'If-Modified-Since': "Mon, 05 Sep 2022 10:00:00 GMT"})
+
+    def test_no_conditional_headers(self):
+        self.assertEqual(get_conditional_headers(None), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import gzip
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from unittest import TestCase
+from unittest.mock import patch
+
+from src import http_client
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address, self.headers.get('Accept-Encoding')))
+        if self.path == '/unavailable' and self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = gzip.compress(b'feed')
+        self.send_response(200)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPClient(TestCase):
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+        self.server.requests = []
+        self.server.failures = 0
+        self.url = 'http://127.0.0.1:' + str(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_shared_session(self):
+        self.assertIs(http_client.get_session(), http_client.get_session())
+
+    def test_connection_reused(self):
+        session = http_client.create_session()
+        for _ in range(3):
+            self.assertEqual(session.get(self.url + '/feed', timeout=5).content, b'feed')
+        self.assertEqual(len({client_address for path, client_address, encoding in self.server.requests}), 1)
+
+    def test_compression_accepted(self):
+        http_client.create_session().get(self.url + '/feed', timeout=5)
+        self.assertIn('gzip', self.server.requests[0][2])
+
+    def test_retry_unavailable_server(self):
+        self.server.failures = 2
+        with patch('src.http_client.backoff_factor', 0):
+            response = http_client.create_session().get(self.url + '/unavailable', timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_default_timeouts(self):
+        with patch.object(http_client.get_session(), 'get') as mock_get:
+            http_client.get(self.url)
+        self.assertEqual(mock_get.call_args.kwargs['timeout'], (http_client.connect_timeout, http_client.read_timeout))
+
+
+if __name__ == '__main__':
+    unittest.main()
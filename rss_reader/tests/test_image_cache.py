@@ -0,0 +1,88 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from src.image_cache import get_image, prefetch_images, evict_images
+
+
+def get_image_response(url, **kwargs):
+    """
+    Build a fake HTTP response with the image content equal to the URL
+
+    :param str url: the requested URL
+    :return: a response mock
+    """
+    if url.endswith("missing.jpg"):
+        raise requests.exceptions.ConnectionError
+    response = MagicMock()
+    response.content = url.encode()
+    return response
+
+
+class TestImageCache(TestCase):
+
+    def setUp(self) -> None:
+        self.cache_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_folder)
+
+    def test_get_cached_image(self):
+        with patch('src.http_client.get', side_effect=get_image_response) as mock_get:
+            self.assertEqual(get_image("https://example.com/1.jpg", self.cache_folder), b"https://example.com/1.jpg")
+            self.assertEqual(get_image("https://example.com/1.jpg", self.cache_folder), b"https://example.com/1.jpg")
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_same_image_saved_once(self):
+        with patch('src.http_client.get', return_value=MagicMock(content=b"image")):
+            get_image("https://example.com/1.jpg", self.cache_folder)
+            get_image("https://example.org/1.jpg", self.cache_folder)
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_folder, 'images'))), 1)
+
+    def test_prefetch_same_image_of_many_urls(self):
+        urls = ["https://example.com/" + str(i) + ".jpg" for i in range(32)]
+        with patch('src.http_client.get', return_value=MagicMock(content=b"image")):
+            images = prefetch_images(urls, self.cache_folder)
+        self.assertEqual(set(images.values()), {b"image"})
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_folder, 'images'))), 1)
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_folder, 'urls'))), len(urls))
+
+    def test_prefetch_images(self):
+        urls = ["https://example.com/" + str(i) + ".jpg" for i in range(5)] + ["https://example.com/missing.jpg"]
+        with patch('src.http_client.get', side_effect=get_image_response) as mock_get:
+            images = prefetch_images(urls + urls[:2], self.cache_folder)
+        self.assertEqual(mock_get.call_count, len(urls))
+        self.assertIsNone(images["https://example.com/missing.jpg"])
+        self.assertEqual(images[urls[0]], urls[0].encode())
+
+    def test_evict_least_recently_used_images(self):
+        urls = ["https://example.com/" + str(i) + ".jpg" for i in range(3)]
+        with patch('src.http_client.get', side_effect=get_image_response):
+            for url in urls:
+                get_image(url, self.cache_folder)
+            images_folder = os.path.join(self.cache_folder, 'images')
+            for name in os.listdir(images_folder):
+                os.utime(os.path.join(images_folder, name), (time.time() - 100, time.time() - 100))
+            # the first image becomes the most recently used one
+            get_image(urls[0], self.cache_folder)
+            self.assertEqual(evict_images(self.cache_folder, len(urls[0]) * 2), 1)
+            self.assertEqual(len(os.listdir(os.path.join(self.cache_folder, 'urls'))), 2)
+        with patch('src.http_client.get', side_effect=get_image_response) as mock_get:
+            get_image(urls[0], self.cache_folder)
+            get_image(urls[2], self.cache_folder)
+            get_image(urls[1], self.cache_folder)
+        self.assertEqual(mock_get.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
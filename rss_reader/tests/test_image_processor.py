@@ -0,0 +1,69 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.image_processor import get_target_width, downscale_image, get_processed_image
+
+
+def get_test_image(width: int, height: int) -> bytes:
+    """
+    Build a noisy JPEG image which compresses badly at high quality
+
+    :param int width: the image width
+    :param int height: the image height
+    :return: the image content
+    """
+    image = Image.effect_noise((width, height), 64).convert('RGB')
+    content = io.BytesIO()
+    image.save(content, 'JPEG', quality=95)
+    return content.getvalue()
+
+
+class TestImageProcessor(TestCase):
+
+    def setUp(self) -> None:
+        self.cache_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_folder)
+
+    def test_get_target_width(self):
+        self.assertEqual(get_target_width(25.4, 150), 150)
+        self.assertEqual(get_target_width(63.3, 96), 239)
+
+    def test_downscale_image(self):
+        content = get_test_image(1200, 600)
+        processed = downscale_image(content, 300, 70)
+        self.assertLess(len(processed), len(content))
+        with Image.open(io.BytesIO(processed)) as image:
+            self.assertEqual(image.size, (300, 150))
+
+    def test_small_image_not_upscaled(self):
+        content = get_test_image(100, 50)
+        with Image.open(io.BytesIO(downscale_image(content, 300, 70))) as image:
+            self.assertEqual(image.size, (100, 50))
+
+    def test_processed_image_cached(self):
+        content = get_test_image(1200, 600)
+        processed = get_processed_image(content, 63.3, 96, 70, self.cache_folder)
+        with patch('src.image_processor.downscale_image') as mock_downscale:
+            self.assertEqual(get_processed_image(content, 63.3, 96, 70, self.cache_folder), processed)
+        mock_downscale.assert_not_called()
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_folder, 'processed'))), 1)
+
+    def test_broken_image_not_processed(self):
+        self.assertEqual(get_processed_image(b"not an image", 63.3, 96, 70, self.cache_folder), b"not an image")
+
+
+if __name__ == '__main__':
+    unittest.main()
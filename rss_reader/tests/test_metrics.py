@@ -0,0 +1,100 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.metrics import MetricsRecorder, JSONStatsSink, PrometheusFileSink, null_metrics
+from src.rss_reader_impl import RSSReader
+from tests.test_rss_reader_impl import get_test_response
+
+
+class TestMetrics(TestCase):
+
+    def setUp(self) -> None:
+        self.temp_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_folder)
+
+    def test_null_metrics(self):
+        with null_metrics.time('fetch', "https://example.com/rss"):
+            null_metrics.count('posts', 2, "https://example.com/rss")
+        null_metrics.close()
+
+    def test_stats(self):
+        metrics = MetricsRecorder()
+        for url in ("https://example.com/1", "https://example.com/2", "https://example.com/2"):
+            with metrics.time('fetch', url):
+                metrics.count('posts', 2, url)
+        with metrics.time('search'):
+            metrics.count('dedup_drops')
+        stats = metrics.get_stats()
+        self.assertEqual(stats['stages']['fetch']['count'], 3)
+        self.assertEqual(stats['stages']['search']['count'], 1)
+        self.assertEqual(stats['counters'], {'dedup_drops': 1, 'posts': 6})
+        self.assertEqual(list(stats['feeds']), ["https://example.com/1", "https://example.com/2"])
+        self.assertEqual(stats['feeds']["https://example.com/2"]['stages']['fetch']['count'], 2)
+        self.assertEqual(stats['feeds']["https://example.com/2"]['counters'], {'posts': 4})
+
+    def test_timer_records_failed_stage(self):
+        metrics = MetricsRecorder()
+        with self.assertRaises(ValueError):
+            with metrics.time('parse'):
+                raise ValueError
+        self.assertEqual(metrics.get_stats()['stages']['parse']['count'], 1)
+
+    def test_json_stats_sink(self):
+        file_name = os.path.join(self.temp_folder, 'stats.json')
+        metrics = MetricsRecorder([JSONStatsSink(file_name)])
+        metrics.count('posts', 3, "https://example.com/rss")
+        metrics.close()
+        with open(file_name, encoding='utf-8') as file:
+            self.assertEqual(json.load(file)['counters'], {'posts': 3})
+
+    def test_prometheus_file_sink(self):
+        file_name = os.path.join(self.temp_folder, 'rss_reader.prom')
+        metrics = MetricsRecorder([PrometheusFileSink(file_name)])
+        metrics.add_time('fetch', 0.5, 'https://example.com/rss?a="b"')
+        metrics.count('posts', 3, "https://example.com/rss")
+        metrics.count('dedup_drops')
+        metrics.close()
+        with open(file_name, encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        self.assertIn('rss_reader_stage_seconds_sum{stage="fetch",feed="https://example.com/rss?a=\\"b\\""} 0.5',
+                      lines)
+        self.assertIn('rss_reader_stage_seconds_count{stage="fetch",feed="https://example.com/rss?a=\\"b\\""} 1',
+                      lines)
+        self.assertIn('# TYPE rss_reader_posts_total counter', lines)
+        self.assertIn('rss_reader_posts_total{feed="https://example.com/rss"} 3', lines)
+        self.assertIn('rss_reader_dedup_drops_total 1', lines)
+        self.assertFalse(os.path.exists(file_name + '.tmp'))
+
+    def test_reader_metrics(self):
+        metrics = MetricsRecorder()
+        rss_reader = RSSReader("https://example.com/rss", date=None, metrics=metrics)
+        rss_reader._news_folder = os.path.join(self.temp_folder, 'news_json')
+        rss_reader._http_cache_folder = os.path.join(self.temp_folder, 'http_cache')
+        response = get_test_response()
+        # the first post is duplicated, so a post is dropped by de-duplication
+        first_post = response.content[response.content.index(b'<item>'):response.content.index(b'</item>') + 7]
+        response.content = response.content.replace(b'</channel>', first_post + b'</channel>')
+        with patch('src.http_client.get', return_value=response), patch('sys.stdout', new=StringIO()):
+            rss_reader.show_rss()
+        feed_stats = metrics.get_stats()['feeds']["https://example.com/rss"]
+        self.assertEqual(list(feed_stats['stages']), ['cache_write', 'extract', 'fetch', 'parse'])
+        self.assertEqual(feed_stats['counters']['posts'], 2)
+        self.assertEqual(feed_stats['counters']['bytes_fetched'], len(response.content))
+        self.assertEqual(feed_stats['counters']['new_posts'], 2)
+        self.assertEqual(feed_stats['counters']['dedup_drops'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import unittest
+from unittest import TestCase
+
+from src.models import Feed, Post
+
+
+class TestModels(TestCase):
+    test_dict = {"Blog title": "Test feed", "Blog link": "https://example.com",
+                 "posts": [{"title": "Post", "date": "20220905", "link": "https://example.com/1",
+                            "links": ["https://example.com/1", "https://example.com/1.jpg"]}]}
+
+    def test_feed_from_dict(self):
+        feed = Feed.from_dict(self.test_dict)
+        self.assertEqual(feed.title, "Test feed")
+        self.assertEqual(feed.posts[0].links, ("https://example.com/1", "https://example.com/1.jpg"))
+
+    def test_feed_to_dict(self):
+        self.assertEqual(Feed.from_dict(self.test_dict).to_dict(), self.test_dict)
+
+    def test_post_has_no_dict(self):
+        self.assertFalse(hasattr(Post("Post", "20220905", "https://example.com/1"), '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+
+from src.news_archive import archive_formats, append_posts, read_news_file, gen_news_files
+from src.news_storage import NewsStorage
+from tests.test_news_storage import get_test_data
+
+
+class TestNewsArchive(TestCase):
+
+    def setUp(self) -> None:
+        self.news_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.news_folder)
+
+    def get_file_name(self, cache_format: str) -> str:
+        return os.path.join(self.news_folder, "Test_feed" + archive_formats[cache_format])
+
+    def test_append_and_read_all_formats(self):
+        data = get_test_data(dates=("20220905", "20220906", "20220907"))
+        for cache_format in archive_formats:
+            file_name = self.get_file_name(cache_format)
+            append_posts(file_name, data, data.posts[:1])
+            append_posts(file_name, data, data.posts[1:])
+            self.assertEqual(read_news_file(file_name), data)
+            self.assertEqual(read_news_file(file_name, ("20220906", "20220906")).posts, data.posts[1:2])
+
+    def test_binary_blocks_skipped_by_date(self):
+        data = get_test_data(dates=("20220905", "20220906"))
+        file_name = self.get_file_name('bin')
+        append_posts(file_name, data, data.posts[:1])
+        block_start = os.path.getsize(file_name)
+        append_posts(file_name, data, data.posts[1:])
+        with open(file_name, 'r+b') as f:
+            # break the payload of the second block, so it can be read only if it is skipped undecoded
+            f.seek(block_start + 24)
+            f.write(b'broken')
+        self.assertEqual(read_news_file(file_name, ("20220905", "20220905")).posts, data.posts[:1])
+        with self.assertRaises(ValueError):
+            read_news_file(file_name, ("20220906", "20220906"))
+
+    def test_compressed_formats_are_smaller(self):
+        data = get_test_data(dates=tuple("2022%02d%02d" % (month, day) for month in range(1, 13)
+                                         for day in range(1, 29)))
+        file_sizes = {}
+        for cache_format in archive_formats:
+            append_posts(self.get_file_name(cache_format), data, data.posts)
+            file_sizes[cache_format] = os.path.getsize(self.get_file_name(cache_format))
+        self.assertLess(file_sizes['jsonl.gz'], file_sizes['jsonl'] / 4)
+        self.assertLess(file_sizes['bin'], file_sizes['jsonl'] / 4)
+
+    def test_broken_binary_file(self):
+        with open(self.get_file_name('bin'), 'wb') as f:
+            f.write(b'{}')
+        with self.assertRaises(ValueError):
+            read_news_file(self.get_file_name('bin'))
+
+    def test_storage_imports_all_formats(self):
+        for cache_format, title in zip(archive_formats, ("First", "Second", "Third")):
+            data = get_test_data(title)
+            append_posts(os.path.join(self.news_folder, title + archive_formats[cache_format]), data, data.posts)
+        self.assertEqual(len(list(gen_news_files(self.news_folder))), 3)
+        with NewsStorage(self.news_folder) as storage:
+            found = list(storage.find_posts_by_date("20220905"))
+        self.assertEqual(sorted(feed_title for feed_title, post in found), ["First", "Second", "Third"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.date_index import DateIndex
+from src.news_archive import append_posts
+from src.news_query import NewsQuery
+from src.news_storage import NewsStorage
+from src.rss_reader_errors import InvalidNewsDateError
+from src.rss_reader_impl import RSSReader
+from tests.test_news_storage import get_test_data
+
+TEST_DATES = ("20220904", "20220905", "20220906", "20220907")
+
+
+class TestNewsQuery(TestCase):
+
+    def setUp(self) -> None:
+        self.news_folder = tempfile.mkdtemp()
+        for title, file_extension in (("Test feed", '.jsonl'), ("Other feed", '.bin')):
+            data = get_test_data(title, TEST_DATES)
+            append_posts(os.path.join(self.news_folder, title.replace(' ', '_') + file_extension), data, data.posts)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.news_folder)
+
+    def find_posts(self, query: NewsQuery) -> dict:
+        """
+        Find the posts with every news index backend
+
+        :param NewsQuery query: the news query
+        :return: a dictionary of the backend name and the found (feed title, post date) pairs
+        """
+        with NewsStorage(self.news_folder) as storage:
+            storage_posts = [(feed_title, post.date) for feed_title, post in storage.find_posts(query)]
+        with DateIndex(self.news_folder) as date_index:
+            index_posts = [(feed_title, post.date) for feed_title, post in date_index.find_posts(query)]
+        return {'sqlite': storage_posts, 'mmap': index_posts}
+
+    def test_date_range(self):
+        for backend, found in self.find_posts(NewsQuery("20220905", "20220906")).items():
+            self.assertCountEqual(found, [("Test feed", "20220905"), ("Test feed", "20220906"),
+                                          ("Other feed", "20220905"), ("Other feed", "20220906")], backend)
+
+    def test_open_date_range(self):
+        for backend, found in self.find_posts(NewsQuery(date_from="20220907")).items():
+            self.assertCountEqual(found, [("Test feed", "20220907"), ("Other feed", "20220907")], backend)
+
+    def test_feed_title_and_text(self):
+        query = NewsQuery(date_to="20220906", feed_title="other", text="POST 2022090")
+        for backend, found in self.find_posts(query).items():
+            self.assertEqual(found, [("Other feed", "20220904"), ("Other feed", "20220905"),
+                                     ("Other feed", "20220906")], backend)
+
+    def test_limit(self):
+        for backend, found in self.find_posts(NewsQuery(feed_title="Test", limit=2)).items():
+            self.assertEqual(found, [("Test feed", "20220904"), ("Test feed", "20220905")], backend)
+
+    def test_validate(self):
+        NewsQuery("20220905", "20220906").validate()
+        for query in (NewsQuery("20220906", "20220905"), NewsQuery(date_to="2022-09-05")):
+            with self.assertRaises(InvalidNewsDateError):
+                query.validate()
+
+    def test_search_with_reader(self):
+        rss_reader = RSSReader(limit=1, news_query=NewsQuery("20220905", "20220906", "Test"))
+        rss_reader._news_folder = self.news_folder
+        with patch('sys.stdout', new=StringIO()) as mock_out:
+            rss_reader._search_historical_data(None)
+        self.assertIn("title Post 20220905", mock_out.getvalue())
+        self.assertNotIn("Post 20220906", mock_out.getvalue())
+        self.assertNotIn("Other feed", mock_out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from src import news_archive
+from src.news_retention import RetentionPolicy, get_expired_files, compact_news_folder
+from src.news_storage import NewsStorage
+from src.rss_reader_impl import RSSReader
+from tests.test_news_storage import get_test_data
+
+
+class TestNewsRetention(TestCase):
+    today = datetime.date(2022, 9, 15)
+
+    def setUp(self) -> None:
+        self.news_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.news_folder)
+
+    def save_news_file(self, title: str, dates: tuple, extension='.jsonl', file_date: str = None) -> str:
+        """
+        Save the test feed to the archive file named by the date
+
+        :param str title: the feed title
+        :param tuple dates: the post dates
+        :param str extension: the archive file extension
+        :param str file_date: the date of the file name, the last post date by default
+        :return: the file name
+        """
+        data = get_test_data(title, dates)
+        file_name = os.path.join(self.news_folder, title.replace(' ', '_') + '-' + (file_date or dates[-1]) + extension)
+        news_archive.append_posts(file_name, data, data.posts)
+        return file_name
+
+    def test_empty_policy(self):
+        self.save_news_file("Test feed", ("20200101",))
+        self.assertTrue(RetentionPolicy().is_empty())
+        self.assertEqual(get_expired_files(self.news_folder, RetentionPolicy(), self.today), [])
+
+    def test_expired_by_age(self):
+        old_file = self.save_news_file("Test feed", ("20220901",))
+        self.save_news_file("Test feed", ("20220910",))
+        self.save_news_file("Other feed", ("20220912",))
+        self.assertEqual(get_expired_files(self.news_folder, RetentionPolicy(max_age_days=10), self.today), [old_file])
+
+    def test_monthly_file_expires_after_month_end(self):
+        monthly_file = self.save_news_file("Test feed", ("20220801", "20220830"), file_date="202208")
+        self.assertEqual(get_expired_files(self.news_folder, RetentionPolicy(max_age_days=20), self.today), [])
+        self.assertEqual(get_expired_files(self.news_folder, RetentionPolicy(max_age_days=10), self.today),
+                         [monthly_file])
+
+    def test_expired_by_files_per_feed(self):
+        old_files = [self.save_news_file("Test feed", (date,)) for date in ("20220901", "20220902")]
+        self.save_news_file("Test feed", ("20220903",))
+        self.save_news_file("Other feed", ("20220901",))
+        self.assertEqual(get_expired_files(self.news_folder, RetentionPolicy(max_files_per_feed=1), self.today),
+                         old_files)
+
+    def test_expired_by_bytes(self):
+        file_names = [self.save_news_file("Test feed", (date,)) for date in ("20220901", "20220902", "20220903")]
+        max_bytes = sum(os.path.getsize(file_name) for file_name in file_names[1:])
+        self.assertEqual(get_expired_files(self.news_folder, RetentionPolicy(max_bytes=max_bytes), self.today),
+                         file_names[:1])
+
+    def test_not_feed_files_are_kept(self):
+        for file_name in ('news.db', 'news.idx.json', 'feeds.txt'):
+            with open(os.path.join(self.news_folder, file_name), 'w') as file:
+                file.write('0' * 100)
+        self.assertEqual(get_expired_files(self.news_folder, RetentionPolicy(1, 1, 1), self.today), [])
+
+    def test_compact_news_folder(self):
+        daily_files = [self.save_news_file("Test feed", ("20220901", "20220902")),
+                       self.save_news_file("Test feed", ("20220902", "20220903"), '.jsonl.gz')]
+        today_file = self.save_news_file("Test feed", ("20220915",))
+        self.assertEqual(compact_news_folder(self.news_folder, 'bin', self.today), daily_files)
+        monthly_file = os.path.join(self.news_folder, 'Test_feed-202209.bin')
+        self.assertEqual(sorted(os.listdir(self.news_folder)), sorted(map(os.path.basename, (monthly_file,
+                                                                                             today_file))))
+        data = news_archive.read_news_file(monthly_file)
+        self.assertEqual(data.posts, get_test_data(dates=("20220901", "20220902", "20220903")).posts)
+
+    def test_compact_into_existing_monthly_file(self):
+        self.save_news_file("Test feed", ("20220901",), file_date="202209")
+        self.save_news_file("Test feed", ("20220901", "20220902"))
+        compact_news_folder(self.news_folder, 'jsonl', self.today)
+        self.assertEqual(os.listdir(self.news_folder), ['Test_feed-202209.jsonl'])
+        data = news_archive.read_news_file(os.path.join(self.news_folder, 'Test_feed-202209.jsonl'))
+        self.assertEqual([post.date for post in data.posts], ["20220901", "20220902"])
+
+    def test_compact_on_month_end(self):
+        month_dates = tuple("202210%02d" % day for day in range(1, 7))
+        self.save_news_file("Test feed", month_dates, file_date="202210")
+        daily_file = self.save_news_file("Test feed", ("20221007", "20221030"))
+        today_file = self.save_news_file("Test feed", ("20221031",))
+        self.assertEqual(compact_news_folder(self.news_folder, 'jsonl', datetime.date(2022, 10, 31)), [daily_file])
+        self.assertEqual(sorted(os.listdir(self.news_folder)), ['Test_feed-202210.jsonl', 'Test_feed-20221031.jsonl'])
+        data = news_archive.read_news_file(os.path.join(self.news_folder, 'Test_feed-202210.jsonl'))
+        self.assertEqual([post.date for post in data.posts], list(month_dates) + ["20221007", "20221030"])
+        self.assertTrue(os.path.exists(today_file))
+
+    def test_retention_removes_stored_posts(self):
+        old_file = self.save_news_file("Test feed", ("20200101",))
+        new_date = datetime.date.today().strftime('%Y%m%d')
+        self.save_news_file("Test feed", (new_date,))
+        with NewsStorage(self.news_folder) as storage:
+            storage.import_news_files()
+        rss_reader = RSSReader(retention_policy=RetentionPolicy(max_age_days=30))
+        rss_reader._news_folder = self.news_folder
+        with patch('src.pdf_processor.news_pdf_folder', os.path.join(self.news_folder, 'pdf')), \
+                patch('src.html_processor.news_html_folder', os.path.join(self.news_folder, 'html')):
+            rss_reader._maintain_news_folders()
+        self.assertFalse(os.path.exists(old_file))
+        with NewsStorage(self.news_folder) as storage:
+            self.assertEqual(list(storage.find_posts_by_date("20200101")), [])
+            self.assertEqual(len(list(storage.find_posts_by_date(new_date))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.file_processing_utilities import search_and_print_news
+from src.models import Feed, Post
+from src.news_query import NewsQuery
+from src.news_storage import NewsStorage
+from src.rss_reader_errors import NewsNotFoundError
+
+
+def get_test_data(title="Test feed", dates=("20220905", "20220906")):
+    """
+    Build an RSS feed with a post per date
+
+    :param str title: the feed title
+    :param dates: the post dates
+    :return: the RSS feed
+    """
+    return Feed(title, "https://example.com/" + title,
+                [Post("Post " + date, date, "https://example.com/" + title + "/" + date,
+                      ("https://example.com/" + title + "/" + date, "https://example.com/" + date + ".jpg"))
+                 for date in dates])
+
+
+class TestNewsStorage(TestCase):
+
+    def setUp(self) -> None:
+        self.news_folder = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.news_folder)
+
+    def test_add_posts(self):
+        with NewsStorage(self.news_folder) as storage:
+            self.assertEqual(len(storage.add_posts(get_test_data())), 2)
+
+    def test_add_saved_posts(self):
+        with NewsStorage(self.news_folder) as storage:
+            storage.add_posts(get_test_data(dates=("20220905",)))
+            new_posts = storage.add_posts(get_test_data())
+        self.assertEqual([post.date for post in new_posts], ["20220906"])
+
+    def test_find_posts_by_date(self):
+        with NewsStorage(self.news_folder) as storage:
+            storage.add_posts(get_test_data())
+            storage.add_posts(get_test_data("Other feed"))
+            found = list(storage.find_posts_by_date("20220906"))
+        self.assertEqual([feed_title for feed_title, post in found], ["Test feed", "Other feed"])
+        self.assertEqual(found[0][1], get_test_data().posts[1])
+
+    def test_find_posts_by_missing_date(self):
+        with NewsStorage(self.news_folder) as storage:
+            storage.add_posts(get_test_data())
+            self.assertEqual(list(storage.find_posts_by_date("20200101")), [])
+
+    def test_import_json_files_on_create(self):
+        with open(os.path.join(self.news_folder, "Test_feed-20220906.json"), 'w', encoding='utf-8') as f:
+            json.dump(get_test_data().to_dict(), f)
+        with open(os.path.join(self.news_folder, "broken.json"), 'w', encoding='utf-8') as f:
+            f.write("{")
+        with NewsStorage(self.news_folder) as storage:
+            self.assertEqual(len(list(storage.find_posts_by_date("20220905"))), 1)
+
+    def test_search_and_print_news(self):
+        with NewsStorage(self.news_folder) as storage:
+            storage.add_posts(get_test_data())
+        with patch('sys.stdout', new=StringIO()) as mock_out:
+            search_and_print_news(self.news_folder, NewsQuery("20220905", "20220905"))
+        self.assertIn("Feed: Test feed", mock_out.getvalue())
+        self.assertIn("title Post 20220905", mock_out.getvalue())
+        self.assertNotIn("Post 20220906", mock_out.getvalue())
+
+    def test_search_and_print_news_not_found(self):
+        with patch('sys.stdout', new=StringIO()):
+            with self.assertRaises(NewsNotFoundError):
+                search_and_print_news(self.news_folder, NewsQuery("20200101", "20200101"))
+
+    def test_full_text_search_ranked(self):
+        data = Feed("Test feed", "https://example.com",
+                    [Post("Weather report", "20220905", "https://example.com/ukraine-weather"),
+                     Post("Ukraine news", "20220906", "https://example.com/news"),
+                     Post("Other news", "20220906", "https://example.com/other")])
+        with NewsStorage(self.news_folder) as storage:
+            storage.add_posts(data)
+            found = [post.title for feed_title, post in storage.find_posts(NewsQuery(search="ukraine"))]
+            self.assertEqual(found, ["Ukraine news", "Weather report"])
+            found = [post.title for feed_title, post in storage.find_posts(NewsQuery("20220906", search="news"))]
+            self.assertCountEqual(found, ["Ukraine news", "Other news"])
+            self.assertEqual(list(storage.find_posts(NewsQuery(search='ukraine "weather OR'))), [])
+
+    def test_full_text_index_of_saved_posts(self):
+        with NewsStorage(self.news_folder) as storage:
+            storage.add_posts(get_test_data())
+            storage._connection.executescript('DROP TABLE posts_fts; DROP TRIGGER posts_fts_insert; '
+                                              'DROP TRIGGER posts_fts_delete;')
+        with NewsStorage(self.news_folder) as storage:
+            found = list(storage.find_posts(NewsQuery(search="20220905")))
+        self.assertEqual([post.date for feed_title, post in found], ["20220905"])
+
+    def test_search_and_print_news_full_text(self):
+        with NewsStorage(self.news_folder) as storage:
+            storage.add_posts(get_test_data())
+        with patch('sys.stdout', new=StringIO()) as mock_out:
+            search_and_print_news(self.news_folder, NewsQuery(search="post 20220906"), 'mmap')
+        self.assertIn("title Post 20220906", mock_out.getvalue())
+        self.assertNotIn("Post 20220905", mock_out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
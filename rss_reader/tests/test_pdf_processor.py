@@ -2,11 +2,19 @@
 #  mail: snooki17@gmail.com
 #  Licensed under the MIT License
 #  Copyright (c) 2022.
+import io
+import os
 import shutil
+import tempfile
 import unittest
+from io import StringIO
 from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from PIL import Image
 
 from src import file_processing_utilities
+from src.models import Feed, Post
 from src.pdf_processor import save_data_to_pdf
 from src.rss_reader_impl import RSSReader
 
@@ -26,5 +34,59 @@ class TestPDFProcessor(TestCase):
         self.assertTrue(file_processing_utilities.is_file_exists(file_name))
 
 
+class TestPDFProcessorOffline(TestCase):
+
+    def setUp(self) -> None:
+        self.temp_folder = tempfile.mkdtemp()
+        image = io.BytesIO()
+        Image.new('RGB', (40, 20), 'red').save(image, 'JPEG')
+        self.image_content = image.getvalue()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_folder)
+
+    def test_save_data_to_pdf_with_cached_images(self):
+        links = ["https://example.com/" + str(i) + ".jpg" for i in range(3)]
+        data = Feed("Test feed", "https://example.com",
+                    [Post("Post " + link, "20220905", link, (link, links[0])) for link in links])
+        with patch('src.pdf_processor.news_pdf_folder', self.temp_folder), \
+                patch('src.image_cache.news_images_folder', self.temp_folder + '/images'), \
+                patch('src.http_client.get', return_value=MagicMock(content=self.image_content)) as mock_get:
+            save_data_to_pdf(data, 2)
+        self.assertEqual(mock_get.call_count, 2)
+        file_name = file_processing_utilities.get_file_name(self.temp_folder, data, '.pdf')
+        self.assertTrue(file_processing_utilities.is_file_exists(file_name))
+
+    def test_save_data_to_pdf_with_downscaled_images(self):
+        image = io.BytesIO()
+        Image.effect_noise((1600, 800), 64).convert('RGB').save(image, 'JPEG', quality=95)
+        data = Feed("Test feed", "https://example.com",
+                    [Post("Post", "20220905", "https://example.com/1", ("https://example.com/1.jpg",))])
+        file_name = file_processing_utilities.get_file_name(self.temp_folder, data, '.pdf')
+        file_sizes = []
+        with patch('src.pdf_processor.news_pdf_folder', self.temp_folder), \
+                patch('src.image_cache.news_images_folder', self.temp_folder + '/images'), \
+                patch('src.http_client.get', return_value=MagicMock(content=image.getvalue())):
+            for image_dpi in (0, 96):
+                save_data_to_pdf(data, 0, image_dpi, 70)
+                file_sizes.append(os.path.getsize(file_name))
+        self.assertLess(file_sizes[1], file_sizes[0] / 4)
+
+    def test_save_data_to_pdf_with_broken_images(self):
+        links = ["https://example.com/" + str(i) + ".jpg" for i in range(3)]
+        contents = {links[0]: b"<html>Not found</html>", links[1]: self.image_content[:50], links[2]: self.image_content}
+        data = Feed("Test feed", "https://example.com",
+                    [Post("Post " + link, "20220905", link, (link,)) for link in links])
+        with patch('src.pdf_processor.news_pdf_folder', self.temp_folder), \
+                patch('src.image_cache.news_images_folder', self.temp_folder + '/images'), \
+                patch('src.http_client.get', side_effect=lambda url, **kwargs: MagicMock(content=contents[url])), \
+                patch('sys.stderr', new=StringIO()) as mock_err:
+            save_data_to_pdf(data, 0)
+        # the broken images are skipped, the valid one is drawn
+        self.assertEqual(mock_err.getvalue().count("The image cannot be added to PDF"), 2)
+        file_name = file_processing_utilities.get_file_name(self.temp_folder, data, '.pdf')
+        self.assertTrue(file_processing_utilities.is_file_exists(file_name))
+
+
 if __name__ == '__main__':
     unittest.main()
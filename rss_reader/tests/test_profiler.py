@@ -0,0 +1,79 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.metrics import MetricsRecorder, null_metrics
+from src.profiler import Profiler
+from src.rss_reader_impl import RSSReader
+from tests.test_rss_reader_impl import get_test_response
+
+
+def busy_wait(seconds: float) -> None:
+    """
+    Keep the CPU busy
+
+    :param float seconds: the busy time
+    :return: None
+    """
+    end_time = time.perf_counter() + seconds
+    while time.perf_counter() < end_time:
+        pass
+
+
+class TestProfiler(TestCase):
+
+    def setUp(self) -> None:
+        self.temp_folder = tempfile.mkdtemp()
+        self.output_prefix = os.path.join(self.temp_folder, 'profile', 'run')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_folder)
+
+    def test_profile_files(self):
+        with Profiler(self.output_prefix, sample_interval=0.001) as profiler:
+            busy_wait(0.1)
+        self.assertEqual(profiler.get_output_files(), [self.output_prefix + '.prof', self.output_prefix + '.folded'])
+        stats = pstats.Stats(self.output_prefix + '.prof')
+        self.assertTrue(any(function_name == 'busy_wait' for file_name, line, function_name in stats.stats))
+        with open(self.output_prefix + '.folded', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('MainThread;'))
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any('busy_wait (tests/test_profiler.py:' in line for line in lines))
+
+    def test_profile_is_disabled_by_default(self):
+        rss_reader = RSSReader("https://example.com/rss")
+        self.assertIsNone(rss_reader._profiler)
+        self.assertIs(rss_reader._metrics, null_metrics)
+
+    def test_profile_memory(self):
+        metrics = MetricsRecorder()
+        rss_reader = RSSReader("https://example.com/rss", date=None, metrics=metrics, profile=self.output_prefix,
+                               profile_memory=True)
+        rss_reader._news_folder = os.path.join(self.temp_folder, 'news_json')
+        rss_reader._http_cache_folder = os.path.join(self.temp_folder, 'http_cache')
+        with patch('src.http_client.get', return_value=get_test_response()), patch('sys.stdout', new=StringIO()):
+            rss_reader.show_rss()
+        with open(self.output_prefix + '.memory.txt', encoding='utf-8') as file:
+            report = file.read()
+        self.assertIn('Stage extract, 1 runs', report)
+        self.assertIn('Stage cache_write, 1 runs', report)
+        # the wrapped metrics still record the stages
+        self.assertIn('extract', metrics.get_stats()['stages'])
+
+
+if __name__ == '__main__':
+    unittest.main()
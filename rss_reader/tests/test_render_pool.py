@@ -0,0 +1,94 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from src import file_processing_utilities
+from src.metrics import MetricsRecorder
+from src.models import Feed, Post
+from src.render_pool import RenderJob, RenderResult, get_payload, render_feed
+from src.rss_reader_errors import SaveToHTMLError
+from src.rss_reader_impl import RSSReader
+from tests.test_rss_reader_impl import get_test_response
+
+
+class TestRenderPool(TestCase):
+
+    def setUp(self) -> None:
+        self.temp_folder = tempfile.mkdtemp()
+        self.data = Feed("Test feed", "https://example.com",
+                         [Post("Post " + str(i), "20220905", "https://example.com/" + str(i)) for i in range(3)])
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_folder)
+
+    def get_job(self, **kwargs) -> RenderJob:
+        return RenderJob(news_pdf_folder=os.path.join(self.temp_folder, 'news_pdf'),
+                         news_html_folder=os.path.join(self.temp_folder, 'news_html'),
+                         news_images_folder=os.path.join(self.temp_folder, 'news_images'), **kwargs)
+
+    def test_get_payload(self):
+        self.assertEqual(get_payload(self.data, 2),
+                         ("Test feed", "https://example.com",
+                          [("Post 0", "20220905", "https://example.com/0", ()),
+                           ("Post 1", "20220905", "https://example.com/1", ())]))
+
+    def test_render_feed(self):
+        job = self.get_job(to_pdf=True, to_html=True, limit=2)
+        with patch('src.pdf_processor.news_pdf_folder'), patch('src.html_processor.news_html_folder'), \
+                patch('src.image_cache.news_images_folder'):
+            results = render_feed(get_payload(self.data, job.limit), job)
+        self.assertEqual([result.file_format for result in results], ['pdf', 'html'])
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertTrue(file_processing_utilities.is_file_exists(result.file_name))
+
+    def test_render_feed_error(self):
+        job = self.get_job(to_pdf=False, to_html=True)
+        # the HTML folder cannot be created as a file with its name exists
+        open(job.news_html_folder, 'w').close()
+        with patch('src.html_processor.news_html_folder'):
+            result, = render_feed(get_payload(self.data, 0), job)
+        self.assertIsInstance(result.error, SaveToHTMLError)
+
+    def test_reader_render_workers(self):
+        metrics = MetricsRecorder()
+        rss_reader = RSSReader("https://example.com/rss", date=None, to_html=True, metrics=metrics, render_workers=1)
+        rss_reader._news_folder = os.path.join(self.temp_folder, 'news_json')
+        rss_reader._http_cache_folder = os.path.join(self.temp_folder, 'http_cache')
+        with patch('src.html_processor.news_html_folder', os.path.join(self.temp_folder, 'news_html')), \
+                patch('src.http_client.get', return_value=get_test_response()), patch('sys.stdout', new=StringIO()):
+            rss_reader.show_rss()
+            data = rss_reader._get_posts_details(rss_reader._get_feed(rss_reader._rss_feed_url))
+        file_name = file_processing_utilities.get_file_name(os.path.join(self.temp_folder, 'news_html'), data, '.html')
+        self.assertTrue(file_processing_utilities.is_file_exists(file_name))
+        self.assertIn('render_html', metrics.get_stats()['feeds']["https://example.com/rss"]['stages'])
+        self.assertIsNone(rss_reader._render_pool)
+
+    def test_render_worker_errors(self):
+        broken_future, failed_future, future = Future(), Future(), Future()
+        broken_future.set_exception(BrokenProcessPool("A worker died"))
+        failed_future.set_exception(ValueError("Unknown image format"))
+        future.set_result([RenderResult('html', 'feed.html', 0.1, SaveToHTMLError("Disk is full"))])
+        rss_reader = RSSReader(to_html=True, render_workers=1)
+        rss_reader._render_futures = [(broken_future, "https://example.com/1"), (failed_future, "https://example.com/2"),
+                                      (future, "https://example.com/3")]
+        with patch('sys.stdout', new=StringIO()) as mock_out:
+            rss_reader._print_render_results()
+        lines = mock_out.getvalue().splitlines()
+        self.assertEqual(lines, ["Error during saving to PDF/HTML occurred https://example.com/1 A worker died",
+                                 "Error during saving to PDF/HTML occurred https://example.com/2 Unknown image format",
+                                 "Error during saving to HTML occurred Disk is full"])
+
+
+if __name__ == '__main__':
+    unittest.main()
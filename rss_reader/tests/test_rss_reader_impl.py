@@ -2,16 +2,246 @@
 #  mail: snooki17@gmail.com
 #  Licensed under the MIT License
 #  Copyright (c) 2022.
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
 import unittest
 from io import StringIO
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 
+import feedparser
+import requests
+
+from src import file_processing_utilities, news_archive
+from src.date_index import DateIndex
+from src.models import Feed
 from src.rss_reader_errors import RSSParsingError
 from src.rss_reader_impl import RSSReader
 from src.utilities import get_formatted_current_date_for_log
 
 
+TEST_FEED = b'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+    <channel>
+        <title>Test feed</title>
+        <link>https://example.com/news</link>
+        <item>
+            <title>First post</title>
+            <link>https://example.com/news/1</link>
+            <guid>https://example.com/news/1</guid>
+            <pubDate>Mon, 05 Sep 2022 10:00:00 GMT</pubDate>
+        </item>
+        <item>
+            <title>Second post</title>
+            <link>https://example.com/news/2</link>
+            <guid>https://example.com/news/2</guid>
+            <pubDate>Mon, 05 Sep 2022 11:00:00 GMT</pubDate>
+        </item>
+    </channel>
+</rss>
+'''
+
+
+def get_test_response(url="https://example.com/rss", feed_title="Test feed", etag=None):
+    """
+    Build a fake HTTP response with the test feed
+
+    :param str url: the requested URL
+    :param str feed_title: the title of the returned feed
+    :param str etag: the ETag header of the response, None means no header
+    :return: a response mock
+    """
+    response = MagicMock()
+    response.url = url
+    response.status_code = 200
+    response.headers = {'Content-Type': 'application/rss+xml; charset=utf-8'}
+    if etag is not None:
+        response.headers['ETag'] = etag
+    response.content = TEST_FEED.replace(b'Test feed', feed_title.encode())
+    return response
+
+
+class TestRSSReaderOffline(TestCase):
+
+    def setUp(self) -> None:
+        self.news_folder = tempfile.mkdtemp()
+        self.rss_reader = RSSReader("https://example.com/rss", False, False, 0)
+        self.rss_reader._news_folder = self.news_folder
+        self.rss_reader._http_cache_folder = os.path.join(self.news_folder, 'http_cache')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.news_folder)
+
+    def test_feed_fetched_once_per_run(self):
+        with patch('src.http_client.get', return_value=get_test_response()) as mock_get, \
+                patch('sys.stdout', new=StringIO()):
+            self.rss_reader._process_feed(self.rss_reader._rss_feed_url)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_not_modified_feed_uses_cached_posts(self):
+        response = get_test_response(etag='"v1"')
+        not_modified_response = MagicMock(status_code=304, headers={})
+        with patch('src.http_client.get', side_effect=[response, not_modified_response]) as mock_get, \
+                patch('feedparser.parse', wraps=feedparser.parse) as mock_parse:
+            first_data = self.rss_reader._load_feed(self.rss_reader._rss_feed_url)
+            second_data = self.rss_reader._load_feed(self.rss_reader._rss_feed_url)
+        self.assertEqual(mock_get.call_args_list[1].kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual(mock_parse.call_count, 1)
+        self.assertEqual(first_data, second_data)
+
+    def test_save_only_new_posts(self):
+        with patch('src.http_client.get', return_value=get_test_response()):
+            data = self.rss_reader._get_posts_details(self.rss_reader._get_feed(self.rss_reader._rss_feed_url))
+        first_post, second_post = data.posts
+        self.rss_reader._save_historical_data(Feed(data.title, data.link, [first_post]))
+        self.rss_reader._save_historical_data(data)
+        self.rss_reader._save_historical_data(data)
+        file_name = file_processing_utilities.get_file_name(self.news_folder, data, '.jsonl')
+        with open(file_name, 'r', encoding='utf-8') as f:
+            self.assertEqual(file_processing_utilities.read_news_file(f), data)
+
+    def test_save_binary_archive(self):
+        rss_reader = RSSReader("https://example.com/rss", cache_format='bin')
+        rss_reader._news_folder = self.news_folder
+        with patch('src.http_client.get', return_value=get_test_response()):
+            data = rss_reader._get_posts_details(rss_reader._get_feed(rss_reader._rss_feed_url))
+        rss_reader._save_historical_data(data)
+        file_name = file_processing_utilities.get_file_name(self.news_folder, data, '.bin')
+        self.assertEqual(news_archive.read_news_file(file_name), data)
+
+    def test_save_updates_date_index(self):
+        rss_reader = RSSReader("https://example.com/rss", index='mmap')
+        rss_reader._news_folder = self.news_folder
+        with patch('src.http_client.get', return_value=get_test_response()):
+            data = rss_reader._get_posts_details(rss_reader._get_feed(rss_reader._rss_feed_url))
+        rss_reader._save_historical_data(data)
+        with DateIndex(self.news_folder) as date_index:
+            self.assertEqual([post for feed_title, post in date_index.find_posts_by_date("20220905")], data.posts)
+
+    def test_dedup_posts(self):
+        entries = [feedparser.FeedParserDict(id="1", link="https://example.com/1", title="Same title",
+                                             published_parsed=time.gmtime(0), links=[]),
+                   feedparser.FeedParserDict(id="2", link="https://example.com/2", title="Same title",
+                                             published_parsed=time.gmtime(0), links=[]),
+                   feedparser.FeedParserDict(id="1", link="https://example.com/1", title="Same title",
+                                             published_parsed=time.gmtime(0), links=[]),
+                   feedparser.FeedParserDict(link="https://example.com/3", title="No GUID",
+                                             published_parsed=time.gmtime(0), links=[])]
+        rss_feed = feedparser.FeedParserDict(entries=entries)
+        posts = self.rss_reader._get_posts_list(rss_feed)
+        self.assertEqual([post.link for post in posts],
+                         ["https://example.com/1", "https://example.com/2", "https://example.com/3"])
+        rss_reader_by_title = RSSReader(dedup='title')
+        self.assertEqual(len(rss_reader_by_title._get_posts_list(rss_feed)), 2)
+
+    def test_limit_stops_posts_conversion(self):
+        entries = [feedparser.FeedParserDict(id=str(i), link="https://example.com/" + str(i), title=str(i),
+                                             published_parsed=time.gmtime(0), links=[]) for i in range(2)]
+        # the broken topic after the limit must not be converted
+        entries.append(feedparser.FeedParserDict(id="broken"))
+        rss_reader = RSSReader(limit=2)
+        posts = rss_reader._get_posts_list(feedparser.FeedParserDict(entries=entries))
+        self.assertEqual([post.title for post in posts], ["0", "1"])
+
+    def test_print_json_post_by_post(self):
+        with patch('src.http_client.get', return_value=get_test_response()):
+            data = self.rss_reader._get_posts_details(self.rss_reader._get_feed(self.rss_reader._rss_feed_url))
+        data.posts[0].title = "Пост"
+        for posts in (data.posts, data.posts[:1], []):
+            with patch('sys.stdout', new=StringIO()) as mock_out:
+                self.rss_reader._print_json(Feed(data.title, data.link, posts))
+            self.assertEqual(mock_out.getvalue(),
+                             json.dumps(Feed(data.title, data.link, posts).to_dict(), ensure_ascii=False, indent=4)
+                             + "\n")
+
+    def test_cached_posts_with_smaller_limit(self):
+        response = get_test_response(etag='"v1"')
+        rss_reader_limit = RSSReader("https://example.com/rss", limit=1)
+        rss_reader_limit._http_cache_folder = self.rss_reader._http_cache_folder
+        with patch('src.http_client.get', side_effect=[response, response]) as mock_get:
+            rss_reader_limit._load_feed(rss_reader_limit._rss_feed_url)
+            data = self.rss_reader._load_feed(self.rss_reader._rss_feed_url)
+        # the posts cached with a smaller limit cannot be reused, so the feed is downloaded unconditionally
+        self.assertEqual(mock_get.call_args_list[1].kwargs['headers'], {})
+        self.assertEqual(len(data.posts), 2)
+
+    def test_watch_feeds_prints_new_posts(self):
+        first_response = get_test_response()
+        first_response.content = first_response.content.replace(b'<item>', b'<!--', 1).replace(b'</item>', b'-->', 1)
+        rss_reader = RSSReader("https://example.com/rss", watch=True, watch_interval=60)
+        rss_reader._news_folder = self.news_folder
+        rss_reader._http_cache_folder = self.rss_reader._http_cache_folder
+        with patch('src.http_client.get', side_effect=[first_response, requests.exceptions.ConnectionError,
+                                                get_test_response()]), \
+                patch('time.sleep') as mock_sleep, patch('sys.stdout', new=StringIO()) as mock_out:
+            rss_reader._watch_feeds(rss_reader._get_feed_urls(), max_polls=3)
+        posts = [json.loads(line) for line in mock_out.getvalue().splitlines() if line.startswith('{')]
+        self.assertEqual([post['title'] for post in posts], ["Second post", "First post"])
+        self.assertEqual(posts[0]['Blog title'], "Test feed")
+        # the failed poll is retried after the doubled interval
+        self.assertTrue(100 < mock_sleep.call_args_list[2].args[0] <= 132)
+
+    def test_watch_feeds_survives_saving_errors(self):
+        response = get_test_response(etag='"v1"')
+        not_modified_response = MagicMock(status_code=304, headers={})
+        rss_reader = RSSReader("https://example.com/rss", to_html=True, watch=True, watch_interval=60)
+        rss_reader._news_folder = self.news_folder
+        rss_reader._http_cache_folder = self.rss_reader._http_cache_folder
+        with patch('src.http_client.get', side_effect=[response, not_modified_response, not_modified_response]), \
+                patch.object(rss_reader, '_render_feed') as mock_render, \
+                patch.object(rss_reader, '_save_historical_data',
+                             side_effect=[sqlite3.OperationalError("database is locked"), [], []]), \
+                patch('time.sleep') as mock_sleep, patch('sys.stdout', new=StringIO()) as mock_out:
+            rss_reader._watch_feeds(rss_reader._get_feed_urls(), max_polls=3)
+        self.assertIn("database is locked", mock_out.getvalue())
+        # the failed poll is retried after the doubled interval
+        self.assertTrue(100 < mock_sleep.call_args_list[1].args[0] <= 132)
+        # the unchanged feed is not saved to HTML again
+        self.assertEqual(mock_render.call_count, 1)
+
+    def test_get_posts_details_from_fetched_feed(self):
+        with patch('src.http_client.get', return_value=get_test_response()):
+            rss_feed = self.rss_reader._get_feed(self.rss_reader._rss_feed_url)
+        data = self.rss_reader._get_posts_details(rss_feed)
+        self.assertEqual(data.title, "Test feed")
+        self.assertEqual(data.link, "https://example.com/news")
+        self.assertEqual([post.title for post in data.posts], ["First post", "Second post"])
+        self.assertEqual(data.posts[0].date, "20220905")
+
+    def test_process_several_feeds(self):
+        urls = ["https://example.com/rss/" + str(i) for i in range(5)]
+        rss_reader = RSSReader(urls, True, False, 0, None, workers=3)
+        rss_reader._news_folder = self.news_folder
+        rss_reader._http_cache_folder = self.rss_reader._http_cache_folder
+        with patch('src.http_client.get',
+                   side_effect=lambda url, **kwargs: get_test_response(url, url)) as mock_get, \
+                patch('sys.stdout', new=StringIO()) as mock_out:
+            rss_reader.show_rss()
+        self.assertEqual(mock_get.call_count, len(urls))
+        for url in urls:
+            self.assertIn('"Blog title": "' + url + '"', mock_out.getvalue())
+
+    def test_process_several_feeds_with_failed_feed(self):
+        def get_response(url, **kwargs):
+            if url.endswith("bad"):
+                raise requests.exceptions.ConnectionError
+            return get_test_response(url)
+
+        rss_reader = RSSReader(["https://example.com/rss", "https://example.com/bad"], False, False, 0, None,
+                               workers=2)
+        rss_reader._news_folder = self.news_folder
+        rss_reader._http_cache_folder = self.rss_reader._http_cache_folder
+        with patch('src.http_client.get', side_effect=get_response), patch('sys.stdout', new=StringIO()) as mock_out:
+            with self.assertRaises(SystemExit):
+                rss_reader.show_rss()
+        self.assertIn("Test feed", mock_out.getvalue())
+        self.assertIn("The URL not found. Check the URL and try again https://example.com/bad", mock_out.getvalue())
+
+
 class TestRSSReader(TestCase):
 
     def setUp(self) -> None:
@@ -36,18 +266,14 @@ class TestRSSReader(TestCase):
         self.assertNotEqual(self.rss_reader_full._get_feed_link(rss_feed), "Test_link")
 
     def test_print_all_true(self):
-        self.assertTrue(self.rss_reader_full._is_print_all())
-
-    def test_print_all_false(self):
-        self.assertFalse(self.rss_reader_limit._is_print_all())
-
-    def test_get_feed_length(self):
         rss_feed = self.rss_reader_full._get_feed(self.rss_reader_full._rss_feed_url)
-        self.assertEqual(self.rss_reader_full._get_feed_length(rss_feed), 50)
+        data = self.rss_reader_full._get_posts_details(rss_feed)
+        self.assertTrue(self.rss_reader_full._is_print_all(data))
 
-    def test_get_feed_length_wrong(self):
-        rss_feed = self.rss_reader_full._get_feed(self.rss_reader_full._rss_feed_url)
-        self.assertNotEqual(self.rss_reader_full._get_feed_length(rss_feed), 1)
+    def test_print_all_false(self):
+        rss_feed = self.rss_reader_limit._get_feed(self.rss_reader_limit._rss_feed_url)
+        data = self.rss_reader_limit._get_posts_details(rss_feed)
+        self.assertFalse(self.rss_reader_limit._is_print_all(data))
 
     def test_print_log_message(self):
         with patch('sys.stdout', new=StringIO()) as mock_out:
@@ -62,8 +288,8 @@ class TestRSSReader(TestCase):
     def test_posts_detail(self):
         rss_feed = self.rss_reader_full._get_feed(self.rss_reader_full._rss_feed_url)
         data = self.rss_reader_full._get_posts_details(rss_feed)
-        self.assertEqual(data['Blog title'], "Yahoo News - Latest News & Headlines")
-        self.assertEqual(data['Blog link'], "https://www.yahoo.com/news")
+        self.assertEqual(data.title, "Yahoo News - Latest News & Headlines")
+        self.assertEqual(data.link, "https://www.yahoo.com/news")
 
     def test_get_feed_name_exception(self):
         test_object = "Test"
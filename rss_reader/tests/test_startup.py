@@ -0,0 +1,79 @@
+#  Author: Andrii Malchyk
+#  mail: snooki17@gmail.com
+#  Licensed under the MIT License
+#  Copyright (c) 2022.
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import TestCase
+
+from src.news_archive import append_posts
+from tests.test_news_storage import get_test_data
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rss_reader.py')
+
+
+def get_import_times(*cli_args, cwd=None, output=None) -> dict:
+    """
+    Run the CLI with `-X importtime` and collect the cumulative import time of every imported module
+
+    :param cli_args: the CLI arguments
+    :param str cwd: the working directory of the CLI
+    :param list output: the list the CLI stdout is appended to
+    :return: a dictionary of the imported module name and (the cumulative import time in microseconds, the module is
+     imported by a nested import)
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI_PATH, *cli_args], capture_output=True, text=True,
+                            cwd=cwd)
+    if output is not None:
+        output.append(result.stdout)
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative_time, name = line[len('import time:'):].split('|')
+        # nested imports are indented by two spaces per level after the single separator space
+        import_times[name.strip()] = int(cumulative_time), name[1:].startswith(' ')
+    return import_times
+
+
+class TestStartup(TestCase):
+    heavy_modules = ('feedparser', 'requests', 'fpdf', 'PIL')
+    # the budget of the reader's own modules import time in microseconds, importing fpdf alone takes ~200 ms
+    import_time_budget = 100000
+
+    def setUp(self) -> None:
+        self.working_directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.working_directory)
+
+    def test_version_does_not_import_heavy_modules(self):
+        import_times = get_import_times('--version', cwd=self.working_directory)
+        self.assertIn('src.rss_reader_impl', import_times)
+        for module in self.heavy_modules:
+            self.assertNotIn(module, import_times)
+
+    def test_date_search_does_not_import_heavy_modules(self):
+        # the cached news are searched, so the search path is imported
+        data = get_test_data()
+        os.mkdir(os.path.join(self.working_directory, 'news_json'))
+        append_posts(os.path.join(self.working_directory, 'news_json', 'Test_feed-20220906.jsonl'), data, data.posts)
+        output = []
+        import_times = get_import_times('--date', '20220905', cwd=self.working_directory, output=output)
+        self.assertIn("Post 20220905", output[0])
+        for module in self.heavy_modules:
+            self.assertNotIn(module, import_times)
+
+    def test_import_time_budget(self):
+        import_times = get_import_times('--version', cwd=self.working_directory)
+        reader_import_time = sum(time for name, (time, is_nested) in import_times.items()
+                                 if name.split('.')[0] == 'src' and not is_nested)
+        self.assertLess(reader_import_time, self.import_time_budget)
+
+
+if __name__ == '__main__':
+    unittest.main()
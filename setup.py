@@ -29,4 +29,5 @@ setup(name='rss_reader',
           'console_scripts': ['rss_reader=rss_reader.rss_reader:main']
       },
       install_requires=requirements,
+      python_requires='>=3.10',
       zip_safe=False)